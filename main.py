@@ -141,8 +141,10 @@ def create_default_config(config_file: str):
     
     # 保存配置
     import yaml
+    from src.config import YamlDumper
     with open(config_file, 'w', encoding='utf-8') as f:
-        yaml.dump(default_config, f, default_flow_style=False, allow_unicode=True)
+        yaml.dump(default_config, f, Dumper=YamlDumper, default_flow_style=False,
+                  allow_unicode=True, sort_keys=False)
     
     print(f"默认配置已保存到: {config_file}")
     print("请编辑配置文件以适应您的环境")
@@ -262,10 +264,13 @@ def run_workflow(config_file: str,
         
         # 运行工作流程
         if dry_run:
-            print("=== 试运行模式 ===")
-            print(f"将处理 {len(job_configs)} 个作业:")
-            for job in job_configs:
-                print(f"  - {job['job_id']}: 压力={job['pressure']} {job['pressure_unit']}")
+            # 汇总为一次输出，作业较多时避免逐行写终端
+            lines = ["=== 试运行模式 ===", f"将处理 {len(job_configs)} 个作业:"]
+            lines.extend(
+                f"  - {job['job_id']}: 压力={job['pressure']} {job['pressure_unit']}"
+                for job in job_configs
+            )
+            print("\n".join(lines))
             return True
         
         if steps:
@@ -313,11 +318,8 @@ def run_workflow_steps(orchestrator: WorkflowOrchestrator,
                       steps: List[str], 
                       job_configs: List[Dict]) -> bool:
     """运行指定的工作流程步骤"""
-    available_steps = [
-        'connect_server', 'verify_cfx', 'generate_pre', 
-        'generate_def', 'query_cluster', 'generate_scripts', 
-        'upload_files', 'submit_jobs', 'monitor_jobs'
-    ]
+    # 可用步骤直接取自编排器的步骤分派表
+    available_steps = orchestrator.available_steps
     
     for step in steps:
         if step not in available_steps:
@@ -329,10 +331,8 @@ def run_workflow_steps(orchestrator: WorkflowOrchestrator,
         for step in steps:
             print(f"\n执行步骤: {step}")
             
-            if step == 'generate_pre':
-                result = orchestrator.execute_step_only(step, job_configs=job_configs)
-            else:
-                result = orchestrator.execute_step_only(step)
+            # 各步骤处理函数只读取自己需要的参数（目前只有generate_pre使用job_configs）
+            result = orchestrator.execute_step_only(step, job_configs=job_configs)
             
             print(f"✓ 步骤完成: {step}")
         
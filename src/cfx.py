@@ -3,7 +3,11 @@ CFX核心模块
 处理CFX相关操作：环境检测、.pre文件生成、.def文件生成等
 """
 
+import hashlib
+import json
 import os
+import shlex
+import stat
 import subprocess
 import logging
 from pathlib import Path
@@ -12,6 +16,12 @@ from jinja2 import Environment, FileSystemLoader, Template
 
 from .config import CFXAutomationConfig
 from .utils.cfx_detector import CFXPathDetector, auto_detect_cfx_config, verify_cfx_installation
+from .utils.remote_exec import run_remote_command
+from .utils.sftp_io import put_local_file
+
+
+# 本地.def生成缓存清单（相对base_path）
+_DEF_CACHE_MANIFEST = os.path.join(".cache", "def_manifest.json")
 
 
 class CFXEnvironmentError(Exception):
@@ -35,6 +45,9 @@ class CFXManager:
         self.local_cfx_config = {}
         self.remote_cfx_config = {}
         
+        # 已编译的.pre模板（按模板路径缓存，重复生成时不再解析模板）
+        self._pre_templates: Dict[str, Template] = {}
+        
         # 初始化时检测CFX环境
         if config.auto_detect_cfx:
             self._detect_cfx_environment()
@@ -120,30 +133,23 @@ class CFXManager:
             executables = ["cfx5pre", "cfx5solve"]
             found_executables = {}
             
-            for exe in executables:
-                # 构建完整的可执行文件路径
-                if self.config.remote_cfx_bin_path:
-                    exe_path = os.path.join(self.config.remote_cfx_bin_path, exe).replace('\\', '/')
-                elif self.config.remote_cfx_home:
-                    exe_path = os.path.join(self.config.remote_cfx_home, "bin", exe).replace('\\', '/')
-                else:
-                    exe_path = exe  # 假设在PATH中
-                
-                # 直接检查文件是否存在且可执行
-                test_cmd = f"test -x '{exe_path}' && echo 'FOUND' || echo 'NOT_FOUND'"
-                stdin, stdout, stderr = ssh_client.exec_command(test_cmd)
-                result = stdout.read().decode().strip()
-                
-                if result == "FOUND":
-                    found_executables[exe] = exe_path
-                    self.logger.debug(f"找到服务器CFX可执行文件: {exe} -> {exe_path}")
-                else:
-                    # 如果直接路径不存在，尝试使用which命令
-                    stdin, stdout, stderr = ssh_client.exec_command(f"which {exe} 2>/dev/null || echo 'NOT_FOUND'")
-                    which_result = stdout.read().decode().strip()
-                    if which_result and which_result != "NOT_FOUND":
-                        found_executables[exe] = which_result
-                        self.logger.debug(f"通过which找到CFX可执行文件: {exe} -> {which_result}")
+            # 构建完整的可执行文件路径（未配置路径时假设在PATH中）
+            exe_paths = {exe: self.config.get_remote_cfx_executable_path(exe) for exe in executables}
+            
+            # 一次远程调用完成所有检查：配置路径可执行时直接返回，否则通过which在PATH中查找
+            check_cmd = "; ".join(
+                f"if test -x {shlex.quote(exe_path)}; then echo {shlex.quote(exe_path)}; "
+                f"else which {shlex.quote(exe)} 2>/dev/null || echo NOT_FOUND; fi"
+                for exe, exe_path in exe_paths.items()
+            )
+            _, output, _ = run_remote_command(ssh_client, check_cmd)
+            results = output.splitlines()
+            
+            for i, exe in enumerate(exe_paths):
+                found_path = results[i].strip() if i < len(results) else ""
+                if found_path and found_path != "NOT_FOUND":
+                    found_executables[exe] = found_path
+                    self.logger.debug("找到服务器CFX可执行文件: %s -> %s", exe, found_path)
             
             if not found_executables:
                 # 提供更详细的错误信息
@@ -234,13 +240,17 @@ class CFXManager:
             raise CFXFileError(f"生成.pre文件失败: {e}")
     
     def _load_pre_template(self) -> Template:
-        """加载.pre模板文件"""
+        """加载.pre模板文件（同一路径只编译一次）"""
         template_path = self.config.pre_template_path
         
         if not template_path:
             # 使用默认模板路径
             template_path = os.path.join("templates", "create_def.pre.j2")
         
+        cached = self._pre_templates.get(template_path)
+        if cached is not None:
+            return cached
+        
         if not os.path.exists(template_path):
             raise CFXFileError(f".pre模板文件不存在: {template_path}")
         
@@ -248,10 +258,11 @@ class CFXManager:
             template_dir = os.path.dirname(template_path)
             template_name = os.path.basename(template_path)
             
-            env = Environment(loader=FileSystemLoader(template_dir))
+            env = Environment(loader=FileSystemLoader(template_dir), auto_reload=False)
             template = env.get_template(template_name)
             
             self.logger.debug(f"加载.pre模板: {template_path}")
+            self._pre_templates[template_path] = template
             return template
             
         except Exception as e:
@@ -313,7 +324,10 @@ class CFXManager:
         
         for pre_file in pre_files:
             try:
-                def_files = self._execute_cfx_pre_local(pre_file)
+                def_files = self._load_cached_def_files(pre_file)
+                if def_files is None:
+                    def_files = self._execute_cfx_pre_local(pre_file)
+                    self._store_cached_def_files(pre_file, def_files)
                 if def_files:
                     if isinstance(def_files, list):
                         generated_def_files.extend(def_files)
@@ -329,6 +343,87 @@ class CFXManager:
         self.logger.info(f"成功生成{len(generated_def_files)}个.def文件")
         return generated_def_files
     
+    def _def_cache_key(self, pre_file: str) -> str:
+        """
+        计算决定.def生成结果的输入摘要
+        
+        包括.pre文件内容、CFX Pre可执行文件、.cfx文件的大小和修改时间（不读取可能很大的.cfx内容），
+        以及影响.def文件查找的压力列表和命名前缀。
+        """
+        digest = hashlib.blake2b(digest_size=32)
+        with open(pre_file, 'rb') as f:
+            digest.update(f.read())
+        
+        cfx_stat = None
+        if self.config.cfx_file_path:
+            try:
+                st = os.stat(self.config.cfx_file_path)
+                cfx_stat = [st.st_size, st.st_mtime_ns]
+            except OSError:
+                pass
+        
+        digest.update(json.dumps([
+            self.config.cfx_pre_executable,
+            self.config.cfx_file_path,
+            cfx_stat,
+            list(self.config.pressure_list),
+            self.config.folder_prefix,
+            self.config.def_file_prefix,
+        ]).encode())
+        return digest.hexdigest()
+    
+    def _read_def_cache_manifest(self) -> Dict:
+        """读取.def生成缓存清单，不存在或损坏时返回空字典"""
+        manifest_path = os.path.join(self.config.base_path, _DEF_CACHE_MANIFEST)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _load_cached_def_files(self, pre_file: str) -> Optional[List[str]]:
+        """
+        输入未变化且上次生成的.def文件都还存在时返回这些文件，否则返回None
+        
+        Args:
+            pre_file: .pre文件路径
+            
+        Returns:
+            Optional[List[str]]: 可直接复用的.def文件列表
+        """
+        if not self.config.reuse_unchanged_def_files:
+            return None
+        
+        entry = self._read_def_cache_manifest().get(os.path.abspath(pre_file))
+        if not entry or entry.get("key") != self._def_cache_key(pre_file):
+            return None
+        
+        def_files = entry.get("def_files") or []
+        if not def_files or not all(os.path.isfile(f) for f in def_files):
+            return None
+        
+        self.logger.info(f"输入未变化，跳过CFX Pre，复用{len(def_files)}个.def文件: {pre_file}")
+        return def_files
+    
+    def _store_cached_def_files(self, pre_file: str, def_files: Optional[List[str]]) -> None:
+        """记录本次CFX Pre的输入摘要和生成的.def文件（生成失败时不记录）"""
+        if not self.config.reuse_unchanged_def_files or not def_files:
+            return
+        
+        manifest = self._read_def_cache_manifest()
+        manifest[os.path.abspath(pre_file)] = {
+            "key": self._def_cache_key(pre_file),
+            "def_files": def_files,
+        }
+        
+        manifest_path = os.path.join(self.config.base_path, _DEF_CACHE_MANIFEST)
+        try:
+            os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            self.logger.warning(f"保存.def生成缓存清单失败: {e}")
+    
     def _execute_cfx_pre_local(self, pre_file: str) -> List[str]:
         """执行本地CFX Pre生成.def文件"""
         try:
@@ -398,7 +493,7 @@ class CFXManager:
                 found_file = None
                 for def_name in possible_names:
                     def_path = os.path.join(folder_path, def_name)
-                    self.logger.debug(f"检查期望的.def文件: {def_path}")
+                    self.logger.debug("检查期望的.def文件: %s", def_path)
                     if os.path.exists(def_path):
                         found_file = def_path
                         self.logger.info(f"找到生成的.def文件: {def_path}")
@@ -441,15 +536,22 @@ class CFXManager:
         try:
             self.logger.info("准备服务器CFX生成环境...")
             
-            # 确保远程目录存在
-            ssh_client.exec_command(f"mkdir -p {remote_dir}")
+            # 确保远程目录存在（只等待退出状态，mkdir没有输出可读）
+            stdin, stdout, stderr = ssh_client.exec_command(f"mkdir -p -- {shlex.quote(remote_dir)}")
+            if stdout.channel.recv_exit_status() != 0:
+                error_msg = stderr.read().decode(errors='replace').strip()
+                self.logger.error(f"创建远程目录失败: {error_msg}")
+                return False
             
             # 上传.cfx文件（如果存在）
             if self.config.cfx_file_path and os.path.exists(self.config.cfx_file_path):
                 remote_cfx_path = f"{remote_dir}/{os.path.basename(self.config.cfx_file_path)}"
                 sftp = ssh_client.open_sftp()
-                sftp.put(self.config.cfx_file_path, remote_cfx_path)
-                sftp.close()
+                try:
+                    put_local_file(sftp, self.config.cfx_file_path, remote_cfx_path,
+                                   self.config.sftp_block_size)
+                finally:
+                    sftp.close()
                 self.logger.debug(f"上传.cfx文件: {remote_cfx_path}")
             
             return True
@@ -512,13 +614,18 @@ class CFXManager:
                 f"{pre_name}_001.def"
             ]
             
-            for def_name in possible_def_names:
-                def_path = f"{remote_dir}/{def_name}"
-                # 检查文件是否存在
-                stdin, stdout, stderr = ssh_client.exec_command(f"test -f {def_path} && echo 'EXISTS'")
-                result = stdout.read().decode().strip()
-                if result == "EXISTS":
-                    return def_path
+            # 通过SFTP stat检查文件是否存在，避免为每个候选文件启动远程shell
+            sftp = ssh_client.open_sftp()
+            try:
+                for def_name in possible_def_names:
+                    def_path = f"{remote_dir}/{def_name}"
+                    try:
+                        if stat.S_ISREG(sftp.stat(def_path).st_mode):
+                            return def_path
+                    except FileNotFoundError:
+                        continue
+            finally:
+                sftp.close()
             
             self.logger.warning(f"未找到生成的远程.def文件: {pre_file}")
             return None
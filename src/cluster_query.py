@@ -13,6 +13,10 @@ try:
 except ImportError:
     from config import CFXAutomationConfig
 
+# 解析节点资源字段的预编译正则
+_CPU_COUNT_RE = re.compile(r'\d+')
+_MEMORY_SIZE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*([KMGT]?B?)')
+
 
 class ClusterQueryError(Exception):
     """集群查询错误"""
@@ -200,7 +204,7 @@ class ClusterQueryManager:
                     "node_type": "unknown",
                     "query_time": datetime.now().isoformat()
                 }
-                self.logger.debug(f"找到节点: {line}")
+                self.logger.debug("找到节点: %s", line)
                 
             elif current_node and '=' in line:
                 # 解析节点属性 - 属性行以空格开头
@@ -212,16 +216,16 @@ class ClusterQueryManager:
                     if key == "state":
                         current_node["state"] = self._normalize_pbs_state(value)
                         current_node["available"] = self._is_pbs_node_available(value)
-                        self.logger.debug(f"  状态: {value} -> {current_node['state']}, 可用: {current_node['available']}")
+                        self.logger.debug("  状态: %s -> %s, 可用: %s", value, current_node["state"], current_node["available"])
                         
                     elif key == "np":
                         current_node["cpus"] = self._parse_cpu_count(value)
-                        self.logger.debug(f"  CPU核心数: {current_node['cpus']}")
+                        self.logger.debug("  CPU核心数: %s", current_node["cpus"])
                         
                     elif key == "properties":
                         if value:
                             current_node["properties"] = [prop.strip() for prop in value.split(',')]
-                        self.logger.debug(f"  属性: {current_node['properties']}")
+                        self.logger.debug("  属性: %s", current_node["properties"])
                         
                     elif key == "power_state":
                         current_node["power_state"] = value
@@ -310,7 +314,7 @@ class ClusterQueryManager:
         """解析CPU数量"""
         try:
             # 提取数字
-            match = re.search(r'\d+', str(cpu_str))
+            match = _CPU_COUNT_RE.search(str(cpu_str))
             if match:
                 return int(match.group())
             return 0
@@ -324,7 +328,7 @@ class ClusterQueryManager:
                 return 0
             
             # 提取数字和单位
-            match = re.match(r'(\d+(?:\.\d+)?)\s*([KMGT]?B?)', str(memory_str).upper())
+            match = _MEMORY_SIZE_RE.match(str(memory_str).upper())
             if not match:
                 return 0
             
@@ -369,18 +373,27 @@ class ClusterQueryManager:
         
         summary = {
             "total_nodes": len(nodes),
-            "available_nodes": sum(1 for node in nodes if node.get("available", False)),
-            "total_cores": sum(node.get("cpus", 0) for node in nodes),
-            "available_cores": sum(node.get("cpus", 0) for node in nodes if node.get("available", False)),
-            "total_memory": sum(node.get("memory", 0) for node in nodes),
-            "available_memory": sum(node.get("memory", 0) for node in nodes if node.get("available", False)),
+            "available_nodes": 0,
+            "total_cores": 0,
+            "available_cores": 0,
+            "total_memory": 0,
+            "available_memory": 0,
             "states": {},
             "partitions": {},
             "scheduler": nodes[0].get("scheduler", "unknown") if nodes else "unknown"
         }
         
-        # 统计状态分布
+        # 一次遍历累计资源总量并统计状态分布
         for node in nodes:
+            cpus = node.get("cpus", 0)
+            memory = node.get("memory", 0)
+            summary["total_cores"] += cpus
+            summary["total_memory"] += memory
+            if node.get("available", False):
+                summary["available_nodes"] += 1
+                summary["available_cores"] += cpus
+                summary["available_memory"] += memory
+            
             state = node.get("state", "unknown")
             summary["states"][state] = summary["states"].get(state, 0) + 1
             
@@ -393,8 +406,8 @@ class ClusterQueryManager:
                         "memory": 0
                     }
                 summary["partitions"][partition]["nodes"] += 1
-                summary["partitions"][partition]["cores"] += node.get("cpus", 0)
-                summary["partitions"][partition]["memory"] += node.get("memory", 0)
+                summary["partitions"][partition]["cores"] += cpus
+                summary["partitions"][partition]["memory"] += memory
         
         return summary
     
@@ -8,10 +8,23 @@ import yaml
 import logging
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any, Union
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+
+try:
+    # libyaml的C实现解析/生成速度快数倍，行为与纯Python的Safe版本一致
+    from yaml import CSafeDumper as YamlDumper, CSafeLoader as YamlLoader
+except ImportError:  # 未编译libyaml时使用纯Python实现
+    from yaml import SafeDumper as YamlDumper, SafeLoader as YamlLoader
 
 logger = logging.getLogger(__name__)
 
+# validate使用的取值集合（模块加载时构建一次，成员检查为常数时间）
+_VALID_CFX_MODES = frozenset({"local", "server"})
+_VALID_CLUSTER_TYPES = frozenset({"university", "group_new", "group_old"})
+_VALID_SCHEDULER_TYPES = frozenset({"SLURM", "PBS"})
+_ALLOCATION_STRATEGIES = ("batch_allocation", "node_reuse", "smart_queue", "hybrid")
+_VALID_ALLOCATION_STRATEGIES = frozenset(_ALLOCATION_STRATEGIES)
+
 
 @dataclass
 class CFXAutomationConfig:
@@ -25,6 +38,8 @@ class CFXAutomationConfig:
     cfx_solver_executable: str = ""
     cfx_version: str = ""
     auto_detect_cfx: bool = True
+    # .pre内容、.cfx文件和CFX Pre均未变化且.def文件仍存在时跳过本地CFX Pre
+    reuse_unchanged_def_files: bool = True
     
     # 远程CFX配置
     remote_cfx_home: str = ""
@@ -121,6 +136,15 @@ class CFXAutomationConfig:
     ssh_user: str = "username"
     ssh_key: str = ""
     ssh_password: Optional[str] = None
+    ssh_keepalive_interval: int = 30    # SSH保活间隔 (秒)，防止复用的连接被断开
+    # SSH套接字收发缓冲区大小 (字节)，0表示交给内核自动调整
+    # （显式设置会关闭接收缓冲区自动调整，并受 net.core.rmem_max 限制）
+    tcp_buffer_size: int = 0
+    # SSH传输压缩（连接时协商；经广域网传输文本输入文件时建议开启）
+    ssh_compression: bool = False
+    preferred_ciphers: List[str] = field(
+        default_factory=lambda: ["aes128-gcm@openssh.com", "aes256-gcm@openssh.com", "aes128-ctr"]
+    )
     remote_base_path: str = "/home/username/CFX_Jobs"
     
     # 集群配置
@@ -156,6 +180,9 @@ class CFXAutomationConfig:
     # 监控配置
     enable_monitoring: bool = True
     monitor_interval: int = 60
+    # 监控期间的状态查询命令在同一个长期打开的远程shell通道中执行，
+    # 不再每次打开新通道
+    monitor_persistent_shell: bool = True
     auto_download_results: bool = True
     cleanup_remote_files: bool = False
     result_file_patterns: List[str] = field(
@@ -165,7 +192,45 @@ class CFXAutomationConfig:
     # 文件传输配置
     transfer_retry_times: int = 3
     transfer_timeout: int = 300
+    # 保持目录结构的上传优先使用rsync-over-SSH，跳过未变化的文件
+    # （需要本机rsync和密钥认证）
+    use_rsync: bool = False
+    max_parallel_transfers: int = 4     # 并行上传使用的SFTP会话数
+    # 上传使用的独立SSH连接数，SFTP会话在各连接间轮流分配
+    # （高延迟链路可设为2-4）
+    transfer_connections: int = 1
+    # 使用asyncssh在单个事件循环中并发上传（需安装asyncssh，
+    # 脚本文件仍走paramiko）
+    use_asyncssh: bool = False
+    # 多个文件打包为一个tar流上传并在远程解包，减少逐文件往返
+    # （需要远程tar，脚本文件仍走SFTP；
+    # tar流中的文件没有逐个进度、重试和熔断）
+    use_tar_stream: bool = False
+    # 待上传文件数达到该值时自动使用tar流上传（0表示关闭）
+    tar_stream_min_files: int = 0
+    # 多个文件总大小低于该值(MB)时也自动使用tar流上传（0表示关闭）
+    tar_stream_small_total_mb: int = 0
+    # 本地内容和远程文件(大小/修改时间)自上次上传后均未变化时跳过上传
+    # （记录保存在 base_path/.cache/upload_manifest.json）
+    skip_unchanged_uploads: bool = True
+    # 初始文件gzip压缩后上传并在远程gunzip解压（压缩率不足10%时直接上传，
+    # 需要远程gunzip）
+    compress_initial_file: bool = False
+    # 初始文件只上传一份，其余P_Out_文件夹在服务器上用cp复制
+    # （复制失败时改为逐个上传）
+    initial_file_remote_copy: bool = True
+    retry_max_delay: int = 30           # 重试退避最大等待时间 (秒)
+    # 同一批传输中连续失败文件数超过该值后停止该批后续传输
+    circuit_breaker_threshold: int = 5
     enable_checksum_verification: bool = True
+    # SFTP读写请求块大小 (字节)，严格的旧版服务器可设为32768
+    sftp_block_size: int = 131072
+    sftp_window_size: int = 134217728   # SFTP通道窗口大小 (字节)
+    sftp_max_packet_size: int = 524288  # SFTP通道最大包大小 (字节)
+    # 下载预读和asyncssh上传时每个文件的最大并发请求数
+    sftp_max_concurrent_requests: int = 64
+    # 探测确认远程目录与本机共享文件系统和用户时直接本地复制，跳过SFTP
+    enable_sendfile_shortcut: bool = False
     
     # 作业管理配置
     max_concurrent_jobs: int = 5
@@ -176,7 +241,7 @@ class CFXAutomationConfig:
         """从YAML文件加载配置"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=YamlLoader)
             
             # 创建配置实例
             config = cls()
@@ -212,8 +277,8 @@ class CFXAutomationConfig:
             
             # 写入文件
             with open(file_path, 'w', encoding='utf-8') as f:
-                yaml.dump(config_dict, f, default_flow_style=False, 
-                         allow_unicode=True, indent=2)
+                yaml.dump(config_dict, f, Dumper=YamlDumper, default_flow_style=False,
+                          allow_unicode=True, indent=2, sort_keys=False)
             
             logger.info(f"Configuration saved to {file_path}")
             
@@ -236,21 +301,22 @@ class CFXAutomationConfig:
             errors.append("remote_base_path is required")
         
         # 验证CFX模式
-        if self.cfx_mode not in ["local", "server"]:
+        if self.cfx_mode not in _VALID_CFX_MODES:
             errors.append("cfx_mode must be 'local' or 'server'")
         
         # 验证集群类型
-        if self.cluster_type not in ["university", "group_new", "group_old"]:
+        if self.cluster_type not in _VALID_CLUSTER_TYPES:
             errors.append("cluster_type must be 'university', 'group_new', or 'group_old'")
         
         # 验证调度器类型
-        if self.scheduler_type not in ["SLURM", "PBS"]:
+        if self.scheduler_type not in _VALID_SCHEDULER_TYPES:
             errors.append("scheduler_type must be 'SLURM' or 'PBS'")
         
         # 验证分配策略
-        valid_strategies = ["batch_allocation", "node_reuse", "smart_queue", "hybrid"]
-        if self.node_allocation_strategy not in valid_strategies:
-            errors.append(f"node_allocation_strategy must be one of: {valid_strategies}")
+        if self.node_allocation_strategy not in _VALID_ALLOCATION_STRATEGIES:
+            errors.append(
+                f"node_allocation_strategy must be one of: {list(_ALLOCATION_STRATEGIES)}"
+            )
         
         return errors
     
@@ -263,12 +329,24 @@ class CFXAutomationConfig:
         else:
             return executable_name  # 假设在PATH中
     
+    def get_submit_script_path(self) -> str:
+        """获取本地批量提交脚本 Submit_All.sh 的路径"""
+        return os.path.join(self.base_path, "Submit_All.sh")
+    
+    def get_monitor_script_path(self) -> str:
+        """获取本地监控脚本 Monitor_Jobs.sh 的路径"""
+        return os.path.join(self.base_path, "Monitor_Jobs.sh")
+    
+    def get_job_script_path(self, pressure: Union[int, float, str]) -> str:
+        """获取按作业命名的本地Shell脚本 CFX_Job_<压力值>.sh 的路径"""
+        return os.path.join(self.base_path, f"CFX_Job_{pressure}.sh")
+    
     def get_remote_cfx_executable_path(self, executable_name: str) -> str:
         """获取远程CFX可执行文件路径"""
         if self.remote_cfx_bin_path:
-            return os.path.join(self.remote_cfx_bin_path, executable_name)
+            return str(PurePosixPath(self.remote_cfx_bin_path) / executable_name)
         elif self.remote_cfx_home:
-            return os.path.join(self.remote_cfx_home, "bin", executable_name)
+            return str(PurePosixPath(self.remote_cfx_home) / "bin" / executable_name)
         else:
             return executable_name
 
@@ -3,15 +3,20 @@
 监控作业执行状态，自动下载结果
 """
 
-import json
 import logging
 import os
-import time
+import shlex
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
 from .config import CFXAutomationConfig
+from .utils.remote_exec import RemoteShell, run_remote_command
+from .utils.report_io import write_json_report
+
+# 一次sacct/squeue批量查询的最大作业数（避免命令行过长）
+_SLURM_QUERY_BATCH_SIZE = 200
 
 
 class JobState(Enum):
@@ -39,9 +44,16 @@ class JobMonitor:
         
         # 监控状态
         self.monitoring = False
+        self._stop_event = threading.Event()  # stop_monitoring时立即结束轮询等待
         self.monitored_jobs = {}
         self.monitoring_history = []
         
+        # 作业状态没有变化时，各次监控快照共用同一份job_states
+        self._job_states_cache: Optional[Dict] = None
+        
+        # 执行状态查询命令的长期shell通道（monitor_persistent_shell启用时）
+        self._shell: Optional[RemoteShell] = None
+        
         # 统计信息
         self.stats = {
             "total_jobs": 0,
@@ -49,6 +61,7 @@ class JobMonitor:
             "failed_jobs": 0,
             "running_jobs": 0,
             "pending_jobs": 0,
+            "downloaded_jobs": 0,
             "monitoring_start_time": None,
             "last_update_time": None
         }
@@ -69,8 +82,11 @@ class JobMonitor:
         
         # 初始化监控状态
         self.monitoring = True
+        self._stop_event.clear()
         self.monitored_jobs = {}
+        self._job_states_cache = None
         self.stats["total_jobs"] = len(jobs)
+        self.stats["downloaded_jobs"] = 0
         self.stats["monitoring_start_time"] = datetime.now().isoformat()
         
         # 初始化作业状态
@@ -101,6 +117,13 @@ class JobMonitor:
         """
         self.logger.info("开始作业监控循环...")
         
+        # 整个监控期间复用同一连接，两次检查之间由保活包维持连接
+        transport = ssh_client.get_transport()
+        if transport is not None:
+            transport.set_keepalive(self.config.ssh_keepalive_interval)
+        if self.config.monitor_persistent_shell:
+            self._shell = RemoteShell(ssh_client)
+        
         try:
             while self.monitoring and self._has_active_jobs():
                 # 检查所有作业状态
@@ -121,9 +144,10 @@ class JobMonitor:
                     self.logger.info("所有作业已完成，结束监控")
                     break
                 
-                # 等待下次检查
+                # 等待下次检查（stop_monitoring会立即唤醒）
                 self.logger.debug(f"等待{self.config.monitor_interval}秒后进行下次检查...")
-                time.sleep(self.config.monitor_interval)
+                if self._stop_event.wait(self.config.monitor_interval):
+                    break
             
             # 生成最终报告
             report = self._generate_monitoring_report()
@@ -140,19 +164,36 @@ class JobMonitor:
         except Exception as e:
             self.logger.error(f"作业监控失败: {e}")
             raise JobMonitorError(f"作业监控失败: {e}")
+        finally:
+            if self._shell is not None:
+                self._shell.close()
+                self._shell = None
     
     def _check_all_jobs(self, ssh_client) -> None:
-        """检查所有作业状态"""
+        """检查所有作业状态（SLURM作业每轮用一次sacct批量查询）"""
         scheduler_type = self.config.scheduler_type
         
-        for job_id, job_data in self.monitored_jobs.items():
+        # 跳过已完成的作业
+        active_ids = [
+            job_id for job_id, job_data in self.monitored_jobs.items()
+            if job_data["state"] not in (JobState.COMPLETED, JobState.FAILED, JobState.CANCELLED)
+        ]
+        
+        # 只有数字作业ID参与批量查询，一个无效ID不会让整批查询失败
+        batch_results = {}
+        if scheduler_type == "SLURM":
+            numeric_ids = [job_id for job_id in active_ids if str(job_id).isdigit()]
+            if numeric_ids:
+                batch_results = self._check_slurm_jobs(ssh_client, numeric_ids)
+        
+        for job_id in active_ids:
+            job_data = self.monitored_jobs[job_id]
             try:
-                # 跳过已完成的作业
-                if job_data["state"] in [JobState.COMPLETED, JobState.FAILED, JobState.CANCELLED]:
-                    continue
-                
-                # 检查作业状态
-                new_state, job_info = self._check_job_status(ssh_client, job_id, scheduler_type)
+                # 检查作业状态（批量查询失败时逐个查询）
+                if job_id in batch_results:
+                    new_state, job_info = batch_results[job_id]
+                else:
+                    new_state, job_info = self._check_job_status(ssh_client, job_id, scheduler_type)
                 
                 # 更新作业状态
                 self._update_job_state(job_id, new_state, job_info)
@@ -172,6 +213,85 @@ class JobMonitor:
         else:
             raise JobMonitorError(f"不支持的调度器类型: {scheduler_type}")
     
+    def _check_slurm_jobs(self, ssh_client, job_ids: List[str]) -> Dict[str, Tuple[JobState, Dict]]:
+        """
+        用逗号分隔的作业ID列表批量查询SLURM作业状态
+        
+        Args:
+            ssh_client: SSH客户端连接
+            job_ids: 作业ID列表
+            
+        Returns:
+            Dict[str, Tuple[JobState, Dict]]: 作业ID到 (状态, 作业信息) 的映射；
+                查询出错时返回空字典，由调用方逐个查询
+        """
+        results = {}
+        try:
+            for start in range(0, len(job_ids), _SLURM_QUERY_BATCH_SIZE):
+                chunk = job_ids[start:start + _SLURM_QUERY_BATCH_SIZE]
+                id_list = shlex.quote(",".join(chunk))
+                cmd = f"sacct -j {id_list} -n -o JobID,State,Start,End,ExitCode --parsable2"
+                exit_status, output, _ = self._run_query(ssh_client, cmd)
+                
+                if exit_status != 0:
+                    # 作业可能已经不在记账数据库中，尝试squeue
+                    # （不在队列中的作业视为已完成）
+                    cmd = f"squeue -h -j {id_list} -o '%i|%T'"
+                    exit_status, output, _ = self._run_query(ssh_client, cmd)
+                    queued = {}
+                    if exit_status == 0:
+                        for line in output.splitlines():
+                            queued_id, _, slurm_state = line.strip().partition('|')
+                            if slurm_state:
+                                queued[queued_id] = slurm_state
+                    for job_id in chunk:
+                        if job_id in queued:
+                            results[job_id] = (self._parse_slurm_state(queued[job_id]),
+                                               {"slurm_state": queued[job_id]})
+                        else:
+                            results[job_id] = (JobState.COMPLETED, {})
+                    continue
+                
+                # 只取作业本身的记录（跳过 123.batch 等作业步骤）
+                wanted = set(chunk)
+                for line in output.splitlines():
+                    parts = line.strip().split('|')
+                    if len(parts) >= 3 and parts[0] in wanted and parts[0] not in results:
+                        results[parts[0]] = self._parse_sacct_fields(parts)
+                for job_id in chunk:
+                    results.setdefault(job_id, (JobState.UNKNOWN, {}))
+        
+        except Exception as e:
+            self.logger.debug(f"SLURM批量状态检查失败，改为逐个查询: {e}")
+            return {}
+        
+        return results
+    
+    def _run_query(self, ssh_client, cmd: str) -> Tuple[int, str, str]:
+        """
+        执行状态查询命令
+
+        优先使用长期shell通道，通道出错时改为单独打开通道执行。
+        """
+        if self._shell is not None:
+            try:
+                return self._shell.run(cmd)
+            except Exception as e:
+                self.logger.debug(f"远程shell通道执行失败，改为单独执行: {e}")
+                self._shell = None
+        return run_remote_command(ssh_client, cmd)
+    
+    def _parse_sacct_fields(self, parts: List[str]) -> Tuple[JobState, Dict]:
+        """解析一行 ``JobID|State|Start|End|ExitCode`` 格式的sacct输出"""
+        state_str = parts[1]
+        job_info = {
+            "slurm_state": state_str,
+            "start_time": parts[2] if len(parts) > 2 else "",
+            "end_time": parts[3] if len(parts) > 3 else "",
+            "exit_code": parts[4] if len(parts) > 4 else ""
+        }
+        return self._parse_slurm_state(state_str), job_info
+    
     def _check_slurm_job(self, ssh_client, job_id: str) -> Tuple[JobState, Dict]:
         """检查SLURM作业状态"""
         try:
@@ -203,21 +323,7 @@ class JobMonitor:
                 if line.strip():
                     parts = line.split('|')
                     if len(parts) >= 3:
-                        state_str = parts[1]
-                        start_time = parts[2] if len(parts) > 2 else ""
-                        end_time = parts[3] if len(parts) > 3 else ""
-                        exit_code = parts[4] if len(parts) > 4 else ""
-                        
-                        state = self._parse_slurm_state(state_str)
-                        
-                        job_info = {
-                            "slurm_state": state_str,
-                            "start_time": start_time,
-                            "end_time": end_time,
-                            "exit_code": exit_code
-                        }
-                        
-                        return state, job_info
+                        return self._parse_sacct_fields(parts)
             
             return JobState.UNKNOWN, {}
             
@@ -304,6 +410,7 @@ class JobMonitor:
             self.logger.info(f"作业 {job_id} 状态变更: {old_state.value} -> {new_state.value}")
             
             job_data["state"] = new_state
+            self._job_states_cache = None
             
             # 记录开始时间
             if new_state == JobState.RUNNING and not job_data["start_time"]:
@@ -349,6 +456,8 @@ class JobMonitor:
                     
                     job_data["result_files"] = downloaded_files.get(job_id, [])
                     job_data["downloaded"] = True
+                    self._job_states_cache = None
+                    self.stats["downloaded_jobs"] += 1
                     
                     self.logger.info(f"作业 {job_id} 结果下载完成: {len(job_data['result_files'])} 个文件")
                     
@@ -377,11 +486,13 @@ class JobMonitor:
         })
     
     def _record_monitoring_snapshot(self) -> None:
-        """记录监控快照"""
-        snapshot = {
-            "timestamp": datetime.now().isoformat(),
-            "stats": self.stats.copy(),
-            "job_states": {
+        """
+        记录监控快照
+
+        作业状态、运行时间和下载标记只在状态变化或下载完成时重建。
+        """
+        if self._job_states_cache is None:
+            self._job_states_cache = {
                 job_id: {
                     "state": job_data["state"].value,
                     "runtime": job_data["runtime"],
@@ -389,6 +500,11 @@ class JobMonitor:
                 }
                 for job_id, job_data in self.monitored_jobs.items()
             }
+        
+        snapshot = {
+            "timestamp": datetime.now().isoformat(),
+            "stats": self.stats.copy(),
+            "job_states": self._job_states_cache
         }
         
         self.monitoring_history.append(snapshot)
@@ -402,9 +518,6 @@ class JobMonitor:
         # 计算总运行时间
         total_runtime = sum(job_data["runtime"] for job_data in self.monitored_jobs.values())
         
-        # 统计结果下载情况
-        downloaded_count = sum(1 for job_data in self.monitored_jobs.values() if job_data["downloaded"])
-        
         report = {
             "summary": {
                 "total_jobs": self.stats["total_jobs"],
@@ -413,7 +526,7 @@ class JobMonitor:
                 "success_rate": self.stats["completed_jobs"] / max(self.stats["total_jobs"], 1),
                 "total_runtime_seconds": total_runtime,
                 "average_runtime_seconds": total_runtime / max(self.stats["completed_jobs"], 1),
-                "downloaded_results": downloaded_count,
+                "downloaded_results": self.stats["downloaded_jobs"],
                 "monitoring_duration": self._calculate_monitoring_duration()
             },
             "jobs": {
@@ -453,8 +566,7 @@ class JobMonitor:
                 f"monitoring_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             )
             
-            with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2)
+            write_json_report(report_file, report)
             
             self.logger.info(f"监控报告已保存: {report_file}")
             
@@ -464,6 +576,7 @@ class JobMonitor:
     def stop_monitoring(self) -> None:
         """停止监控"""
         self.monitoring = False
+        self._stop_event.set()
         self.logger.info("作业监控已停止")
     
     def get_job_status(self, job_id: str) -> Optional[Dict]:
@@ -33,9 +33,9 @@ class ScriptGenerator:
         self.config = config
         self.logger = logging.getLogger(__name__)
         
-        # 模板目录
+        # 模板目录（模板在首次加载时编译并缓存，之后不再检查文件是否修改）
         self.template_dir = self._get_template_directory()
-        self.env = Environment(loader=FileSystemLoader(self.template_dir))
+        self.env = Environment(loader=FileSystemLoader(self.template_dir), auto_reload=False)
         
         # 添加自定义过滤器
         self.env.filters['strftime'] = lambda date, fmt: date.strftime(fmt) if hasattr(date, 'strftime') else datetime.now().strftime(fmt)
@@ -160,7 +160,7 @@ class ScriptGenerator:
             with open(script_path, 'w', encoding='utf-8', newline='\n') as f:
                 f.write(content)
             
-            self.logger.debug(f"生成作业脚本: {script_path}")
+            self.logger.debug("生成作业脚本: %s", script_path)
             return script_path
             
         except Exception as e:
@@ -185,7 +185,7 @@ class ScriptGenerator:
         """准备模板变量"""
         
         # 调试日志：检查job中的initial_file
-        self.logger.info(f"[DEBUG] 作业数据 - pressure: {job.get('pressure')}, initial_file: {job.get('initial_file', 'NOT_FOUND')}")
+        self.logger.debug("作业数据 - pressure: %s, initial_file: %s", job.get("pressure"), job.get("initial_file", "NOT_FOUND"))
         
         # 基础变量
         variables = {
@@ -339,7 +339,7 @@ class ScriptGenerator:
                 if allocated_nodes_tracker is not None and not use_best_real_node:
                     for node_name in allocation_result.allocated_nodes:
                         allocated_nodes_tracker.add(node_name)
-                        self.logger.debug(f"节点 {node_name} 已添加到分配跟踪器")
+                        self.logger.debug("节点 %s 已添加到分配跟踪器", node_name)
                 
                 # 记录分配详情
                 if allocation_result.warnings:
@@ -589,7 +589,7 @@ class ScriptGenerator:
                 "total_jobs": len(job_scripts)
             }
             
-            self.logger.debug(f"模板变量: {variables}")
+            self.logger.debug("模板变量: %s", variables)
             
             # 渲染模板
             try:
@@ -600,7 +600,7 @@ class ScriptGenerator:
                 return self._generate_default_submit_script(job_scripts, queue_strategy, available_nodes)
             
             # 保存脚本
-            script_path = os.path.join(self.config.base_path, "Submit_All.sh")
+            script_path = self.config.get_submit_script_path()
             with open(script_path, 'w', encoding='utf-8', newline='\n') as f:
                 f.write(content)
             
@@ -690,7 +690,7 @@ class ScriptGenerator:
         
         content = "\n".join(script_lines)
         
-        script_path = os.path.join(self.config.base_path, "Submit_All.sh")
+        script_path = self.config.get_submit_script_path()
         with open(script_path, 'w', encoding='utf-8', newline='\n') as f:
             f.write(content)
         
@@ -722,7 +722,7 @@ class ScriptGenerator:
             content = template.render(**variables)
             
             # 保存脚本
-            script_path = os.path.join(self.config.base_path, "Monitor_Jobs.sh")
+            script_path = self.config.get_monitor_script_path()
             with open(script_path, 'w', encoding='utf-8', newline='\n') as f:
                 f.write(content)
             
@@ -782,7 +782,7 @@ class ScriptGenerator:
         
         content = "\n".join(script_lines)
         
-        script_path = os.path.join(self.config.base_path, "Monitor_Jobs.sh")
+        script_path = self.config.get_monitor_script_path()
         with open(script_path, 'w', encoding='utf-8', newline='\n') as f:
             f.write(content)
         
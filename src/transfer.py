@@ -4,14 +4,54 @@
 """
 
 import os
+import fnmatch
 import hashlib
+import queue
+import re
+from collections import Counter
 import logging
+import shlex
+import shutil
+import stat
+import threading
 import time
-from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import PurePosixPath
+from typing import List, Dict, Optional, Set, Tuple
 import paramiko
 
 from .config import CFXAutomationConfig
+from .utils.checksum import local_md5, remote_md5sums
+from .utils.remote_exec import REMOTE_BATCH_SIZE, run_remote_command
+from .utils.retry import CircuitBreaker, retry_delay
+from .utils.sftp_io import open_pipelined, put_local_file, shares_local_filesystem
+from .utils.upload_backends import SCRIPT_SUFFIXES, UploadBackends
+from .utils.upload_manifest import UploadManifest
+
+# 上传后需要设置执行权限的脚本文件后缀（.slurm通过sbatch提交，
+# 无需执行权限）
+_EXECUTABLE_SUFFIXES = ('.sh',)
+
+# 脚本行结尾转换表：残留的CR统一转换为LF
+_CR_TO_LF = bytes.maketrans(b"\r", b"\n")
+
+# 上传进度日志最多输出的批次数
+_PROGRESS_LOG_BATCHES = 20
+
+# 上传记录清单（相对base_path），用于跳过远程已是最新版本的文件
+_UPLOAD_CACHE_MANIFEST = os.path.join(".cache", "upload_manifest.json")
+
+
+@lru_cache(maxsize=64)
+def _compile_patterns(patterns: Tuple[str, ...]) -> "re.Pattern":
+    """将多个通配符模式编译为一个正则表达式（远程路径区分大小写）"""
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+
+def _format_size_mb(size_bytes: int) -> str:
+    """将字节数格式化为MB字符串"""
+    return f"{size_bytes / (1 << 20):.2f}MB"
 
 
 class TransferError(Exception):
@@ -22,10 +62,24 @@ class TransferError(Exception):
 class FileTransferManager:
     """文件传输管理器"""
     
+    # 文件扩展名到文件类型的映射
+    _EXT_TO_TYPE = {
+        ".def": "CFX定义文件",
+        ".slurm": "SLURM作业脚本",
+        ".sh": "Shell脚本",
+        ".pre": "CFX预处理脚本",
+        ".ini": "CFX初始文件",
+        ".res": "CFX结果文件",
+    }
+    
     def __init__(self, config: CFXAutomationConfig):
         self.config = config
         self.logger = logging.getLogger(__name__)
         
+        # 展开后的SSH私钥路径（只解析一次）
+        self._ssh_key_file = os.path.expanduser(config.ssh_key) if config.ssh_key else ""
+        self._ssh_key_exists = bool(self._ssh_key_file) and os.path.exists(self._ssh_key_file)
+        
         # 传输统计
         self.transfer_stats = {
             "uploaded_files": 0,
@@ -34,124 +88,532 @@ class FileTransferManager:
             "download_bytes": 0,
             "failed_transfers": 0
         }
+        
+        # 已确认存在的远程目录缓存（避免重复mkdir往返）
+        self._known_remote_dirs = set()
+        
+        # 同一批传输中连续失败的文件数（熔断器）
+        self._circuit_breaker = CircuitBreaker(config.circuit_breaker_threshold)
+        
+        # 已调整过加密/压缩参数的传输层
+        self._optimized_transports = set()
+        
+        # (传输层, 远程目录) -> 是否与本机共享文件系统和用户（探测结果）
+        self._shared_fs_dirs: Dict[Tuple[int, str], bool] = {}
+        self._shared_fs_lock = threading.Lock()
+        
+        # 上传记录清单（首次使用时加载，键区分不同服务器）
+        self._upload_manifest = UploadManifest(
+            os.path.join(config.base_path, _UPLOAD_CACHE_MANIFEST),
+            f"{config.ssh_user}@{config.ssh_host}:{config.ssh_port}:",
+            config.sftp_block_size
+        )
+        
+        # asyncssh/rsync/tar流批量上传后端
+        self._backends = UploadBackends(config, self._ssh_key_file, self._ssh_key_exists)
     
     def upload_files(self, ssh_client, file_list: List[str], 
-                    remote_dir: str, preserve_structure: bool = False) -> Dict[str, str]:
+                    remote_dir: str, preserve_structure: bool = False,
+                    extra_clients: Optional[List] = None) -> Dict[str, str]:
         """
-        上传文件到远程服务器
+        上传文件到远程服务器（远程已是最新版本的文件直接跳过）
         
         Args:
             ssh_client: SSH客户端连接
             file_list: 本地文件路径列表
             remote_dir: 远程目录
             preserve_structure: 是否保持目录结构
+            extra_clients: 附加的SSH连接，SFTP会话在所有连接间轮流分配
             
         Returns:
             Dict[str, str]: 本地文件路径到远程文件路径的映射
+                （包括跳过的文件）
         """
-        self.logger.info(f"开始上传{len(file_list)}个文件到 {remote_dir}")
+        # 熔断器只在同一批传输内生效，上一批的失败不影响本批
+        self.reset_circuit_breaker()
+        
+        targets = [
+            (f, str(self._get_remote_path(f, remote_dir, preserve_structure))) for f in file_list
+        ]
+        unchanged_remote = self.find_unchanged_uploads(ssh_client, targets)
+        unchanged = {f: remote for f, remote in targets if remote in unchanged_remote}
+        if unchanged:
+            self.logger.info(
+                "跳过%s个未变化的文件（远程已是最新版本）", len(unchanged)
+            )
+        
+        to_upload = [f for f in file_list if f not in unchanged]
+        uploaded = {}
+        if to_upload:
+            uploaded = self._upload_files(
+                ssh_client, to_upload, remote_dir, preserve_structure, extra_clients
+            )
+            self.record_uploads(ssh_client, list(uploaded.items()))
+        
+        # 按输入顺序返回结果
+        return {
+            f: uploaded.get(f) or unchanged[f]
+            for f in file_list if f in uploaded or f in unchanged
+        }
+    
+    def _upload_files(self, ssh_client, file_list: List[str], remote_dir: str,
+                      preserve_structure: bool, extra_clients: Optional[List]) -> Dict[str, str]:
+        """上传文件到远程服务器（参数见upload_files）"""
+        self.logger.info("开始上传%s个文件到 %s", len(file_list), remote_dir)
+        self._optimize_transport(ssh_client)
         
         # 显示文件清单
         self._display_file_manifest(file_list)
         
         try:
-            # 确保远程目录存在
-            self._ensure_remote_directory(ssh_client, remote_dir)
+            # 一次性创建目标目录及所有远程子目录
+            remote_dirs = [remote_dir]
+            if preserve_structure:
+                remote_dirs.extend(
+                    str(self._get_remote_path(f, remote_dir, True).parent) for f in file_list
+                )
+            self.ensure_remote_directories(ssh_client, remote_dirs)
             
-            # 打开SFTP连接
-            sftp = ssh_client.open_sftp()
+            total = len(file_list)
+            progress_step = max(1, total // _PROGRESS_LOG_BATCHES)
+            log_each_file = self.logger.isEnabledFor(logging.DEBUG)
             
-            uploaded_files = {}
+            # 多文件上传时在传输结束后用一次md5sum统一校验，
+            # 避免每个文件一次远程调用
+            batch_verify = self.config.enable_checksum_verification and total > 1
             
-            for i, local_file in enumerate(file_list, 1):
+            # asyncssh/rsync/tar流后端先上传普通文件，
+            # 脚本文件和失败的文件交给下面的SFTP线程池
+            completed = self._backends.upload(
+                ssh_client, file_list, remote_dir, preserve_structure,
+                lambda f: self._get_remote_path(f, remote_dir, preserve_structure)
+            )
+            for local_file in completed:
+                self.transfer_stats["uploaded_files"] += 1
+                self.transfer_stats["upload_bytes"] += os.path.getsize(local_file)
+            pending = [f for f in file_list if f not in completed]
+            
+            # 打开多个SFTP会话（有附加连接时轮流分配到各连接），
+            # 由线程池并行上传
+            clients = [ssh_client] + list(extra_clients or [])
+            for client in clients[1:]:
+                self._optimize_transport(client)
+            workers = max(1, min(self.config.max_parallel_transfers, len(pending)))
+            sftp_pool = queue.Queue()
+            for i in range(workers):
+                sftp_pool.put(self.open_sftp(clients[i % len(clients)]))
+            
+            def upload_one(local_file: str) -> str:
+                sftp = sftp_pool.get()
                 try:
-                    # 显示当前上传进度
-                    filename = os.path.basename(local_file)
-                    self.logger.info(f"[{i}/{len(file_list)}] 正在上传: {filename}")
-                    
-                    remote_file = self._upload_single_file(
-                        sftp, local_file, remote_dir, preserve_structure
+                    if log_each_file:
+                        self.logger.debug("正在上传: %s", os.path.basename(local_file))
+                    return self._upload_single_file(
+                        ssh_client, sftp, local_file, remote_dir, preserve_structure,
+                        verify=not batch_verify
                     )
-                    uploaded_files[local_file] = remote_file
-                    self.transfer_stats["uploaded_files"] += 1
-                    
-                    # 计算文件大小
-                    file_size = os.path.getsize(local_file)
-                    self.transfer_stats["upload_bytes"] += file_size
-                    
-                    # 显示成功信息
-                    size_mb = round(file_size / (1024 * 1024), 2)
-                    self.logger.info(f"✓ [{i}/{len(file_list)}] 上传完成: {filename} ({size_mb}MB)")
+                finally:
+                    sftp_pool.put(sftp)
+            
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = {executor.submit(upload_one, f): f for f in pending}
                     
-                except Exception as e:
-                    self.logger.error(f"✗ [{i}/{len(file_list)}] 上传失败 {os.path.basename(local_file)}: {e}")
-                    self.transfer_stats["failed_transfers"] += 1
-                    continue
+                    for i, future in enumerate(as_completed(futures), len(completed) + 1):
+                        local_file = futures[future]
+                        try:
+                            completed[local_file] = future.result()
+                            self.transfer_stats["uploaded_files"] += 1
+                            
+                            # 计算文件大小
+                            file_size = os.path.getsize(local_file)
+                            self.transfer_stats["upload_bytes"] += file_size
+                            
+                            # 显示成功信息：DEBUG逐个输出，INFO按批次汇总
+                            if log_each_file:
+                                self.logger.debug(
+                                    "✓ [%s/%s] 上传完成: %s (%s)",
+                                    i, total, os.path.basename(local_file),
+                                    _format_size_mb(file_size)
+                                )
+                            elif i % progress_step == 0 or i == total:
+                                self.logger.info("上传进度: [%s/%s]", i, total)
+                            
+                        except Exception as e:
+                            self.logger.error(
+                                "✗ [%s/%s] 上传失败 %s: %s",
+                                i, total, os.path.basename(local_file), e
+                            )
+                            self.transfer_stats["failed_transfers"] += 1
+                
+                if batch_verify and completed:
+                    sftp = sftp_pool.get()
+                    try:
+                        self._verify_uploads_batch(
+                            ssh_client, sftp, completed, remote_dir, preserve_structure
+                        )
+                    finally:
+                        sftp_pool.put(sftp)
+            finally:
+                while not sftp_pool.empty():
+                    sftp_pool.get().close()
             
-            sftp.close()
+            # 按输入顺序返回结果
+            uploaded_files = {f: completed[f] for f in file_list if f in completed}
             
-            self.logger.info(f"文件上传完成: {len(uploaded_files)}/{len(file_list)} 成功")
+            # 所有上传完成后统一设置Shell脚本的执行权限（一次远程调用）
+            executables = [r for f, r in uploaded_files.items() if f.endswith(_EXECUTABLE_SUFFIXES)]
+            if executables:
+                self._make_remote_executable(ssh_client, executables)
+            
+            self.logger.info(
+                "文件上传完成: %s/%s 成功", len(uploaded_files), len(file_list)
+            )
             return uploaded_files
             
         except Exception as e:
-            self.logger.error(f"文件上传失败: {e}")
+            self.logger.error("文件上传失败: %s", e)
             raise TransferError(f"文件上传失败: {e}")
     
-    def _upload_single_file(self, sftp, local_file: str, remote_dir: str, 
-                          preserve_structure: bool) -> str:
+    def find_unchanged_uploads(self, ssh_client, targets: List[Tuple[str, str]]) -> Set[str]:
+        """
+        找出自上次上传后本地和远程都未变化的文件
+        
+        本地文件与上传清单比较（见UploadManifest），远程文件通过批量
+        ``stat`` 比较大小和修改时间。
+        
+        Args:
+            ssh_client: SSH客户端连接
+            targets: (本地文件路径, 远程文件路径) 列表，
+                同一本地文件可以对应多个远程路径
+            
+        Returns:
+            Set[str]: 可以跳过上传的远程文件路径
+        """
+        if not self.config.skip_unchanged_uploads or not targets:
+            return set()
+        
+        try:
+            candidates = self._upload_manifest.find_candidates(targets)
+            if not candidates:
+                return set()
+            
+            remote_stats = self._stat_remote_files(ssh_client, list(candidates))
+            return {
+                remote_file for remote_file, recorded in candidates.items()
+                if remote_stats.get(remote_file) == recorded
+            }
+        except Exception as e:
+            self.logger.debug("检查未变化的上传文件失败，全部重新上传: %s", e)
+            return set()
+    
+    def record_uploads(self, ssh_client, uploaded: List[Tuple[str, str]]) -> None:
+        """
+        记录已上传文件的本地指纹和远程大小/修改时间，供下次上传时跳过
+        
+        Args:
+            ssh_client: SSH客户端连接
+            uploaded: 已上传的 (本地文件路径, 远程文件路径) 列表
+        """
+        if not self.config.skip_unchanged_uploads or not uploaded:
+            return
+        
+        try:
+            remote_stats = self._stat_remote_files(ssh_client, [remote for _, remote in uploaded])
+            self._upload_manifest.record(uploaded, remote_stats)
+        except Exception as e:
+            self.logger.debug("记录上传清单失败: %s", e)
+    
+    def _stat_remote_files(self, ssh_client, remote_files: List[str]) -> Dict[str, Tuple[int, int]]:
+        """
+        通过批量 ``stat`` 获取远程文件的大小和修改时间，
+        不存在的文件不出现在结果中
+        
+        Args:
+            ssh_client: SSH客户端连接
+            remote_files: 远程文件路径列表
+            
+        Returns:
+            Dict[str, Tuple[int, int]]: 远程文件路径到 (大小, 修改时间) 的映射
+        """
+        stats = {}
+        for start in range(0, len(remote_files), REMOTE_BATCH_SIZE):
+            chunk = remote_files[start:start + REMOTE_BATCH_SIZE]
+            cmd = "stat -c '%s %Y %n' -- " + " ".join(shlex.quote(f) for f in chunk)
+            _, output, _ = run_remote_command(ssh_client, cmd, self.config.transfer_timeout)
+            
+            for line in output.splitlines():
+                parts = line.split(" ", 2)
+                if len(parts) == 3 and parts[0].isdigit() and parts[1].isdigit():
+                    stats[parts[2]] = (int(parts[0]), int(parts[1]))
+        return stats
+    
+    def _verify_uploads_batch(self, ssh_client, sftp, completed: Dict[str, str],
+                              remote_dir: str, preserve_structure: bool) -> None:
+        """
+        批量校验已上传文件，不一致的文件重新上传（带单文件校验），
+        仍失败则从结果中移除
+        
+        Args:
+            ssh_client: SSH客户端连接
+            sftp: SFTP客户端
+            completed: 本地文件路径到远程文件路径的映射（原地更新）
+            remote_dir: 远程目录
+            preserve_structure: 是否保持目录结构
+        """
+        # 转换过行结尾的脚本文件不参与校验
+        to_verify = {
+            remote: local for local, remote in completed.items()
+            if not local.endswith(SCRIPT_SUFFIXES)
+        }
+        if not to_verify:
+            return
+        
+        for remote_file in self._verify_transfers_batch(ssh_client, sftp, to_verify):
+            local_file = to_verify[remote_file]
+            self.logger.warning(
+                "文件完整性验证失败，重新上传: %s", os.path.basename(local_file)
+            )
+            try:
+                self._upload_single_file(
+                    ssh_client, sftp, local_file, remote_dir, preserve_structure, verify=True
+                )
+            except Exception as e:
+                self.logger.error("✗ 上传失败 %s: %s", os.path.basename(local_file), e)
+                del completed[local_file]
+                self.transfer_stats["uploaded_files"] -= 1
+                self.transfer_stats["upload_bytes"] -= os.path.getsize(local_file)
+                self.transfer_stats["failed_transfers"] += 1
+    
+    def upload_copies_asyncssh(self, local_file: str,
+                               remote_files: List[str]) -> Optional[List[str]]:
+        """
+        通过asyncssh在一个连接上把同一个本地文件并发上传到多个远程路径
+        
+        Args:
+            local_file: 本地文件路径
+            remote_files: 远程文件路径列表（所在目录需已创建）
+            
+        Returns:
+            Optional[List[str]]: 上传成功的远程文件路径；
+                未启用asyncssh或连接失败时返回None，由调用方改用paramiko上传
+        """
+        uploaded = self._backends.upload_copies_asyncssh(local_file, remote_files)
+        if uploaded:
+            self.transfer_stats["uploaded_files"] += len(uploaded)
+            self.transfer_stats["upload_bytes"] += os.path.getsize(local_file) * len(uploaded)
+        return uploaded
+    
+    def _get_remote_path(self, local_file: str, remote_dir: str,
+                         preserve_structure: bool) -> PurePosixPath:
+        """确定本地文件对应的远程路径"""
+        if preserve_structure:
+            # 保持目录结构；base_path下的文件直接截去前缀，
+            # 省去relpath对两个路径的规范化
+            base_path = self.config.base_path
+            base_prefix = os.path.join(base_path, "") if base_path else ""
+            if base_prefix and local_file.startswith(base_prefix):
+                rel_path = local_file[len(base_prefix):]
+            else:
+                rel_path = os.path.relpath(local_file, base_path)
+            if os.sep != "/":
+                rel_path = rel_path.replace(os.sep, "/")
+            return PurePosixPath(remote_dir, rel_path)
+        
+        # 直接放在目标目录
+        return PurePosixPath(remote_dir) / os.path.basename(local_file)
+    
+    def _upload_single_file(self, ssh_client, sftp, local_file: str, remote_dir: str, 
+                          preserve_structure: bool, verify: bool = True) -> str:
         """上传单个文件"""
+        self._check_circuit_breaker()
+        
         if not os.path.exists(local_file):
             raise TransferError(f"本地文件不存在: {local_file}")
         
         # 确定远程文件路径
-        if preserve_structure:
-            # 保持目录结构
-            rel_path = os.path.relpath(local_file, self.config.base_path)
-            remote_file = os.path.join(remote_dir, rel_path).replace('\\', '/')
-            
-            # 确保远程子目录存在
-            remote_subdir = os.path.dirname(remote_file)
-            if remote_subdir != remote_dir:
-                self._ensure_remote_directory_sftp(sftp, remote_subdir)
-        else:
-            # 直接放在目标目录
-            filename = os.path.basename(local_file)
-            remote_file = os.path.join(remote_dir, filename).replace('\\', '/')
+        remote_path = self._get_remote_path(local_file, remote_dir, preserve_structure)
+        remote_file = str(remote_path)
+        
+        # 确保远程子目录存在（upload_files已批量创建时命中缓存）
+        if preserve_structure and remote_path.parent != PurePosixPath(remote_dir):
+            self._ensure_remote_directory_sftp(ssh_client, sftp, str(remote_path.parent))
         
         # 执行传输（带重试）
         for attempt in range(self.config.transfer_retry_times):
             try:
                 # 如果是脚本文件（.sh或.slurm），需要转换行结尾符
-                if local_file.endswith(('.sh', '.slurm')):
-                    # 读取文件并转换CRLF为LF
-                    with open(local_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    # 转换行结尾符
-                    content = content.replace('\r\n', '\n').replace('\r', '\n')
+                if local_file.endswith(SCRIPT_SUFFIXES):
+                    # 以字节读取，避免UTF-8解码/编码往返
+                    with open(local_file, 'rb') as f:
+                        raw = f.read()
+                    # 先合并CRLF为LF，再将残留的CR转换为LF
+                    content = raw.replace(b"\r\n", b"\n").translate(_CR_TO_LF)
                     
                     # 上传转换后的内容
                     with sftp.open(remote_file, 'w') as remote_f:
-                        remote_f.write(content.encode('utf-8'))
+                        remote_f.write(content)
+                elif self._use_sendfile_shortcut(ssh_client, sftp, remote_dir):
+                    # 远程目录与本机共享文件系统：由内核sendfile直接复制，
+                    # 跳过SFTP加密与用户态拷贝
+                    shutil.copyfile(local_file, remote_file)
                 else:
                     # 普通文件直接上传
-                    sftp.put(local_file, remote_file)
+                    self.put_file(sftp, local_file, remote_file)
                 
                 # 验证传输完整性（对于转换过的脚本文件跳过验证）
-                if self.config.enable_checksum_verification and not local_file.endswith(('.sh', '.slurm')):
-                    if not self._verify_file_integrity(sftp, local_file, remote_file):
+                if (verify and self.config.enable_checksum_verification
+                        and not local_file.endswith(SCRIPT_SUFFIXES)):
+                    if not self._verify_file_integrity(ssh_client, sftp, local_file, remote_file):
                         raise TransferError("文件完整性验证失败")
                 
+                self._circuit_breaker.record_success()
                 return remote_file
                 
             except Exception as e:
                 if attempt < self.config.transfer_retry_times - 1:
-                    self.logger.warning(f"上传重试 {attempt + 1}/{self.config.transfer_retry_times}: {e}")
-                    time.sleep(2 ** attempt)  # 指数退避
+                    self.logger.warning(
+                        "上传重试 %s/%s: %s", attempt + 1, self.config.transfer_retry_times, e
+                    )
+                    time.sleep(retry_delay(attempt, self.config.retry_max_delay))
                 else:
+                    self._circuit_breaker.record_failure()
                     raise
         
         raise TransferError(f"上传失败，已重试{self.config.transfer_retry_times}次")
     
+    def open_sftp(self, ssh_client):
+        """以较大的通道窗口和包大小打开SFTP会话"""
+        transport = ssh_client.get_transport()
+        if transport is None:
+            return ssh_client.open_sftp()
+        
+        return paramiko.SFTPClient.from_transport(
+            transport,
+            window_size=self.config.sftp_window_size,
+            max_packet_size=self.config.sftp_max_packet_size
+        )
+    
+    def put_file(self, sftp, local_file: str, remote_file: str, confirm: bool = True) -> None:
+        """
+        以可配置的块大小流水线写入远程文件
+        
+        paramiko的put固定按32KB读取本地文件，这里按sftp_block_size读取并写入，
+        写请求以流水线方式发送，不逐块等待服务器确认
+        （关闭文件时统一检查写入结果）。
+        
+        Args:
+            sftp: SFTP客户端
+            local_file: 本地文件路径
+            remote_file: 远程文件路径
+            confirm: 是否在写入后stat远程文件确认大小（多一次往返）
+        
+        Raises:
+            TransferError: 远程文件大小与本地不一致
+        """
+        file_size = os.path.getsize(local_file)
+        put_local_file(sftp, local_file, remote_file, self.config.sftp_block_size)
+        
+        if not confirm:
+            return
+        
+        remote_size = sftp.stat(remote_file).st_size
+        if remote_size != file_size:
+            raise TransferError(f"文件大小不一致 {remote_size} != {file_size}")
+    
+    def put_data(self, sftp, data: bytes, remote_file: str) -> None:
+        """
+        以流水线方式把内存中的数据写入远程文件
+        （同一内容上传到多个位置时避免重复读取本地文件）
+        
+        Args:
+            sftp: SFTP客户端
+            data: 文件内容
+            remote_file: 远程文件路径
+        """
+        block_size = self.config.sftp_block_size
+        
+        with open_pipelined(sftp, remote_file, block_size) as remote_f:
+            for offset in range(0, len(data), block_size):
+                remote_f.write(data[offset:offset + block_size])
+    
+    def _optimize_transport(self, ssh_client) -> None:
+        """
+        调整SSH传输层参数：优先使用支持AES-NI的加密算法，
+        并按配置开关压缩
+        
+        算法顺序在下一次密钥交换（rekey）时生效；
+        未被paramiko支持的算法会被忽略，
+        其余默认算法保留在列表末尾，保证协商不会失败。
+        首次连接的压缩设置由WorkflowOrchestrator在connect时传入。
+        之后在该连接上打开的exec通道（md5sum校验、远程命令）
+        也使用与SFTP会话相同的窗口和包大小。
+        """
+        try:
+            transport = ssh_client.get_transport()
+            if transport is None or id(transport) in self._optimized_transports:
+                return
+            
+            options = transport.get_security_options()
+            supported = tuple(options.ciphers)
+            preferred = [c for c in self.config.preferred_ciphers if c in supported]
+            options.ciphers = tuple(preferred) + tuple(c for c in supported if c not in preferred)
+            transport.use_compression(self.config.ssh_compression)
+            transport.default_window_size = self.config.sftp_window_size
+            transport.default_max_packet_size = self.config.sftp_max_packet_size
+            
+            self._optimized_transports.add(id(transport))
+            
+        except Exception as e:
+            self.logger.debug("调整SSH传输参数失败: %s", e)
+    
+    def _check_circuit_breaker(self) -> None:
+        """
+        同一批传输中连续失败次数超过阈值时快速失败
+        （upload_files/download_files开始时重置）
+        
+        Raises:
+            TransferError: 熔断器已打开（服务器可能不可用）
+        """
+        if self._circuit_breaker.is_open:
+            raise TransferError(
+                f"连续{self._circuit_breaker.failures}个文件传输失败，"
+                f"已停止传输 (circuit open)"
+            )
+    
+    def reset_circuit_breaker(self) -> None:
+        """重置熔断器，允许继续传输（每批上传/下载开始时自动调用）"""
+        self._circuit_breaker.reset()
+    
+    def _use_sendfile_shortcut(self, ssh_client, sftp, remote_dir: str) -> bool:
+        """
+        判断是否可以跳过SFTP直接在本机复制文件
+        
+        每个连接和远程目录只探测一次（见shares_local_filesystem），
+        回环地址本身不作为依据。
+        
+        Args:
+            ssh_client: SSH客户端连接
+            sftp: SFTP客户端
+            remote_dir: 上传目标目录
+            
+        Returns:
+            bool: 是否直接在本机复制
+        """
+        if not self.config.enable_sendfile_shortcut:
+            return False
+        
+        key = (id(ssh_client.get_transport()), remote_dir)
+        with self._shared_fs_lock:
+            if key not in self._shared_fs_dirs:
+                shared = shares_local_filesystem(sftp, remote_dir)
+                self.logger.info(
+                    "远程目录%s与本机共享文件系统: %s", "" if shared else "不",
+                    remote_dir
+                )
+                self._shared_fs_dirs[key] = shared
+            return self._shared_fs_dirs[key]
+    
     def download_files(self, ssh_client, remote_files: List[str], 
                       local_dir: str, preserve_structure: bool = False) -> Dict[str, str]:
         """
@@ -166,51 +628,78 @@ class FileTransferManager:
         Returns:
             Dict[str, str]: 远程文件路径到本地文件路径的映射
         """
-        self.logger.info(f"开始下载{len(remote_files)}个文件到 {local_dir}")
+        self.logger.info("开始下载%s个文件到 %s", len(remote_files), local_dir)
+        self._optimize_transport(ssh_client)
+        self.reset_circuit_breaker()
         
         try:
             # 确保本地目录存在
             os.makedirs(local_dir, exist_ok=True)
             
             # 打开SFTP连接
-            sftp = ssh_client.open_sftp()
+            sftp = self.open_sftp(ssh_client)
             
             downloaded_files = {}
             
+            # 多文件下载时在传输结束后统一批量校验，
+            # 避免逐个串行计算哈希
+            batch_verify = self.config.enable_checksum_verification and len(remote_files) > 1
+            
             for remote_file in remote_files:
                 try:
                     local_file = self._download_single_file(
-                        sftp, remote_file, local_dir, preserve_structure
+                        ssh_client, sftp, remote_file, local_dir, preserve_structure,
+                        verify=not batch_verify
                     )
                     downloaded_files[remote_file] = local_file
-                    self.transfer_stats["downloaded_files"] += 1
-                    
-                    # 计算文件大小
-                    file_size = os.path.getsize(local_file)
-                    self.transfer_stats["download_bytes"] += file_size
-                    
-                    self.logger.debug(f"下载成功: {remote_file} -> {local_file}")
+                    self.logger.debug("下载成功: %s -> %s", remote_file, local_file)
                     
                 except Exception as e:
-                    self.logger.error(f"下载文件失败 {remote_file}: {e}")
+                    self.logger.error("下载文件失败 %s: %s", remote_file, e)
                     self.transfer_stats["failed_transfers"] += 1
                     continue
             
+            if batch_verify and downloaded_files:
+                mismatched = self._verify_transfers_batch(ssh_client, sftp, downloaded_files)
+                for remote_file in mismatched:
+                    # 校验失败的文件逐个重新下载（带单文件校验和重试）
+                    self.logger.warning(
+                        "文件完整性验证失败，重新下载: %s", remote_file
+                    )
+                    try:
+                        self._download_single_file(
+                            ssh_client, sftp, remote_file, local_dir, preserve_structure,
+                            verify=True
+                        )
+                    except Exception as e:
+                        self.logger.error("下载文件失败 %s: %s", remote_file, e)
+                        self.transfer_stats["failed_transfers"] += 1
+                        del downloaded_files[remote_file]
+            
+            # 统计下载结果
+            for local_file in downloaded_files.values():
+                self.transfer_stats["downloaded_files"] += 1
+                self.transfer_stats["download_bytes"] += os.path.getsize(local_file)
+            
             sftp.close()
             
-            self.logger.info(f"文件下载完成: {len(downloaded_files)}/{len(remote_files)} 成功")
+            self.logger.info(
+                "文件下载完成: %s/%s 成功", len(downloaded_files), len(remote_files)
+            )
             return downloaded_files
             
         except Exception as e:
-            self.logger.error(f"文件下载失败: {e}")
+            self.logger.error("文件下载失败: %s", e)
             raise TransferError(f"文件下载失败: {e}")
     
-    def _download_single_file(self, sftp, remote_file: str, local_dir: str,
-                            preserve_structure: bool) -> str:
+    def _download_single_file(self, ssh_client, sftp, remote_file: str, local_dir: str,
+                            preserve_structure: bool, verify: bool = True) -> str:
         """下载单个文件"""
+        self._check_circuit_breaker()
+        
         # 检查远程文件是否存在
         try:
-            sftp.stat(remote_file)
+            remote_size = sftp.stat(remote_file).st_size
         except FileNotFoundError:
             raise TransferError(f"远程文件不存在: {remote_file}")
         
@@ -231,20 +720,36 @@ class FileTransferManager:
         # 执行传输（带重试）
         for attempt in range(self.config.transfer_retry_times):
             try:
-                sftp.get(remote_file, local_file)
+                verify_now = verify and self.config.enable_checksum_verification
+                
+                # 预读+大块读取；校验时同步计算本地哈希，
+                # 避免事后重新读取文件
+                hasher = hashlib.md5() if verify_now else None
+                block_size = self.config.sftp_block_size
+                with self._open_remote_for_read(sftp, remote_file, remote_size) as remote_f, \
+                        open(local_file, 'wb') as local_f:
+                    for chunk in iter(lambda: remote_f.read(block_size), b""):
+                        local_f.write(chunk)
+                        if hasher:
+                            hasher.update(chunk)
                 
                 # 验证传输完整性
-                if self.config.enable_checksum_verification:
-                    if not self._verify_file_integrity(sftp, local_file, remote_file, reverse=True):
+                if verify_now:
+                    if not self._verify_file_integrity(ssh_client, sftp, local_file, remote_file,
+                                                       local_hash=hasher.hexdigest()):
                         raise TransferError("文件完整性验证失败")
                 
+                self._circuit_breaker.record_success()
                 return local_file
                 
             except Exception as e:
                 if attempt < self.config.transfer_retry_times - 1:
-                    self.logger.warning(f"下载重试 {attempt + 1}/{self.config.transfer_retry_times}: {e}")
-                    time.sleep(2 ** attempt)
+                    self.logger.warning(
+                        "下载重试 %s/%s: %s", attempt + 1, self.config.transfer_retry_times, e
+                    )
+                    time.sleep(retry_delay(attempt, self.config.retry_max_delay))
                 else:
+                    self._circuit_breaker.record_failure()
                     raise
         
         raise TransferError(f"下载失败，已重试{self.config.transfer_retry_times}次")
@@ -262,7 +767,7 @@ class FileTransferManager:
         Returns:
             Dict[str, List[str]]: 作业名称到下载文件列表的映射
         """
-        self.logger.info(f"开始下载{len(job_results)}个作业的结果文件")
+        self.logger.info("开始下载%s个作业的结果文件", len(job_results))
         
         downloaded_results = {}
         
@@ -274,7 +779,7 @@ class FileTransferManager:
                 result_files = self._find_job_result_files(ssh_client, job_result)
                 
                 if not result_files:
-                    self.logger.warning(f"作业 {job_name} 未找到结果文件")
+                    self.logger.warning("作业 %s 未找到结果文件", job_name)
                     downloaded_results[job_name] = []
                     continue
                 
@@ -288,23 +793,41 @@ class FileTransferManager:
                 )
                 
                 downloaded_results[job_name] = list(downloaded_files.values())
-                self.logger.info(f"作业 {job_name} 下载了 {len(downloaded_files)} 个结果文件")
+                self.logger.info(
+                    "作业 %s 下载了 %s 个结果文件", job_name, len(downloaded_files)
+                )
                 
             except Exception as e:
-                self.logger.error(f"下载作业结果失败 {job_name}: {e}")
+                self.logger.error("下载作业结果失败 %s: %s", job_name, e)
                 downloaded_results[job_name] = []
         
         return downloaded_results
     
     def _find_job_result_files(self, ssh_client, job_result: Dict) -> List[str]:
-        """查找作业结果文件"""
+        """
+        查找作业结果文件
+
+        一次listdir_attr取得工作目录快照，各文件模式在本地匹配。
+        """
         job_name = job_result.get("name", "")
         remote_work_dir = job_result.get("work_dir", self.config.remote_base_path)
         
         result_files = []
         
         try:
-            sftp = ssh_client.open_sftp()
+            sftp = self.open_sftp(ssh_client)
+            try:
+                snapshot = self._remote_dir_snapshot(sftp, remote_work_dir)
+            finally:
+                sftp.close()
+            
+            # 只有普通文件才作为结果文件
+            regular_files = [
+                name for name, attr in snapshot.items()
+                if attr.st_mode is not None and stat.S_ISREG(attr.st_mode)
+            ]
+            regular_set = set(regular_files)
+            base = PurePosixPath(remote_work_dir)
             
             # 根据文件模式查找结果文件
             for pattern in self.config.result_file_patterns:
@@ -312,136 +835,242 @@ class FileTransferManager:
                 if "*" in pattern:
                     pattern = pattern.replace("*", job_name)
                 
-                # 查找匹配的文件
-                try:
-                    file_path = os.path.join(remote_work_dir, pattern).replace('\\', '/')
-                    
-                    # 检查文件是否存在
-                    try:
-                        sftp.stat(file_path)
-                        result_files.append(file_path)
-                    except FileNotFoundError:
-                        # 尝试列出目录并匹配模式
-                        if "*" in pattern or "?" in pattern:
-                            matched_files = self._glob_remote_files(sftp, remote_work_dir, pattern)
-                            result_files.extend(matched_files)
-                
-                except Exception as e:
-                    self.logger.debug(f"查找结果文件模式失败 {pattern}: {e}")
-            
-            sftp.close()
+                # 先按文件名精确查找，其次在目录快照中匹配模式
+                if pattern in snapshot:
+                    if pattern in regular_set:
+                        result_files.append(str(base / pattern))
+                elif "*" in pattern or "?" in pattern:
+                    matcher = _compile_patterns((pattern,)).match
+                    result_files.extend(str(base / name) for name in regular_files if matcher(name))
             
         except Exception as e:
-            self.logger.error(f"查找作业结果文件失败: {e}")
+            self.logger.error("查找作业结果文件失败: %s", e)
         
         return result_files
     
-    def _glob_remote_files(self, sftp, remote_dir: str, pattern: str) -> List[str]:
-        """在远程目录中匹配文件模式"""
-        import fnmatch
-        
-        matched_files = []
+    def _remote_dir_snapshot(self, sftp, remote_dir: str) -> Dict[str, paramiko.SFTPAttributes]:
+        """
+        用一次listdir_attr请求取得远程目录下所有条目及其属性
         
+        Args:
+            sftp: SFTP客户端
+            remote_dir: 远程目录路径
+            
+        Returns:
+            Dict[str, paramiko.SFTPAttributes]: 文件名到属性的映射，
+                目录不存在时为空
+        """
         try:
-            # 列出远程目录内容
-            for item in sftp.listdir(remote_dir):
-                if fnmatch.fnmatch(item, pattern):
-                    full_path = os.path.join(remote_dir, item).replace('\\', '/')
-                    matched_files.append(full_path)
+            return {attr.filename: attr for attr in sftp.listdir_attr(remote_dir)}
+        except IOError as e:
+            self.logger.debug("列出远程目录失败 %s: %s", remote_dir, e)
+            return {}
+    
+    def ensure_remote_directory(self, ssh_client, remote_dir: str) -> None:
+        """确保远程目录存在（已缓存的目录不产生远程调用）"""
+        self.ensure_remote_directories(ssh_client, [remote_dir])
+    
+    def ensure_remote_directories(self, ssh_client, remote_dirs: List[str]) -> None:
+        """
+        通过批量 ``mkdir -p`` 确保多个远程目录存在，已缓存的目录不再创建
         
-        except Exception as e:
-            self.logger.debug(f"远程文件模式匹配失败: {e}")
+        Args:
+            ssh_client: SSH客户端连接
+            remote_dirs: 远程目录路径列表
+            
+        Raises:
+            TransferError: 远程目录创建失败
+        """
+        normalized = {str(PurePosixPath(d)) for d in remote_dirs}
+        missing = sorted(normalized - self._known_remote_dirs)
         
-        return matched_files
+        for start in range(0, len(missing), REMOTE_BATCH_SIZE):
+            chunk = missing[start:start + REMOTE_BATCH_SIZE]
+            cmd = "mkdir -p -- " + " ".join(shlex.quote(d) for d in chunk)
+            exit_status, _, error_msg = run_remote_command(
+                ssh_client, cmd, self.config.transfer_timeout
+            )
+            
+            if exit_status != 0:
+                raise TransferError(f"创建远程目录失败: {error_msg}")
+            
+            for remote_dir in chunk:
+                self.remember_remote_directory(remote_dir)
     
-    def _ensure_remote_directory(self, ssh_client, remote_dir: str) -> None:
-        """确保远程目录存在"""
-        cmd = f"mkdir -p {remote_dir}"
-        stdin, stdout, stderr = ssh_client.exec_command(cmd)
-        exit_status = stdout.channel.recv_exit_status()
+    def _make_remote_executable(self, ssh_client, remote_files: List[str]) -> None:
+        """
+        用一次 ``chmod +x`` 为已上传的Shell脚本设置执行权限
         
-        if exit_status != 0:
-            error_msg = stderr.read().decode()
-            raise TransferError(f"创建远程目录失败: {error_msg}")
+        Args:
+            ssh_client: SSH客户端连接
+            remote_files: 远程脚本路径列表
+        """
+        for start in range(0, len(remote_files), REMOTE_BATCH_SIZE):
+            chunk = remote_files[start:start + REMOTE_BATCH_SIZE]
+            cmd = "chmod +x -- " + " ".join(shlex.quote(f) for f in chunk)
+            exit_status, _, error_msg = run_remote_command(
+                ssh_client, cmd, self.config.transfer_timeout
+            )
+            
+            if exit_status != 0:
+                self.logger.warning("设置脚本执行权限失败: %s", error_msg.strip())
     
-    def _ensure_remote_directory_sftp(self, sftp, remote_dir: str) -> None:
-        """使用SFTP确保远程目录存在"""
+    def _ensure_remote_directory_sftp(self, ssh_client, sftp, remote_dir: str) -> None:
+        """
+        确保远程子目录存在
+        
+        使用一次 ``mkdir -p`` 代替逐级 sftp.stat/sftp.mkdir，并缓存已创建的目录，
+        共享同一前缀的多个文件只需一次往返。
+        
+        Args:
+            ssh_client: SSH客户端连接
+            sftp: SFTP客户端（保留参数以兼容调用方）
+            remote_dir: 远程目录路径
+        """
         # 规范化路径，移除多余的斜杠
-        remote_dir = remote_dir.replace('\\', '/').rstrip('/')
+        remote_dir = str(PurePosixPath(remote_dir))
+        if remote_dir == ".":
+            return
         
-        # 如果是绝对路径，从根目录开始
-        if remote_dir.startswith('/'):
-            dirs = [d for d in remote_dir.split('/') if d]  # 过滤空字符串
-            current_dir = ""
-            
-            for dir_part in dirs:
-                current_dir = f"{current_dir}/{dir_part}"
-                
-                try:
-                    sftp.stat(current_dir)
-                    self.logger.debug(f"目录已存在: {current_dir}")
-                except FileNotFoundError:
-                    try:
-                        sftp.mkdir(current_dir)
-                        self.logger.debug(f"创建目录: {current_dir}")
-                    except Exception as e:
-                        self.logger.error(f"创建目录失败 {current_dir}: {e}")
-                        raise
-        else:
-            # 相对路径处理
-            dirs = remote_dir.split('/')
-            current_dir = ""
+        try:
+            self.ensure_remote_directory(ssh_client, remote_dir)
+            self.logger.debug("确保远程目录存在: %s", remote_dir)
+        except Exception as e:
+            self.logger.error("创建目录失败 %s: %s", remote_dir, e)
+            raise
+    
+    def remote_directory_exists(self, sftp, remote_path: str) -> bool:
+        """
+        检查远程目录是否存在（已缓存的目录直接返回，否则一次SFTP
+        stat请求）
+        
+        Args:
+            sftp: SFTP客户端
+            remote_path: 远程目录路径
             
-            for dir_part in dirs:
-                if not dir_part:
-                    continue
-                
-                current_dir = f"{current_dir}/{dir_part}" if current_dir else dir_part
-                
-                try:
-                    sftp.stat(current_dir)
-                except FileNotFoundError:
-                    sftp.mkdir(current_dir)
+        Returns:
+            bool: 是否为已存在的目录
+        """
+        if str(PurePosixPath(remote_path)) in self._known_remote_dirs:
+            return True
+        
+        try:
+            is_dir = stat.S_ISDIR(sftp.stat(remote_path).st_mode)
+        except IOError:
+            return False
+        
+        if is_dir:
+            self.remember_remote_directory(remote_path)
+        return is_dir
+    
+    def clear_remote_directory_cache(self) -> None:
+        """清空已知远程目录缓存（建立新的服务器连接时调用）"""
+        self._known_remote_dirs.clear()
+    
+    def remember_remote_directory(self, remote_dir: str) -> None:
+        """记录已存在的远程目录及其所有父目录"""
+        path = PurePosixPath(remote_dir)
+        self._known_remote_dirs.add(str(path))
+        self._known_remote_dirs.update(str(parent) for parent in path.parents)
     
-    def _verify_file_integrity(self, sftp, local_file: str, remote_file: str, 
-                             reverse: bool = False) -> bool:
-        """验证文件完整性"""
+    def _verify_file_integrity(self, ssh_client, sftp, local_file: str, remote_file: str,
+                             local_hash: Optional[str] = None) -> bool:
+        """
+        验证文件完整性
+        
+        远程哈希优先在服务器端通过md5sum计算，避免通过SFTP回传整个文件。
+        
+        Args:
+            ssh_client: SSH客户端连接
+            sftp: SFTP客户端（md5sum不可用时回退使用）
+            local_file: 本地文件路径
+            remote_file: 远程文件路径
+            local_hash: 传输过程中已计算的本地哈希，
+                提供时不再重新读取本地文件
+            
+        Returns:
+            bool: 哈希是否一致
+        """
         try:
-            if reverse:
-                # 下载情况：比较本地文件和远程文件
-                local_hash = self._calculate_file_hash(local_file)
-                remote_hash = self._calculate_remote_file_hash(sftp, remote_file)
-            else:
-                # 上传情况：比较本地文件和远程文件
-                local_hash = self._calculate_file_hash(local_file)
+            if local_hash is None:
+                local_hash = local_md5(local_file)
+            
+            remote_hash = remote_md5sums(
+                ssh_client, [remote_file], self.config.transfer_timeout
+            ).get(remote_file)
+            if remote_hash is None:
                 remote_hash = self._calculate_remote_file_hash(sftp, remote_file)
             
             return local_hash == remote_hash
             
         except Exception as e:
-            self.logger.warning(f"文件完整性验证失败: {e}")
+            self.logger.warning("文件完整性验证失败: %s", e)
             return True  # 验证失败时假设文件正确
     
-    def _calculate_file_hash(self, file_path: str) -> str:
-        """计算本地文件的MD5哈希"""
-        hasher = hashlib.md5()
+    def _verify_transfers_batch(self, ssh_client, sftp, file_map: Dict[str, str]) -> List[str]:
+        """
+        批量验证已传输文件的完整性
         
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hasher.update(chunk)
+        远程哈希通过一次 ``md5sum`` 调用获取，本地哈希在线程池中并行计算
+        （hashlib在update时释放GIL）。
         
-        return hasher.hexdigest()
+        Args:
+            ssh_client: SSH客户端连接
+            sftp: SFTP客户端（md5sum不可用时逐个计算远程哈希）
+            file_map: 远程文件路径到本地文件路径的映射
+            
+        Returns:
+            List[str]: 校验不一致的远程文件路径列表
+        """
+        remote_files = list(file_map)
+        local_files = list(file_map.values())
+        
+        try:
+            remote_hashes = remote_md5sums(ssh_client, remote_files, self.config.transfer_timeout)
+            
+            max_workers = min(len(local_files), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                local_hashes = list(executor.map(local_md5, local_files))
+            
+            mismatched = []
+            for remote_file, local_hash in zip(remote_files, local_hashes):
+                remote_hash = remote_hashes.get(remote_file)
+                if remote_hash is None:
+                    remote_hash = self._calculate_remote_file_hash(sftp, remote_file)
+                if remote_hash != local_hash:
+                    mismatched.append(remote_file)
+            
+            return mismatched
+            
+        except Exception as e:
+            self.logger.warning("文件完整性验证失败: %s", e)
+            return []  # 验证失败时假设文件正确
     
     def _calculate_remote_file_hash(self, sftp, remote_file: str) -> str:
         """计算远程文件的MD5哈希"""
         hasher = hashlib.md5()
+        block_size = self.config.sftp_block_size
         
-        with sftp.open(remote_file, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b""):
+        with self._open_remote_for_read(sftp, remote_file) as f:
+            for chunk in iter(lambda: f.read(block_size), b""):
                 hasher.update(chunk)
         
         return hasher.hexdigest()
     
+    def _open_remote_for_read(self, sftp, remote_file: str, file_size: Optional[int] = None):
+        """
+        以预读方式打开远程文件
+
+        所有自定义读取路径都应通过此方法打开。
+        """
+        if file_size is None:
+            file_size = sftp.stat(remote_file).st_size
+        
+        f = sftp.open(remote_file, 'rb')
+        f.MAX_REQUEST_SIZE = self.config.sftp_block_size
+        f.prefetch(file_size, self.config.sftp_max_concurrent_requests)
+        return f
+    
     def cleanup_remote_files(self, ssh_client, file_list: List[str]) -> Dict[str, bool]:
         """
         清理远程文件
@@ -457,31 +1086,78 @@ class FileTransferManager:
             self.logger.info("远程文件清理已禁用")
             return {}
         
-        self.logger.info(f"开始清理{len(file_list)}个远程文件")
+        self.logger.info("开始清理%s个远程文件", len(file_list))
         
         cleanup_results = {}
         
+        if len(file_list) > 1:
+            try:
+                cleanup_results = self._remove_remote_files_batch(ssh_client, file_list)
+            except Exception as e:
+                # 服务器策略禁止exec时回退到SFTP逐个删除
+                self.logger.warning("批量删除远程文件失败，回退到SFTP: %s", e)
+                cleanup_results = {}
+        
+        remaining_files = [f for f in file_list if f not in cleanup_results]
+        
         try:
-            sftp = ssh_client.open_sftp()
+            if remaining_files:
+                self._remove_remote_files_sftp(ssh_client, remaining_files, cleanup_results)
+            
+        except Exception as e:
+            self.logger.error("远程文件清理失败: %s", e)
+        
+        success_count = sum(cleanup_results.values())
+        self.logger.info("远程文件清理完成: %s/%s 成功", success_count, len(file_list))
+        
+        return cleanup_results
+    
+    def _remove_remote_files_batch(self, ssh_client, file_list: List[str]) -> Dict[str, bool]:
+        """
+        通过分块的远程shell命令批量删除文件
+        
+        Args:
+            ssh_client: SSH客户端连接
+            file_list: 要删除的远程文件列表
             
+        Returns:
+            Dict[str, bool]: 文件路径到删除结果的映射
+        """
+        results = {}
+        
+        for start in range(0, len(file_list), REMOTE_BATCH_SIZE):
+            chunk = file_list[start:start + REMOTE_BATCH_SIZE]
+            quoted = " ".join(shlex.quote(f) for f in chunk)
+            # 每删除成功一个文件输出一行路径，用于构建结果映射
+            cmd = f'for f in {quoted}; do rm -- "$f" 2>/dev/null && printf \'%s\\n\' "$f"; done'
+            _, output, _ = run_remote_command(ssh_client, cmd, self.config.transfer_timeout)
+            removed = set(output.splitlines())
+            
+            for remote_file in chunk:
+                results[remote_file] = remote_file in removed
+                if results[remote_file]:
+                    self.logger.debug("删除远程文件: %s", remote_file)
+                else:
+                    self.logger.warning("删除远程文件失败 %s", remote_file)
+        
+        return results
+    
+    def _remove_remote_files_sftp(self, ssh_client, file_list: List[str],
+                                  cleanup_results: Dict[str, bool]) -> None:
+        """使用SFTP逐个删除远程文件，结果写入cleanup_results"""
+        sftp = self.open_sftp(ssh_client)
+        
+        try:
             for remote_file in file_list:
                 try:
                     sftp.remove(remote_file)
                     cleanup_results[remote_file] = True
-                    self.logger.debug(f"删除远程文件: {remote_file}")
+                    self.logger.debug("删除远程文件: %s", remote_file)
                 except Exception as e:
                     cleanup_results[remote_file] = False
-                    self.logger.warning(f"删除远程文件失败 {remote_file}: {e}")
-            
+                    self.logger.warning("删除远程文件失败 %s: %s", remote_file, e)
+        finally:
             sftp.close()
-            
-        except Exception as e:
-            self.logger.error(f"远程文件清理失败: {e}")
-        
-        success_count = sum(cleanup_results.values())
-        self.logger.info(f"远程文件清理完成: {success_count}/{len(file_list)} 成功")
-        
-        return cleanup_results
     
     def get_transfer_statistics(self) -> Dict:
         """获取传输统计信息"""
@@ -506,48 +1182,43 @@ class FileTransferManager:
     
     def _display_file_manifest(self, file_list: List[str]) -> None:
         """显示文件清单信息"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info("📋 文件清单:")
         
         total_size = 0
-        file_types = {}
+        file_types = Counter()
         
         for i, file_path in enumerate(file_list, 1):
             if not os.path.exists(file_path):
-                self.logger.warning(f"  [{i}] ❌ 文件不存在: {os.path.basename(file_path)}")
+                self.logger.warning(
+                    "  [%s] ❌ 文件不存在: %s", i, os.path.basename(file_path)
+                )
                 continue
             
             filename = os.path.basename(file_path)
             file_size = os.path.getsize(file_path)
-            size_mb = round(file_size / (1024 * 1024), 2)
             total_size += file_size
             
             # 确定文件类型
-            if filename.endswith('.def'):
-                file_type = "CFX定义文件"
-            elif filename.endswith('.slurm'):
-                file_type = "SLURM作业脚本"
-            elif filename.endswith('.sh'):
-                file_type = "Shell脚本"
-            elif filename.endswith('.pre'):
-                file_type = "CFX预处理脚本"
-            elif filename.endswith('.ini'):
-                file_type = "CFX初始文件"
-            elif filename.endswith('.res'):
-                file_type = "CFX结果文件"
-            else:
-                file_type = "其他文件"
+            file_type = self._EXT_TO_TYPE.get(os.path.splitext(filename)[1].lower(), "其他文件")
             
             # 统计文件类型
-            file_types[file_type] = file_types.get(file_type, 0) + 1
+            file_types[file_type] += 1
             
             # 显示文件信息
             rel_path = os.path.relpath(file_path, self.config.base_path)
-            self.logger.info(f"  [{i}] 📄 {filename} ({size_mb}MB) - {file_type}")
-            self.logger.info(f"      📁 {rel_path}")
+            self.logger.info(
+                "  [%s] 📄 %s (%s) - %s", i, filename, _format_size_mb(file_size), file_type
+            )
+            self.logger.info("      📁 %s", rel_path)
         
         # 显示汇总信息
-        total_size_mb = round(total_size / (1024 * 1024), 2)
-        self.logger.info(f"📊 汇总: 共{len(file_list)}个文件，总大小 {total_size_mb}MB")
+        self.logger.info(
+            "📊 汇总: 共%s个文件，总大小 %s", len(file_list),
+            _format_size_mb(total_size)
+        )
         
         for file_type, count in file_types.items():
-            self.logger.info(f"    • {file_type}: {count}个")
+            self.logger.info("    • %s: %s个", file_type, count)
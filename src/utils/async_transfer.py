@@ -0,0 +1,97 @@
+"""
+asyncssh传输工具模块
+在一个asyncio事件循环中并发发起多个SFTP上传，
+避免线程池在paramiko通道锁上的竞争
+"""
+
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from .tcp import create_tuned_socket
+
+try:
+    import asyncssh
+except ImportError:  # 可选依赖
+    asyncssh = None
+
+logger = logging.getLogger(__name__)
+
+
+def asyncssh_available() -> bool:
+    """检查是否安装了asyncssh"""
+    return asyncssh is not None
+
+
+def upload_files_async(host: str, port: int, user: str, jobs: List[Tuple[str, str]],
+                       password: Optional[str] = None, ssh_key: str = "",
+                       max_concurrent: int = 4,
+                       tcp_buffer_size: int = 0,
+                       block_size: int = 131072,
+                       max_requests: int = 64) -> Dict[str, Optional[Exception]]:
+    """
+    通过asyncssh并发上传文件
+
+    Args:
+        host: 服务器地址
+        port: SSH端口
+        user: 用户名
+        jobs: (本地文件路径, 远程文件路径) 列表，远程目录需已存在
+            （同一本地文件可上传到多个远程路径）
+        password: SSH密码（可选）
+        ssh_key: 已展开的SSH私钥文件路径（可选）
+        max_concurrent: 同时进行的上传数
+        tcp_buffer_size: 套接字收发缓冲区大小（字节），
+            0表示由内核自动调整
+        block_size: 每个SFTP写请求的大小（字节）
+        max_requests: 每个文件同时未确认的写请求数
+
+    Returns:
+        远程文件路径到上传异常的映射，成功时为None
+    """
+    return asyncio.run(_upload_all(host, port, user, jobs, password, ssh_key,
+                                   max_concurrent, tcp_buffer_size, block_size, max_requests))
+
+
+async def _upload_all(host: str, port: int, user: str, jobs: List[Tuple[str, str]],
+                      password: Optional[str], ssh_key: str, max_concurrent: int,
+                      tcp_buffer_size: int, block_size: int,
+                      max_requests: int) -> Dict[str, Optional[Exception]]:
+    """在同一连接、同一SFTP会话上并发上传所有文件"""
+    connect_kwargs = {
+        "port": port,
+        "username": user,
+        "known_hosts": None,  # 与paramiko连接的AutoAddPolicy保持一致
+    }
+    if ssh_key:
+        connect_kwargs["client_keys"] = [ssh_key]
+    elif password:
+        connect_kwargs["password"] = password
+
+    # 与paramiko连接使用同一个套接字工厂
+    # （关闭Nagle，按配置设置收发缓冲区）
+    sock = create_tuned_socket(host, port, tcp_buffer_size)
+    sock.setblocking(False)
+    connect_kwargs["sock"] = sock
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+    async with asyncssh.connect(host, **connect_kwargs) as conn:
+        async with conn.start_sftp_client() as sftp:
+
+            async def put_one(local_file: str, remote_file: str) -> None:
+                async with semaphore:
+                    await sftp.put(local_file, remote_file,
+                                   block_size=block_size, max_requests=max_requests)
+                    logger.debug("asyncssh上传完成: %s", os.path.basename(local_file))
+
+            results = await asyncio.gather(
+                *(put_one(local, remote) for local, remote in jobs),
+                return_exceptions=True,
+            )
+
+    return {
+        remote: (result if isinstance(result, Exception) else None)
+        for (_, remote), result in zip(jobs, results)
+    }
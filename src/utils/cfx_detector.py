@@ -4,15 +4,75 @@ CFX环境自动检测模块
 """
 
 import os
-import sys
+import queue
+import re
+import shutil
 import logging
-import subprocess
-from pathlib import Path
+import threading
+import time
+from functools import lru_cache
 from typing import Dict, Optional, List, Tuple
 import platform
 
 logger = logging.getLogger(__name__)
 
+# ANSYS安装目录中的版本目录名（如 v231 -> 23.1, v241 -> 24.1）
+_INSTALL_VERSION_RE = re.compile(r"^v(\d{2,3})(\d)$")
+
+# 路径分隔符（同时识别Windows和POSIX风格）
+_PATH_SEP_RE = re.compile(r"[\\/]")
+
+# cfx5pre -help 输出中的版本号：含version/release的行中的第一个 "数字.数字"
+_VERSION_LINE_RE = re.compile(r"^(?=.*(?:version|release)).*?(\d+\.\d+)", re.IGNORECASE | re.MULTILINE)
+
+# CFX可执行文件（逻辑名称及各平台的文件名）
+_EXE_KEYS = ("cfx5pre", "cfx5solve")
+_WIN_EXES = ("cfx5pre.exe", "cfx5solve.exe")
+_NIX_EXES = ("cfx5pre", "cfx5solve")
+
+# 常见ANSYS安装路径
+_COMMON_WIN_PATHS = (
+    r"C:\Program Files\ANSYS Inc",
+    r"C:\ANSYS Inc",
+    r"D:\ANSYS Inc",
+    r"C:\Program Files (x86)\ANSYS Inc",
+)
+_COMMON_LINUX_PATHS = (
+    "/usr/ansys_inc",
+    "/opt/ansys_inc",
+    "/ansys_inc",
+    "/usr/local/ansys_inc",
+    "/home/ansys_inc",
+)
+
+# 扫描常见安装路径的总超时时间 (秒)
+# 超时后放弃仍未响应的路径（如失效的网络挂载）
+_COMMON_PATH_SCAN_TIMEOUT = 10
+
+# ANSYS注册表路径
+_REGISTRY_PATHS = (
+    r"SOFTWARE\ANSYS Inc",
+    r"SOFTWARE\WOW6432Node\ANSYS Inc",
+)
+
+# 可能指向ANSYS/CFX安装目录的环境变量
+_ENV_VARS = ("ANSYS_ROOT", "CFX_HOME", "ANSYSROOT", "ANSYS_INC_ROOT")
+
+# ANSYS安装程序设置的版本目录环境变量（如 AWP_ROOT241 -> .../v241）
+_AWP_ROOT_RE = re.compile(r"^AWP_ROOT(\d+)$")
+
+
+def _empty_cfx_info(method: str = "") -> Dict[str, str]:
+    """创建空的CFX安装信息字典"""
+    return {
+        "cfx_home": "",
+        "cfx_bin_path": "",
+        "cfx_pre_executable": "",
+        "cfx_solver_executable": "",
+        "cfx_version": "",
+        "detection_method": method
+    }
+
 
 class CFXPathDetector:
     """CFX路径检测器"""
@@ -20,6 +80,35 @@ class CFXPathDetector:
     def __init__(self):
         self.system = platform.system()
         self.logger = logging.getLogger(__name__)
+        
+        # 平台相关常量（构造时确定一次）
+        self._is_windows = self.system == "Windows"
+        self._exes = _WIN_EXES if self._is_windows else _NIX_EXES
+        self._exe_targets = dict(zip(self._exes, _EXE_KEYS))
+        
+        # 检测策略顺序（可在运行时调整，如冷启动的Windows机器优先查注册表）
+        if self._is_windows:
+            self.detection_strategies = [
+                self._detect_from_environment,
+                self._detect_from_registry,
+                self._detect_from_common_paths,
+                self._detect_from_path,
+            ]
+        else:
+            self.detection_strategies = [
+                self._detect_from_environment,
+                self._detect_from_common_paths,
+                self._detect_from_path,
+            ]
+        
+        # 检测结果缓存（安装路径在进程生命周期内基本不变）
+        self._cached: Optional[Dict[str, str]] = None
+        self._which_cache: Dict[str, Optional[str]] = {}
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """清除模块级检测结果缓存（如安装或卸载CFX后需要重新检测）"""
+        _detect_cfx_config_once.cache_clear()
     
     def detect_cfx_installation(self) -> Dict[str, str]:
         """
@@ -28,20 +117,17 @@ class CFXPathDetector:
         Returns:
             Dict包含CFX相关路径信息
         """
-        cfx_info = {
-            "cfx_home": "",
-            "cfx_bin_path": "",
-            "cfx_pre_executable": "",
-            "cfx_solver_executable": "",
-            "cfx_version": "",
-            "detection_method": ""
-        }
+        if self._cached is None:
+            self._cached = self._detect_cfx_installation()
+        return dict(self._cached)
+    
+    def _detect_cfx_installation(self) -> Dict[str, str]:
+        """执行一次完整的CFX安装检测"""
+        cfx_info = _empty_cfx_info()
         
         try:
-            if self.system == "Windows":
-                cfx_info = self._detect_windows_cfx()
-            elif self.system == "Linux":
-                cfx_info = self._detect_linux_cfx()
+            if self._is_windows or self.system == "Linux":
+                cfx_info = self._run_detection_strategies()
             else:
                 self.logger.warning(f"Unsupported operating system: {self.system}")
         
@@ -50,128 +136,130 @@ class CFXPathDetector:
         
         return cfx_info
     
-    def _detect_windows_cfx(self) -> Dict[str, str]:
-        """Windows环境CFX检测"""
-        cfx_info = {
-            "cfx_home": "",
-            "cfx_bin_path": "",
-            "cfx_pre_executable": "",
-            "cfx_solver_executable": "",
-            "cfx_version": "",
-            "detection_method": ""
-        }
-        
-        # 方法1: 检查注册表
+    def _run_detection_strategies(self) -> Dict[str, str]:
+        """按顺序执行检测策略，第一个得到有效安装的策略即返回"""
+        for strategy in self.detection_strategies:
+            cfx_info = strategy()
+            if cfx_info and cfx_info["cfx_home"]:
+                return cfx_info
+        
+        return _empty_cfx_info()
+    
+    def _detect_from_environment(self) -> Optional[Dict[str, str]]:
+        """检测策略: 环境变量（开销最小，命中时跳过注册表和目录扫描）"""
+        env_path = self._check_environment_variables()
+        return self._validate_cfx_path(env_path, "Environment Variables") if env_path else None
+    
+    def _detect_from_registry(self) -> Optional[Dict[str, str]]:
+        """检测策略: Windows注册表"""
         try:
             registry_path = self._check_windows_registry()
-            if registry_path:
-                cfx_info.update(self._validate_cfx_path(registry_path, "Windows Registry"))
-                if cfx_info["cfx_home"]:
-                    return cfx_info
         except ImportError:
             self.logger.warning("pywin32 not available, skipping registry detection")
+            return None
         except Exception as e:
             self.logger.debug(f"Registry detection failed: {e}")
+            return None
         
-        # 方法2: 检查环境变量
-        env_path = self._check_environment_variables()
-        if env_path:
-            cfx_info.update(self._validate_cfx_path(env_path, "Environment Variables"))
-            if cfx_info["cfx_home"]:
-                return cfx_info
-        
-        # 方法3: 检查常见安装路径
-        common_paths = [
-            r"C:\Program Files\ANSYS Inc",
-            r"C:\ANSYS Inc",
-            r"D:\ANSYS Inc",
-            r"C:\Program Files (x86)\ANSYS Inc"
-        ]
-        
-        for base_path in common_paths:
-            found_path = self._search_cfx_in_directory(base_path)
-            if found_path:
-                cfx_info.update(self._validate_cfx_path(found_path, "Common Paths"))
-                if cfx_info["cfx_home"]:
-                    return cfx_info
-        
-        # 方法4: 检查PATH环境变量
-        path_cfx = self._check_path_for_cfx()
-        if path_cfx:
-            cfx_info.update(path_cfx)
-            cfx_info["detection_method"] = "PATH Environment"
-        
+        return self._validate_cfx_path(registry_path, "Windows Registry") if registry_path else None
+    
+    def _detect_from_common_paths(self) -> Optional[Dict[str, str]]:
+        """检测策略: 常见安装路径"""
+        return self._scan_common_paths(_COMMON_WIN_PATHS if self._is_windows else _COMMON_LINUX_PATHS)
+    
+    def _detect_from_path(self) -> Optional[Dict[str, str]]:
+        """检测策略: PATH环境变量中的可执行文件"""
+        cfx_info = self._check_path_for_cfx()
+        cfx_info["detection_method"] = "PATH Environment" if self._is_windows else "which command"
         return cfx_info
     
-    def _detect_linux_cfx(self) -> Dict[str, str]:
-        """Linux环境CFX检测"""
-        cfx_info = {
-            "cfx_home": "",
-            "cfx_bin_path": "",
-            "cfx_pre_executable": "",
-            "cfx_solver_executable": "",
-            "cfx_version": "",
-            "detection_method": ""
-        }
-        
-        # 方法1: 检查环境变量
-        env_path = self._check_environment_variables()
-        if env_path:
-            cfx_info.update(self._validate_cfx_path(env_path, "Environment Variables"))
-            if cfx_info["cfx_home"]:
-                return cfx_info
+    def _scan_common_paths(self, common_paths: Tuple[str, ...]) -> Optional[Dict[str, str]]:
+        """
+        并行扫描常见安装路径
         
-        # 方法2: 检查常见安装路径
-        common_paths = [
-            "/usr/ansys_inc",
-            "/opt/ansys_inc",
-            "/ansys_inc",
-            "/usr/local/ansys_inc",
-            "/home/ansys_inc"
-        ]
-        
-        for base_path in common_paths:
-            found_path = self._search_cfx_in_directory(base_path)
-            if found_path:
-                cfx_info.update(self._validate_cfx_path(found_path, "Common Paths"))
-                if cfx_info["cfx_home"]:
-                    return cfx_info
-        
-        # 方法3: 使用which命令查找
-        path_cfx = self._check_path_for_cfx()
-        if path_cfx:
-            cfx_info.update(path_cfx)
-            cfx_info["detection_method"] = "which command"
+        各路径的扫描相互独立且受I/O限制，每个路径在一个
+        守护线程中扫描，总耗时取决于最慢的路径而不是所有路径之和。
+        结果按路径列表的顺序确定：排在前面的路径有有效安装时
+        优先返回，与各线程完成的先后无关。
+        等待总时长不超过 _COMMON_PATH_SCAN_TIMEOUT，超时后
+        只在已完成的路径中按顺序选择；仍未响应的路径
+        （如失效的网络挂载）的扫描线程被直接放弃，
+        守护线程不会阻止进程退出。
         
-        return cfx_info
+        Args:
+            common_paths: 待扫描的基础路径（按优先级排列）
+        
+        Returns:
+            有效的CFX安装信息；未找到时返回None
+        """
+        results: "queue.Queue[Tuple[int, Optional[str]]]" = queue.Queue()
+        
+        def scan(index: int, base_path: str) -> None:
+            try:
+                results.put((index, self._search_cfx_in_directory(base_path)))
+            except Exception as e:
+                self.logger.debug(f"Error scanning {base_path}: {e}")
+                results.put((index, None))
+        
+        for index, base_path in enumerate(common_paths):
+            threading.Thread(
+                target=scan, args=(index, base_path), name="cfx-path-scan", daemon=True
+            ).start()
+        
+        # 路径序号 -> 扫描到的候选目录（只在轮到该路径时验证）
+        found: Dict[int, Optional[str]] = {}
+        deadline = time.monotonic() + _COMMON_PATH_SCAN_TIMEOUT
+        
+        for index, base_path in enumerate(common_paths):
+            while index not in found:
+                try:
+                    done_index, found_path = results.get(
+                        timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except queue.Empty:
+                    self.logger.warning(
+                        f"Scanning common paths timed out, skipping unresponsive: {base_path}"
+                    )
+                    # 在已完成的其余路径中按顺序选择
+                    for later in sorted(i for i in found if i > index):
+                        cfx_info = self._validate_common_path(found[later])
+                        if cfx_info:
+                            return cfx_info
+                    return None
+                found[done_index] = found_path
+            
+            cfx_info = self._validate_common_path(found[index])
+            if cfx_info:
+                return cfx_info
+        
+        return None
+    
+    def _validate_common_path(self, found_path: Optional[str]) -> Optional[Dict[str, str]]:
+        """验证常见路径中扫描到的候选目录，无效时返回None"""
+        if not found_path:
+            return None
+        cfx_info = self._validate_cfx_path(found_path, "Common Paths")
+        return cfx_info if cfx_info["cfx_home"] else None
     
     def _check_windows_registry(self) -> Optional[str]:
         """检查Windows注册表中的CFX安装信息"""
         try:
             import winreg
             
-            # ANSYS注册表路径
-            registry_paths = [
-                r"SOFTWARE\ANSYS Inc",
-                r"SOFTWARE\WOW6432Node\ANSYS Inc"
-            ]
+            # 64位注册表视图，32位Python下也能直接读取64位ANSYS的键
+            access = winreg.KEY_READ | winreg.KEY_WOW64_64KEY
             
-            for reg_path in registry_paths:
+            for reg_path in _REGISTRY_PATHS:
                 try:
-                    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path) as key:
-                        # 枚举所有子键（版本）
-                        i = 0
-                        while True:
-                            try:
-                                version_key = winreg.EnumKey(key, i)
-                                if "CFX" in version_key or version_key.startswith("v"):
-                                    version_path = f"{reg_path}\\{version_key}"
-                                    cfx_path = self._get_cfx_path_from_registry(version_path)
-                                    if cfx_path:
-                                        return cfx_path
-                                i += 1
-                            except WindowsError:
-                                break
+                    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, reg_path, 0, access) as key:
+                        # 先查询子键数量，再倒序枚举子键（版本），新版本优先
+                        num_subkeys, _, _ = winreg.QueryInfoKey(key)
+                        for i in range(num_subkeys - 1, -1, -1):
+                            version_key = winreg.EnumKey(key, i)
+                            if "CFX" in version_key or _INSTALL_VERSION_RE.match(version_key):
+                                cfx_path = self._get_cfx_path_from_registry(key, version_key)
+                                if cfx_path:
+                                    return cfx_path
                 except WindowsError:
                     continue
         
@@ -182,12 +270,22 @@ class CFXPathDetector:
         
         return None
     
-    def _get_cfx_path_from_registry(self, registry_path: str) -> Optional[str]:
-        """从注册表路径获取CFX安装路径"""
+    def _get_cfx_path_from_registry(self, parent_key, subkey_name: str) -> Optional[str]:
+        """
+        从注册表版本子键获取CFX安装路径
+        
+        Args:
+            parent_key: 已打开的父键句柄（相对打开子键，无需再从HKLM解析完整路径）
+            subkey_name: 版本子键名称
+        
+        Returns:
+            安装路径；未找到时返回None
+        """
         try:
             import winreg
             
-            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, registry_path) as key:
+            access = winreg.KEY_READ | winreg.KEY_WOW64_64KEY
+            with winreg.OpenKey(parent_key, subkey_name, 0, access) as key:
                 try:
                     install_path, _ = winreg.QueryValueEx(key, "ANSYSROOT")
                     return install_path
@@ -198,42 +296,61 @@ class CFXPathDetector:
                     except WindowsError:
                         pass
         except Exception as e:
-            self.logger.debug(f"Failed to read registry path {registry_path}: {e}")
+            self.logger.debug(f"Failed to read registry key {subkey_name}: {e}")
         
         return None
     
     def _check_environment_variables(self) -> Optional[str]:
         """检查环境变量中的CFX路径"""
-        env_vars = ["ANSYS_ROOT", "CFX_HOME", "ANSYSROOT", "ANSYS_INC_ROOT"]
-        
-        for var in env_vars:
-            path = os.environ.get(var)
-            if path and os.path.exists(path):
-                self.logger.debug(f"Found CFX path in environment variable {var}: {path}")
-                return path
+        env = os.environ
+        
+        # ANSYS官方的AWP_ROOTxxx变量，按版本号数值从新到旧，直接指向版本目录下的CFX
+        awp_versions = {}
+        for var in env:
+            match = _AWP_ROOT_RE.match(var)
+            if match:
+                awp_versions[var] = int(match.group(1))
+        for var in sorted(awp_versions, key=awp_versions.get, reverse=True):
+            cfx_path = os.path.join(env[var], "CFX")
+            if os.path.isdir(cfx_path):
+                self.logger.debug(f"Found CFX path in environment variable {var}: {cfx_path}")
+                return cfx_path
+        
+        for var in _ENV_VARS:
+            path = env.get(var)
+            if not path:
+                continue
+            try:
+                os.stat(path)
+            except OSError:
+                continue
+            self.logger.debug(f"Found CFX path in environment variable {var}: {path}")
+            return path
         
         return None
     
     def _search_cfx_in_directory(self, base_path: str) -> Optional[str]:
         """在指定目录中搜索CFX安装"""
-        if not os.path.exists(base_path):
-            return None
-        
         try:
-            # 查找CFX相关目录
-            for item in os.listdir(base_path):
-                item_path = os.path.join(base_path, item)
-                if os.path.isdir(item_path):
-                    # 检查是否是版本目录（如v231, v241等）
-                    if item.startswith("v") and len(item) >= 3:
-                        cfx_path = os.path.join(item_path, "CFX")
-                        if os.path.exists(cfx_path):
-                            return cfx_path
+            # 查找CFX相关目录（scandir复用目录项中的类型信息，避免逐项stat）
+            with os.scandir(base_path) as entries:
+                for entry in entries:
+                    name = entry.name
                     
-                    # 直接检查CFX目录
-                    if "CFX" in item.upper():
-                        return item_path
+                    # 检查是否是版本目录（如v231, v241等）；版本目录名不含CFX，无需再做通用匹配
+                    if _INSTALL_VERSION_RE.match(name):
+                        if entry.is_dir():
+                            cfx_path = os.path.join(entry.path, "CFX")
+                            if os.path.isdir(cfx_path):
+                                return cfx_path
+                        continue
+                    
+                    # 直接检查CFX目录（先比较名称，只对候选项判断类型）
+                    if "cfx" in name.lower() and entry.is_dir():
+                        return entry.path
         
+        except FileNotFoundError:
+            return None
         except (OSError, PermissionError) as e:
             self.logger.debug(f"Error searching directory {base_path}: {e}")
         
@@ -241,104 +358,56 @@ class CFXPathDetector:
     
     def _check_path_for_cfx(self) -> Dict[str, str]:
         """检查PATH环境变量中的CFX可执行文件"""
-        cfx_info = {
-            "cfx_home": "",
-            "cfx_bin_path": "",
-            "cfx_pre_executable": "",
-            "cfx_solver_executable": "",
-            "cfx_version": "",
-            "detection_method": ""
-        }
-        
-        # 检查可执行文件
-        executables = ["cfx5pre", "cfx5solve"]
-        if self.system == "Windows":
-            executables = [exe + ".exe" for exe in executables]
+        cfx_info = _empty_cfx_info()
         
+        # 检查可执行文件（按逻辑名称cfx5pre/cfx5solve记录）
         found_executables = {}
-        for exe in executables:
+        for exe, key in self._exe_targets.items():
             path = self._which(exe)
             if path:
-                found_executables[exe] = path
+                found_executables[key] = path
         
         if found_executables:
             # 从可执行文件路径推断CFX_HOME
-            first_exe_path = list(found_executables.values())[0]
+            first_exe_path = next(iter(found_executables.values()))
             bin_dir = os.path.dirname(first_exe_path)
             cfx_home = os.path.dirname(bin_dir)
             
             cfx_info["cfx_home"] = cfx_home
             cfx_info["cfx_bin_path"] = bin_dir
-            cfx_info["cfx_pre_executable"] = found_executables.get(
-                "cfx5pre.exe" if self.system == "Windows" else "cfx5pre", ""
-            )
-            cfx_info["cfx_solver_executable"] = found_executables.get(
-                "cfx5solve.exe" if self.system == "Windows" else "cfx5solve", ""
-            )
+            cfx_info["cfx_pre_executable"] = found_executables.get("cfx5pre", "")
+            cfx_info["cfx_solver_executable"] = found_executables.get("cfx5solve", "")
+            cfx_info["_validated"] = True
         
         return cfx_info
     
     def _which(self, executable: str) -> Optional[str]:
-        """跨平台的which命令实现"""
-        try:
-            if self.system == "Windows":
-                result = subprocess.run(
-                    ["where", executable], 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=10
-                )
-                if result.returncode == 0:
-                    return result.stdout.strip().split('\n')[0]
-            else:
-                result = subprocess.run(
-                    ["which", executable], 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=10
-                )
-                if result.returncode == 0:
-                    return result.stdout.strip()
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError) as e:
-            self.logger.debug(f"Error running which/where for {executable}: {e}")
-        
-        return None
+        """跨平台的which实现（进程内查找PATH，结果按可执行文件名缓存）"""
+        if executable not in self._which_cache:
+            self._which_cache[executable] = shutil.which(executable)
+        return self._which_cache[executable]
     
     def _validate_cfx_path(self, cfx_path: str, method: str) -> Dict[str, str]:
         """验证CFX路径并返回详细信息"""
-        cfx_info = {
-            "cfx_home": "",
-            "cfx_bin_path": "",
-            "cfx_pre_executable": "",
-            "cfx_solver_executable": "",
-            "cfx_version": "",
-            "detection_method": method
-        }
-        
-        if not os.path.exists(cfx_path):
-            return cfx_info
+        cfx_info = _empty_cfx_info(method)
         
-        # 查找bin目录
+        # 查找bin目录并检查可执行文件（一次scandir代替逐个exists）
         bin_path = os.path.join(cfx_path, "bin")
-        if not os.path.exists(bin_path):
+        try:
+            found_executables = self._scan_cfx_executables(bin_path)
+        except (FileNotFoundError, NotADirectoryError):
             # 可能路径就是bin目录
-            if os.path.basename(cfx_path) == "bin":
-                bin_path = cfx_path
-                cfx_path = os.path.dirname(cfx_path)
-            else:
+            if os.path.basename(cfx_path) != "bin":
                 return cfx_info
-        
-        # 检查可执行文件
-        executables = {
-            "cfx5pre": "cfx5pre.exe" if self.system == "Windows" else "cfx5pre",
-            "cfx5solve": "cfx5solve.exe" if self.system == "Windows" else "cfx5solve"
-        }
-        
-        found_executables = {}
-        for key, exe_name in executables.items():
-            exe_path = os.path.join(bin_path, exe_name)
-            if os.path.exists(exe_path):
-                found_executables[key] = exe_path
+            bin_path = cfx_path
+            cfx_path = os.path.dirname(cfx_path)
+            try:
+                found_executables = self._scan_cfx_executables(bin_path)
+            except OSError:
+                return cfx_info
+        except OSError as e:
+            self.logger.debug(f"Error scanning CFX bin directory {bin_path}: {e}")
+            return cfx_info
         
         if found_executables:
             cfx_info["cfx_home"] = cfx_path
@@ -350,17 +419,65 @@ class CFXPathDetector:
             version = self._get_cfx_version(found_executables.get("cfx5pre", ""))
             cfx_info["cfx_version"] = version
             
+            # 路径和可执行文件已在扫描中确认存在，verify_cfx_installation无需重复检查
+            cfx_info["_validated"] = True
+            
             self.logger.info(f"CFX installation found via {method}: {cfx_path}")
         
         return cfx_info
     
-    def _get_cfx_version(self, cfx_pre_path: str) -> str:
-        """获取CFX版本信息"""
-        if not cfx_pre_path or not os.path.exists(cfx_pre_path):
+    def _scan_cfx_executables(self, bin_path: str) -> Dict[str, str]:
+        """
+        扫描bin目录中的CFX可执行文件
+        
+        Args:
+            bin_path: CFX bin目录
+        
+        Returns:
+            可执行文件键名（cfx5pre/cfx5solve）到完整路径的映射
+        
+        Raises:
+            OSError: 目录不存在或无法读取
+        """
+        found = {}
+        with os.scandir(bin_path) as entries:
+            for entry in entries:
+                # Windows文件名不区分大小写
+                name = entry.name.lower() if self._is_windows else entry.name
+                if name in self._exe_targets:
+                    found[self._exe_targets[name]] = entry.path
+        return found
+    
+    def _get_cfx_version(self, cfx_pre_path: str, probe_executable: bool = False) -> str:
+        """
+        获取CFX版本信息
+        
+        优先从安装路径中的版本目录（如 .../v241/CFX/bin/cfx5pre）解析，
+        无需启动CFX-Pre。
+        
+        Args:
+            cfx_pre_path: cfx5pre可执行文件路径
+            probe_executable: 路径中没有版本信息时，是否运行 ``cfx5pre -help`` 获取
+        
+        Returns:
+            版本号字符串，如 "24.1"；无法确定时返回空字符串
+        """
+        if not cfx_pre_path:
             return ""
         
+        for part in reversed(_PATH_SEP_RE.split(cfx_pre_path)):
+            match = _INSTALL_VERSION_RE.match(part)
+            if match:
+                return f"{match.group(1)}.{match.group(2)}"
+        
+        if not probe_executable or not os.path.exists(cfx_pre_path):
+            return ""
+        
+        # 仅在需要运行CFX时导入，普通检测流程不加载subprocess
+        import subprocess
+        
         try:
-            # 尝试运行CFX并获取版本信息
+            # 运行CFX并获取版本信息
             result = subprocess.run(
                 [cfx_pre_path, "-help"],
                 capture_output=True,
@@ -368,15 +485,10 @@ class CFXPathDetector:
                 timeout=10
             )
             
-            # 解析版本信息
-            output = result.stdout + result.stderr
-            for line in output.split('\n'):
-                if 'version' in line.lower() or 'release' in line.lower():
-                    # 提取版本号
-                    import re
-                    version_match = re.search(r'(\d+\.\d+)', line)
-                    if version_match:
-                        return version_match.group(1)
+            # 解析版本信息（整段输出一次匹配，无需逐行拆分）
+            version_match = _VERSION_LINE_RE.search(result.stdout + result.stderr)
+            if version_match:
+                return version_match.group(1)
         
         except (subprocess.TimeoutExpired, subprocess.SubprocessError) as e:
             self.logger.debug(f"Error getting CFX version: {e}")
@@ -384,15 +496,21 @@ class CFXPathDetector:
         return ""
 
 
+@lru_cache(maxsize=1)
+def _detect_cfx_config_once() -> Dict[str, str]:
+    """执行一次CFX检测并缓存结果"""
+    return CFXPathDetector().detect_cfx_installation()
+
+
 def auto_detect_cfx_config() -> Dict[str, str]:
     """
-    自动检测CFX配置的便捷函数
+    自动检测CFX配置的便捷函数（同一进程内只检测一次）
     
     Returns:
         CFX配置字典
     """
-    detector = CFXPathDetector()
-    return detector.detect_cfx_installation()
+    # 返回副本，调用方修改结果不会影响缓存
+    return dict(_detect_cfx_config_once())
 
 
 def verify_cfx_installation(cfx_config: Dict[str, str]) -> Tuple[bool, List[str]]:
@@ -412,13 +530,29 @@ def verify_cfx_installation(cfx_config: Dict[str, str]) -> Tuple[bool, List[str]
         errors.append("CFX home directory not found")
         return False, errors
     
+    # 检测过程中已确认存在的安装无需再次检查
+    if cfx_config.get("_validated"):
+        return True, errors
+    
     if not os.path.exists(cfx_config["cfx_home"]):
         errors.append(f"CFX home directory does not exist: {cfx_config['cfx_home']}")
     
-    # 检查可执行文件
+    # 检查可执行文件（同一目录只列出一次）
+    dir_entries: Dict[str, set] = {}
     for exe_key in ["cfx_pre_executable", "cfx_solver_executable"]:
         exe_path = cfx_config.get(exe_key)
-        if exe_path and not os.path.exists(exe_path):
+        if not exe_path:
+            continue
+        
+        exe_dir, exe_name = os.path.split(exe_path)
+        if exe_dir not in dir_entries:
+            try:
+                with os.scandir(exe_dir or ".") as entries:
+                    dir_entries[exe_dir] = {os.path.normcase(entry.name) for entry in entries}
+            except OSError:
+                dir_entries[exe_dir] = set()
+        
+        if os.path.normcase(exe_name) not in dir_entries[exe_dir]:
             errors.append(f"{exe_key} not found: {exe_path}")
     
     # 如果没有找到任何可执行文件
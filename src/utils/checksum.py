@@ -0,0 +1,62 @@
+"""
+文件校验工具模块
+本地文件MD5计算；服务器端按批次调用md5sum
+（每条命令的路径数受REMOTE_BATCH_SIZE限制）
+"""
+
+import hashlib
+import shlex
+from typing import Dict, List, Optional
+
+from .remote_exec import REMOTE_BATCH_SIZE, run_remote_command
+
+# 计算本地文件MD5时的读取块大小 (字节)
+_HASH_BLOCK_SIZE = 8192
+
+
+def local_md5(file_path: str) -> str:
+    """
+    计算本地文件的MD5哈希
+
+    Args:
+        file_path: 本地文件路径
+
+    Returns:
+        str: 十六进制MD5
+    """
+    hasher = hashlib.md5()
+
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+def remote_md5sums(ssh_client, remote_files: List[str],
+                   timeout: Optional[float] = None) -> Dict[str, str]:
+    """
+    在服务器端批量计算远程文件的MD5哈希
+
+    Args:
+        ssh_client: SSH客户端连接
+        remote_files: 远程文件路径列表
+        timeout: 每条命令的超时时间（秒）
+
+    Returns:
+        Dict[str, str]: 远程文件路径到MD5的映射；
+            计算失败或文件名被md5sum转义的文件不出现在结果中
+    """
+    remote_hashes = {}
+    for start in range(0, len(remote_files), REMOTE_BATCH_SIZE):
+        chunk = remote_files[start:start + REMOTE_BATCH_SIZE]
+        cmd = "md5sum -- " + " ".join(shlex.quote(f) for f in chunk)
+        _, output, _ = run_remote_command(ssh_client, cmd, timeout)
+
+        for line in output.splitlines():
+            # 转义输出（以反斜杠开头）的文件名交由调用方回退处理
+            parts = line.split(None, 1)
+            if len(parts) == 2 and not parts[0].startswith("\\"):
+                remote_hashes[parts[1]] = parts[0]
+
+    return remote_hashes
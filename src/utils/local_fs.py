@@ -0,0 +1,76 @@
+"""
+本地文件系统工具模块
+记住已创建的报告目录，同一目录重复创建时不再产生stat/mkdir系统调用；
+基于scandir递归列出文件及其大小；
+一次stat同时判断文件是否存在并取得大小
+"""
+
+import os
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+
+
+@lru_cache(maxsize=1024)
+def _make_directory(abs_path: str) -> None:
+    """创建目录（成功后按绝对路径缓存，失败时不缓存）"""
+    os.makedirs(abs_path, exist_ok=True)
+
+
+def ensure_local_directory(path: str) -> str:
+    """
+    确保本地目录存在（按绝对路径缓存，
+    只用于运行期间不会被删除的报告目录；
+    下载、脚本等目录可能在运行期间被删除，应直接调用os.makedirs）
+
+    Args:
+        path: 目录路径（空字符串表示当前目录）
+
+    Returns:
+        str: 传入的目录路径
+    """
+    _make_directory(os.path.abspath(path))
+    return path
+
+
+def local_file_size(path: str) -> Optional[int]:
+    """
+    用一次stat取得本地文件大小，代替os.path.exists加os.path.getsize两次系统调用
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        Optional[int]: 文件大小（字节），路径不存在或无法访问时返回None
+    """
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+def iter_files_with_size(root: str) -> Iterator[Tuple[str, int]]:
+    """
+    递归列出目录下的所有普通文件及其大小（不跟随符号链接目录）
+
+    与os.walk一样忽略不存在或无法读取的目录。
+
+    Args:
+        root: 根目录
+
+    Yields:
+        (文件路径, 文件大小) 元组
+    """
+    try:
+        entries = os.scandir(root)
+    except OSError:
+        return
+
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from iter_files_with_size(entry.path)
+                elif entry.is_file():
+                    yield entry.path, entry.stat().st_size
+            except OSError:
+                continue
@@ -0,0 +1,194 @@
+"""
+远程命令执行工具模块
+边执行边读取stdout/stderr，
+避免输出填满通道窗口后与recv_exit_status互相等待；
+需要反复执行短命令时可在一个长期打开的远程shell通道中依次执行，
+省去每条命令的通道开关
+"""
+
+import logging
+import re
+import select
+import shlex
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 单次从通道读取的最大字节数
+_RECV_CHUNK_SIZE = 65536
+
+# 等待通道可读的轮询间隔 (秒)
+_POLL_INTERVAL = 1.0
+
+# 单条远程命令携带的最大路径数（远低于ARG_MAX）
+REMOTE_BATCH_SIZE = 500
+
+
+def run_remote_command(ssh_client, command: str,
+                       timeout: Optional[float] = None) -> Tuple[int, str, str]:
+    """
+    执行远程命令并增量读取输出
+
+    Args:
+        ssh_client: SSH客户端连接
+        command: 要执行的命令
+        timeout: 总超时时间（秒），None表示不限制
+
+    Returns:
+        (退出状态码, 标准输出, 标准错误)
+
+    Raises:
+        TimeoutError: 命令在超时时间内未结束
+    """
+    stdin, stdout, stderr = ssh_client.exec_command(command)
+    channel = stdout.channel
+    deadline = time.monotonic() + timeout if timeout else None
+
+    out_buf = bytearray()
+    err_buf = bytearray()
+
+    while True:
+        if channel.recv_ready():
+            out_buf += channel.recv(_RECV_CHUNK_SIZE)
+            continue
+        if channel.recv_stderr_ready():
+            err_buf += channel.recv_stderr(_RECV_CHUNK_SIZE)
+            continue
+        if channel.exit_status_ready():
+            break
+
+        if deadline is not None and time.monotonic() > deadline:
+            channel.close()
+            raise TimeoutError(f"远程命令执行超时 ({timeout}秒): {command}")
+
+        select.select([channel], [], [], _POLL_INTERVAL)
+
+    # 退出状态到达后读取剩余的缓冲数据
+    out_buf += stdout.read()
+    err_buf += stderr.read()
+
+    return (
+        channel.recv_exit_status(),
+        out_buf.decode(errors="replace"),
+        err_buf.decode(errors="replace"),
+    )
+
+
+def remote_paths_exist(ssh_client, paths: List[str], test_flag: str = "-e",
+                       timeout: Optional[float] = None) -> Dict[str, bool]:
+    """
+    在一次远程调用中批量检查多个路径
+
+    Args:
+        ssh_client: SSH客户端连接
+        paths: 远程路径列表
+        test_flag: test命令的检查选项，如 -e（存在）、
+            -f（普通文件）、-x（可执行）
+        timeout: 总超时时间（秒），None表示不限制
+
+    Returns:
+        路径到检查结果的映射
+    """
+    if not paths:
+        return {}
+
+    quoted = " ".join(shlex.quote(p) for p in paths)
+    cmd = f'for p in {quoted}; do test {test_flag} "$p" && echo 1 || echo 0; done'
+    _, output, _ = run_remote_command(ssh_client, cmd, timeout)
+
+    flags = output.split()
+    return {p: i < len(flags) and flags[i] == "1" for i, p in enumerate(paths)}
+
+
+class RemoteShell:
+    """
+    在一个长期打开的远程 ``sh`` 通道中依次执行命令
+
+    每条命令之后在stdout和stderr中各写入一个带随机标记的结束行，
+    读到两个结束行即表示命令完成，
+    stdout的结束行同时带回命令的退出状态。通道出错或超时后会被关闭，
+    下一条命令自动重新打开。
+    命令的标准输入重定向到/dev/null，不会读走后续命令。不是线程安全的。
+    """
+
+    def __init__(self, ssh_client):
+        self._ssh_client = ssh_client
+        self._channel = None
+        marker = f"__CFX_CMD_END_{uuid.uuid4().hex}__"
+        self._marker = marker.encode()
+        self._out_end = re.compile(rb"\n" + re.escape(self._marker) + rb" (\d+)\n")
+        self._err_end = b"\n" + self._marker + b"\n"
+
+    def run(self, command: str, timeout: Optional[float] = None) -> Tuple[int, str, str]:
+        """
+        执行一条命令
+
+        Args:
+            command: 要执行的命令
+            timeout: 总超时时间（秒），None表示不限制
+
+        Returns:
+            (退出状态码, 标准输出, 标准错误)
+
+        Raises:
+            TimeoutError: 命令在超时时间内未结束
+            ConnectionError: 远程shell通道已关闭
+        """
+        channel = self._ensure_channel()
+        marker = self._marker.decode()
+        channel.sendall(
+            f"{{ {command}\n}} </dev/null\n"
+            f"printf '\\n{marker} %d\\n' \"$?\"\n"
+            f"printf '\\n{marker}\\n' >&2\n".encode()
+        )
+
+        deadline = time.monotonic() + timeout if timeout else None
+        out_buf = bytearray()
+        err_buf = bytearray()
+        out_end = None
+        err_end = -1
+
+        try:
+            while out_end is None or err_end < 0:
+                if channel.recv_ready():
+                    out_buf += channel.recv(_RECV_CHUNK_SIZE)
+                    out_end = self._out_end.search(out_buf)
+                    continue
+                if channel.recv_stderr_ready():
+                    err_buf += channel.recv_stderr(_RECV_CHUNK_SIZE)
+                    err_end = err_buf.find(self._err_end)
+                    continue
+                if channel.exit_status_ready() or channel.closed:
+                    raise ConnectionError("远程shell通道已关闭")
+
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"远程命令执行超时 ({timeout}秒): {command}")
+
+                select.select([channel], [], [], _POLL_INTERVAL)
+        except Exception:
+            self.close()
+            raise
+
+        return (
+            int(out_end.group(1)),
+            out_buf[:out_end.start()].decode(errors="replace"),
+            err_buf[:err_end].decode(errors="replace"),
+        )
+
+    def close(self) -> None:
+        """关闭远程shell通道"""
+        if self._channel is not None:
+            try:
+                self._channel.close()
+            except Exception as e:
+                logger.debug("关闭远程shell通道失败: %s", e)
+            self._channel = None
+
+    def _ensure_channel(self):
+        """打开（或复用）远程shell通道"""
+        if self._channel is None:
+            _, stdout, _ = self._ssh_client.exec_command("sh")
+            self._channel = stdout.channel
+        return self._channel
@@ -0,0 +1,39 @@
+"""
+报告写入工具模块
+安装了orjson时用其序列化JSON报告（C实现，一次生成完整字节串），
+否则使用标准库json
+"""
+
+import json
+import logging
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def write_json_report(report_file: str, report: Any) -> None:
+    """
+    将报告以缩进2格、保留非ASCII字符的JSON格式写入文件
+
+    Args:
+        report_file: 报告文件路径
+        report: 报告数据
+    """
+    if orjson is not None:
+        try:
+            data = orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError as e:
+            # orjson不支持的类型（如超出64位的整数）回退到标准库
+            logger.debug("orjson序列化失败，使用json: %s", e)
+        else:
+            with open(report_file, 'wb') as f:
+                f.write(data)
+            return
+
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,49 @@
+"""
+重试与熔断工具模块
+计算带随机抖动的指数退避等待时间；按连续失败次数快速失败的熔断器
+"""
+
+import random
+
+
+def retry_delay(attempt: int, max_delay: float) -> float:
+    """
+    计算带随机抖动且有上限的指数退避等待时间
+
+    Args:
+        attempt: 已失败的次数（从0开始）
+        max_delay: 最大等待时间（秒）
+
+    Returns:
+        float: 等待时间（秒）
+    """
+    return min(max_delay, (2 ** attempt) * random.uniform(0.5, 1.5))
+
+
+class CircuitBreaker:
+    """
+    连续失败计数熔断器
+
+    连续失败次数超过阈值后打开，任意一次成功或调用reset后关闭。
+    """
+
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.failures = 0
+
+    @property
+    def is_open(self) -> bool:
+        """连续失败次数是否已超过阈值"""
+        return self.failures > self.threshold
+
+    def record_success(self) -> None:
+        """记录一次成功（清零连续失败次数）"""
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """记录一次失败"""
+        self.failures += 1
+
+    def reset(self) -> None:
+        """重置熔断器"""
+        self.failures = 0
@@ -0,0 +1,79 @@
+"""
+rsync工具模块
+通过rsync-over-SSH增量上传文件，复用OpenSSH ControlMaster连接
+"""
+
+import logging
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# OpenSSH复用连接的控制套接字路径（%r=用户, %h=主机, %p=端口）
+_CONTROL_PATH = os.path.join(tempfile.gettempdir(), "cfx-ssh-%r@%h-%p")
+
+# 控制连接在最后一次使用后保持的时间 (秒)
+_CONTROL_PERSIST = 600
+
+
+def rsync_available() -> bool:
+    """检查本机是否可以使用rsync和ssh命令"""
+    return shutil.which("rsync") is not None and shutil.which("ssh") is not None
+
+
+def build_ssh_command(port: int, ssh_key: str = "") -> List[str]:
+    """
+    构建供rsync使用的ssh命令（启用ControlMaster连接复用）
+
+    Args:
+        port: SSH端口
+        ssh_key: 已展开的SSH私钥文件路径（可选）
+
+    Returns:
+        ssh命令参数列表
+    """
+    cmd = [
+        "ssh", "-p", str(port),
+        "-o", "BatchMode=yes",
+        "-o", "ControlMaster=auto",
+        "-o", f"ControlPath={_CONTROL_PATH}",
+        "-o", f"ControlPersist={_CONTROL_PERSIST}",
+    ]
+    if ssh_key:
+        cmd.extend(["-i", ssh_key])
+    return cmd
+
+
+def run_rsync(files: List[str], local_dir: str, remote_target: str, ssh_command: List[str],
+              compress: bool = False,
+              io_timeout: Optional[int] = None) -> subprocess.CompletedProcess:
+    """
+    通过一次rsync（--files-from）把local_dir下的指定文件上传到远程目录
+
+    Args:
+        files: 要上传的文件（相对local_dir的POSIX路径）
+        local_dir: 本地根目录
+        remote_target: 远程目标，格式为 ``user@host:/path``
+        ssh_command: 远程shell命令（见build_ssh_command）
+        compress: 是否启用rsync压缩
+        io_timeout: I/O空闲超时时间（秒）
+
+    Returns:
+        rsync进程执行结果
+    """
+    cmd = ["rsync", "-a", "--partial", "--files-from=-"]
+    if compress:
+        cmd.append("-z")
+    if io_timeout:
+        cmd.append(f"--timeout={io_timeout}")
+
+    # 末尾斜杠表示以目录内容为根，files中的相对路径原样保留
+    cmd.extend(["-e", shlex.join(ssh_command), local_dir.rstrip("/\\") + "/", remote_target])
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("执行rsync: %s", shlex.join(cmd))
+    return subprocess.run(cmd, input="\n".join(files) + "\n", capture_output=True, text=True)
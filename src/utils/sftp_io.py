@@ -0,0 +1,91 @@
+"""
+SFTP读写工具模块
+以可配置的请求块大小流水线写入远程文件，
+供传输管理器和CFX管理器共用；
+探测远程目录是否与本机共享同一文件系统
+"""
+
+import logging
+import os
+import posixpath
+import secrets
+
+import paramiko
+
+logger = logging.getLogger(__name__)
+
+
+def open_pipelined(sftp: paramiko.SFTPClient, remote_file: str,
+                   block_size: int) -> paramiko.SFTPFile:
+    """
+    以流水线写入方式打开远程文件
+
+    写请求按block_size拆分并连续发送，不逐块等待服务器确认
+    （关闭文件时统一检查写入结果）。
+
+    Args:
+        sftp: SFTP客户端
+        remote_file: 远程文件路径
+        block_size: 每个写请求的最大字节数
+
+    Returns:
+        paramiko.SFTPFile: 已打开的远程文件
+    """
+    remote_f = sftp.open(remote_file, 'wb')
+    remote_f.MAX_REQUEST_SIZE = block_size
+    remote_f.set_pipelined(True)
+    return remote_f
+
+
+def put_local_file(sftp: paramiko.SFTPClient, local_file: str, remote_file: str,
+                   block_size: int) -> None:
+    """
+    按block_size读取本地文件并流水线写入远程文件
+    （paramiko的put固定按32KB读取）
+
+    Args:
+        sftp: SFTP客户端
+        local_file: 本地文件路径
+        remote_file: 远程文件路径
+        block_size: 本地读取块和写请求的大小
+    """
+    with open(local_file, 'rb') as local_f, \
+            open_pipelined(sftp, remote_file, block_size) as remote_f:
+        for chunk in iter(lambda: local_f.read(block_size), b""):
+            remote_f.write(chunk)
+
+
+def shares_local_filesystem(sftp: paramiko.SFTPClient, remote_dir: str) -> bool:
+    """
+    判断远程目录是否与本机共享同一文件系统和用户
+
+    回环地址不代表共享文件系统（例如经 ``ssh -L`` 转发到集群），
+    因此通过SFTP写入随机令牌文件，
+    本机同一路径能读到相同内容且文件属于当前用户时才认为共享。
+
+    Args:
+        sftp: SFTP客户端
+        remote_dir: 远程目录（需已存在）
+
+    Returns:
+        bool: 是否共享；探测失败或本机不支持用户ID时为False
+    """
+    if not hasattr(os, "getuid"):
+        return False
+
+    token = secrets.token_hex(16)
+    probe_path = posixpath.join(remote_dir, f".cfx_fs_probe_{token}")
+    try:
+        with sftp.open(probe_path, 'wb') as remote_f:
+            remote_f.write(token.encode())
+        try:
+            with open(probe_path, 'rb') as local_f:
+                return (local_f.read() == token.encode()
+                        and os.fstat(local_f.fileno()).st_uid == os.getuid())
+        except OSError:
+            return False
+        finally:
+            sftp.remove(probe_path)
+    except Exception as e:
+        logger.debug("共享文件系统探测失败 %s: %s", remote_dir, e)
+        return False
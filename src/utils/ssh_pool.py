@@ -0,0 +1,94 @@
+"""
+SSH连接池模块
+按 (主机, 端口, 用户, 槽位) 复用已认证的SSH连接，
+避免每个步骤重复握手和认证
+槽位0为主连接，其余槽位为并行上传使用的附加连接
+"""
+
+import atexit
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+import paramiko
+
+logger = logging.getLogger(__name__)
+
+# (host, port, user, slot) -> 已连接的SSH客户端
+_POOL: Dict[Tuple[str, int, str, int], paramiko.SSHClient] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def get_pooled_client(host: str, port: int, user: str,
+                      slot: int = 0) -> Optional[paramiko.SSHClient]:
+    """
+    获取连接池中仍然活跃的SSH客户端
+
+    Args:
+        host: 服务器地址
+        port: SSH端口
+        user: 用户名
+        slot: 连接槽位（0为主连接）
+
+    Returns:
+        活跃的SSH客户端；不存在或连接已断开时返回None
+    """
+    key = (host, port, user, slot)
+
+    with _POOL_LOCK:
+        client = _POOL.get(key)
+        if client is None:
+            return None
+
+        transport = client.get_transport()
+        if transport is not None and transport.is_active():
+            return client
+
+        # 连接已断开，从连接池移除
+        del _POOL[key]
+
+    logger.debug("SSH连接已失效，移出连接池: %s@%s:%s [%s]", user, host, port, slot)
+    _close_quietly(client)
+    return None
+
+
+def register_client(host: str, port: int, user: str, client: paramiko.SSHClient,
+                    slot: int = 0) -> None:
+    """
+    将已连接的SSH客户端加入连接池
+
+    Args:
+        host: 服务器地址
+        port: SSH端口
+        user: 用户名
+        client: 已连接的SSH客户端
+        slot: 连接槽位（0为主连接）
+    """
+    key = (host, port, user, slot)
+    with _POOL_LOCK:
+        previous = _POOL.get(key)
+        _POOL[key] = client
+
+    if previous is not None and previous is not client:
+        _close_quietly(previous)
+
+
+def close_all_clients() -> None:
+    """关闭并清空连接池中的所有SSH连接（进程退出时自动调用）"""
+    with _POOL_LOCK:
+        clients = list(_POOL.values())
+        _POOL.clear()
+
+    for client in clients:
+        _close_quietly(client)
+
+
+def _close_quietly(client: paramiko.SSHClient) -> None:
+    """关闭SSH客户端并忽略错误"""
+    try:
+        client.close()
+    except Exception as e:
+        logger.debug("关闭SSH连接时出错: %s", e)
+
+
+atexit.register(close_all_clients)
@@ -0,0 +1,48 @@
+"""
+TCP套接字工具模块
+创建关闭Nagle算法（可选指定收发缓冲区）的连接，供paramiko和asyncssh共用
+"""
+
+import socket
+
+# 建立TCP连接的超时时间 (秒)
+_CONNECT_TIMEOUT = 30
+
+
+def create_tuned_socket(host: str, port: int, buffer_size: int = 0) -> socket.socket:
+    """
+    创建调优后的TCP连接
+
+    套接字选项在connect之前设置：收发缓冲区大小决定握手时通告的
+    窗口缩放因子，连接建立后再设置已无法扩大窗口。
+    显式设置SO_RCVBUF会关闭Linux的接收缓冲区自动调整，
+    并受 net.core.rmem_max 限制，因此默认不设置，交给内核自动调整。
+
+    Args:
+        host: 服务器地址
+        port: 端口
+        buffer_size: SO_SNDBUF/SO_RCVBUF大小（字节），0表示使用内核自动调整
+
+    Returns:
+        已连接的套接字
+
+    Raises:
+        OSError: 所有解析出的地址都无法连接
+    """
+    error = None
+    for family, sock_type, proto, _, address in socket.getaddrinfo(
+            host, port, 0, socket.SOCK_STREAM):
+        sock = socket.socket(family, sock_type, proto)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if buffer_size > 0:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, buffer_size)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, buffer_size)
+            sock.settimeout(_CONNECT_TIMEOUT)
+            sock.connect(address)
+            return sock
+        except OSError as e:
+            error = e
+            sock.close()
+
+    raise error or OSError(f"无法解析服务器地址: {host}")
@@ -0,0 +1,280 @@
+"""
+批量上传后端模块
+asyncssh并发上传、rsync --files-from上传和tar流上传，一次处理多个普通文件；
+需要转换行结尾的脚本文件和后端未能上传的文件由调用方改用SFTP逐个上传
+"""
+
+import logging
+import os
+import shlex
+import tarfile
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .async_transfer import asyncssh_available, upload_files_async
+from .rsync import build_ssh_command, rsync_available, run_rsync
+
+logger = logging.getLogger(__name__)
+
+# 上传时需要转换行结尾符的脚本文件后缀（批量后端不处理）
+SCRIPT_SUFFIXES = ('.sh', '.slurm')
+
+# 本地文件路径 -> 远程文件路径
+RemotePathFn = Callable[[str], PurePosixPath]
+
+
+class UploadBackendError(Exception):
+    """批量上传后端错误"""
+    pass
+
+
+class UploadBackends:
+    """批量上传后端"""
+
+    def __init__(self, config, ssh_key_file: str, ssh_key_exists: bool):
+        """
+        Args:
+            config: CFX自动化配置
+            ssh_key_file: 已展开的SSH私钥路径
+            ssh_key_exists: 私钥文件是否存在
+        """
+        self.config = config
+        self._ssh_key_file = ssh_key_file
+        self._ssh_key_exists = ssh_key_exists
+
+    def upload(self, ssh_client, file_list: List[str], remote_dir: str,
+               preserve_structure: bool, remote_path: RemotePathFn) -> Dict[str, str]:
+        """
+        按配置选择一个批量后端上传普通文件
+
+        Args:
+            ssh_client: SSH客户端连接
+            file_list: 本地文件路径列表
+            remote_dir: 远程目录（需已创建）
+            preserve_structure: 是否保持目录结构
+            remote_path: 计算本地文件对应远程路径的函数
+
+        Returns:
+            Dict[str, str]: 已上传的本地文件路径到远程文件路径的映射；
+                未启用任何后端或后端失败时为空
+        """
+        if self.can_use_asyncssh():
+            return self.upload_asyncssh(file_list, remote_path)
+        if preserve_structure and self.can_use_rsync():
+            return self.upload_rsync(file_list, remote_dir)
+        if self.can_use_tar_stream(file_list):
+            return self.upload_tar_stream(ssh_client, file_list, remote_dir, remote_path)
+        return {}
+
+    def can_use_asyncssh(self) -> bool:
+        """判断是否使用asyncssh后端上传"""
+        if not self.config.use_asyncssh:
+            return False
+        if not asyncssh_available():
+            logger.debug("未安装asyncssh，使用paramiko SFTP上传")
+            return False
+        return True
+
+    def can_use_rsync(self) -> bool:
+        """判断是否可以使用rsync上传（rsync无法非交互地使用密码认证）"""
+        if not self.config.use_rsync:
+            return False
+        if not self._ssh_key_exists:
+            logger.debug(
+                "未配置SSH密钥或密钥文件不存在，rsync不可用，使用SFTP上传"
+            )
+            return False
+        if not rsync_available():
+            logger.debug("本机未找到rsync/ssh，使用SFTP上传")
+            return False
+        return True
+
+    def can_use_tar_stream(self, file_list: List[str]) -> bool:
+        """
+        判断是否使用tar流上传
+
+        显式启用、文件数达到自动启用阈值，
+        或多个小文件总大小低于阈值时使用。
+        """
+        total = len(file_list)
+        if total < 2:
+            return False
+        if self.config.use_tar_stream:
+            return True
+        threshold = self.config.tar_stream_min_files
+        if 0 < threshold <= total:
+            return True
+        small_total_mb = self.config.tar_stream_small_total_mb
+        if small_total_mb <= 0:
+            return False
+        limit = small_total_mb * 1024 * 1024
+        total_size = 0
+        for f in file_list:
+            try:
+                total_size += os.path.getsize(f)
+            except OSError:
+                return False
+            if total_size >= limit:
+                return False
+        return True
+
+    def upload_asyncssh(self, file_list: List[str], remote_path: RemotePathFn) -> Dict[str, str]:
+        """
+        通过asyncssh在一个事件循环中并发上传普通文件
+
+        Args:
+            file_list: 本地文件路径列表
+            remote_path: 计算本地文件对应远程路径的函数（所在目录需已创建）
+
+        Returns:
+            Dict[str, str]: 上传成功的本地文件路径到远程文件路径的映射
+        """
+        jobs = [(f, str(remote_path(f))) for f in file_list if not f.endswith(SCRIPT_SUFFIXES)]
+        if not jobs:
+            return {}
+
+        errors = self._run_asyncssh(jobs)
+        if errors is None:
+            return {}
+
+        done = {}
+        for local_file, remote_file in jobs:
+            if errors.get(remote_file) is None:
+                done[local_file] = remote_file
+            else:
+                logger.debug(
+                    "asyncssh上传失败 %s: %s", os.path.basename(local_file), errors[remote_file]
+                )
+
+        logger.info("asyncssh上传进度: [%s/%s]", len(done), len(file_list))
+        return done
+
+    def upload_copies_asyncssh(self, local_file: str,
+                               remote_files: List[str]) -> Optional[List[str]]:
+        """
+        通过asyncssh在一个连接上把同一个本地文件并发上传到多个远程路径
+
+        Args:
+            local_file: 本地文件路径
+            remote_files: 远程文件路径列表（所在目录需已创建）
+
+        Returns:
+            Optional[List[str]]: 上传成功的远程文件路径；
+                未启用asyncssh或连接失败时返回None
+        """
+        if not remote_files or not self.can_use_asyncssh():
+            return None
+
+        errors = self._run_asyncssh([(local_file, remote) for remote in remote_files])
+        if errors is None:
+            return None
+        return [remote for remote in remote_files if errors.get(remote) is None]
+
+    def _run_asyncssh(self, jobs: List[Tuple[str, str]]
+                      ) -> Optional[Dict[str, Optional[Exception]]]:
+        """执行asyncssh上传，连接失败时返回None"""
+        try:
+            return upload_files_async(
+                self.config.ssh_host, self.config.ssh_port, self.config.ssh_user, jobs,
+                password=self.config.ssh_password,
+                ssh_key=self._ssh_key_file if self._ssh_key_exists else "",
+                max_concurrent=self.config.max_parallel_transfers,
+                tcp_buffer_size=self.config.tcp_buffer_size,
+                block_size=self.config.sftp_block_size,
+                max_requests=self.config.sftp_max_concurrent_requests
+            )
+        except Exception as e:
+            logger.warning("asyncssh上传失败，回退到paramiko SFTP: %s", e)
+            return None
+
+    def upload_rsync(self, file_list: List[str], remote_dir: str) -> Dict[str, str]:
+        """
+        通过一次rsync（--files-from）上传base_path下的普通文件，
+        远程已有的相同文件不再传输
+
+        Args:
+            file_list: 本地文件路径列表
+            remote_dir: 远程目录（需已创建）
+
+        Returns:
+            Dict[str, str]: 上传成功的本地文件路径到远程文件路径的映射；
+                rsync失败时为空
+        """
+        jobs = []
+        for f in file_list:
+            if f.endswith(SCRIPT_SUFFIXES):
+                continue
+            rel_path = Path(os.path.relpath(f, self.config.base_path))
+            if ".." not in rel_path.parts:
+                jobs.append((f, rel_path.as_posix()))
+        if not jobs:
+            return {}
+
+        ssh_command = build_ssh_command(self.config.ssh_port, self._ssh_key_file)
+        remote_target = f"{self.config.ssh_user}@{self.config.ssh_host}:{remote_dir.rstrip('/')}/"
+        try:
+            result = run_rsync(
+                [rel for _, rel in jobs], self.config.base_path, remote_target, ssh_command,
+                compress=self.config.ssh_compression, io_timeout=self.config.transfer_timeout
+            )
+        except OSError as e:
+            logger.warning("rsync上传失败，回退到逐文件SFTP: %s", e)
+            return {}
+
+        if result.returncode != 0:
+            logger.warning(
+                "rsync上传失败 (%s)，回退到逐文件SFTP: %s",
+                result.returncode, result.stderr.strip()
+            )
+            return {}
+
+        logger.info("rsync上传进度: [%s/%s]", len(jobs), len(file_list))
+        return {local: str(PurePosixPath(remote_dir, rel)) for local, rel in jobs}
+
+    def upload_tar_stream(self, ssh_client, file_list: List[str], remote_dir: str,
+                          remote_path: RemotePathFn) -> Dict[str, str]:
+        """
+        将普通文件打包为一个tar流写入远程 ``tar -xf -``，
+        N个文件只需一次往返
+
+        Args:
+            ssh_client: SSH客户端连接
+            file_list: 本地文件路径列表
+            remote_dir: 远程目录（需已创建）
+            remote_path: 计算本地文件对应远程路径的函数
+
+        Returns:
+            Dict[str, str]: 上传成功的本地文件路径到远程文件路径的映射；
+                tar流失败时为空
+        """
+        base = PurePosixPath(remote_dir)
+        jobs = []
+        for f in file_list:
+            if f.endswith(SCRIPT_SUFFIXES):
+                continue
+            remote_file = remote_path(f)
+            arcname = remote_file.relative_to(base)
+            if ".." not in arcname.parts:
+                jobs.append((f, str(remote_file), arcname.as_posix()))
+        if not jobs:
+            return {}
+
+        cmd = f"tar -xf - -C {shlex.quote(remote_dir)}"
+        try:
+            stdin, stdout, stderr = ssh_client.exec_command(
+                cmd, timeout=self.config.transfer_timeout
+            )
+            with tarfile.open(fileobj=stdin, mode="w|") as tar:
+                for local_file, _, arcname in jobs:
+                    tar.add(local_file, arcname=arcname, recursive=False)
+            stdin.channel.shutdown_write()
+            exit_status = stdout.channel.recv_exit_status()
+            if exit_status != 0:
+                error_msg = stderr.read().decode(errors='replace').strip()
+                raise UploadBackendError(f"远程解包失败 ({exit_status}): {error_msg}")
+        except Exception as e:
+            logger.warning("tar流上传失败，回退到逐文件SFTP: %s", e)
+            return {}
+
+        logger.info("tar流上传进度: [%s/%s]", len(jobs), len(file_list))
+        return {local: remote for local, remote, _ in jobs}
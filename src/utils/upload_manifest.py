@@ -0,0 +1,139 @@
+"""
+上传记录清单模块
+记录已上传文件的本地指纹（大小、修改时间、内容摘要）和远程状态，
+用于下次上传时找出本地和远程都未变化、可以跳过的文件
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class UploadManifest:
+    """
+    上传记录清单（JSON文件，首次使用时加载）
+
+    .def文件和脚本可能在不同线程中同时上传，所有读写都在锁内进行。
+    """
+
+    def __init__(self, manifest_path: str, key_prefix: str, block_size: int):
+        """
+        Args:
+            manifest_path: 清单文件路径
+            key_prefix: 远程文件键的前缀（区分不同服务器）
+            block_size: 计算内容摘要时的读取块大小（字节）
+        """
+        self._path = manifest_path
+        self._key_prefix = key_prefix
+        self._block_size = block_size
+        self._entries: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def find_candidates(self, targets: List[Tuple[str, str]]) -> Dict[str, Tuple[int, int]]:
+        """
+        找出本地文件自上次上传后未变化的目标
+
+        本地文件先比较大小和修改时间，不一致时再比较内容哈希
+        （重新生成但内容相同的脚本也能跳过）。
+
+        Args:
+            targets: (本地文件路径, 远程文件路径) 列表，
+                同一本地文件可以对应多个远程路径
+
+        Returns:
+            Dict[str, Tuple[int, int]]: 远程文件路径到上次上传后记录的
+                远程 (大小, 修改时间)，
+                调用方与远程当前状态比较后决定是否跳过
+        """
+        candidates = {}
+        digests: Dict[str, str] = {}
+        with self._lock:
+            entries = self._load()
+            for local_file, remote_file in targets:
+                entry = entries.get(self._key_prefix + remote_file)
+                if entry and self._local_file_matches(local_file, entry, digests):
+                    candidates[remote_file] = tuple(entry["remote_stat"])
+        return candidates
+
+    def record(self, uploaded: List[Tuple[str, str]],
+               remote_stats: Dict[str, Tuple[int, int]]) -> None:
+        """
+        记录已上传文件的本地指纹和远程大小/修改时间并保存清单
+
+        Args:
+            uploaded: 已上传的 (本地文件路径, 远程文件路径) 列表
+            remote_stats: 远程文件路径到 (大小, 修改时间) 的映射，
+                缺少的文件不记录
+        """
+        digests: Dict[str, str] = {}
+        with self._lock:
+            entries = self._load()
+            for local_file, remote_file in uploaded:
+                remote_stat = remote_stats.get(remote_file)
+                if remote_stat is None:
+                    continue
+                if local_file not in digests:
+                    digests[local_file] = self._content_digest(local_file)
+                st = os.stat(local_file)
+                entries[self._key_prefix + remote_file] = {
+                    "local_stat": [st.st_size, st.st_mtime_ns],
+                    "digest": digests[local_file],
+                    "remote_stat": list(remote_stat),
+                }
+            self._save()
+
+    def _load(self) -> Dict:
+        """读取清单（只读取一次），不存在或损坏时返回空字典"""
+        if self._entries is None:
+            try:
+                with open(self._path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self) -> None:
+        """保存清单"""
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            with open(self._path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+        except OSError as e:
+            logger.warning("保存上传清单失败: %s", e)
+
+    def _local_file_matches(self, local_file: str, entry: Dict, digests: Dict[str, str]) -> bool:
+        """
+        本地文件与清单记录是否一致
+
+        大小和修改时间不同时比较内容哈希，digests缓存本次已计算的哈希。
+        """
+        try:
+            st = os.stat(local_file)
+        except OSError:
+            return False
+
+        local_stat = [st.st_size, st.st_mtime_ns]
+        if local_stat == entry.get("local_stat"):
+            return True
+
+        if local_file not in digests:
+            digests[local_file] = self._content_digest(local_file)
+        if digests[local_file] != entry.get("digest"):
+            return False
+
+        # 内容未变，更新指纹以便下次只比较stat
+        entry["local_stat"] = local_stat
+        return True
+
+    def _content_digest(self, file_path: str) -> str:
+        """计算本地文件内容摘要（用于上传清单，不用于传输校验）"""
+        digest = hashlib.blake2b(digest_size=32)
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self._block_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
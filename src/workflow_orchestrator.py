@@ -3,10 +3,18 @@
 协调整个CFX自动化流程的执行
 """
 
+import copy
+import gzip
 import logging
 import os
+import re
+import shlex
+import socket
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import PurePath, PurePosixPath
 from typing import Dict, List, Optional, Tuple
 import paramiko
 
@@ -16,6 +24,39 @@ from .cluster_query import ClusterQueryManager
 from .script_generator import ScriptGenerator
 from .transfer import FileTransferManager
 from .job_monitor import JobMonitor
+from .utils.local_fs import ensure_local_directory, iter_files_with_size, local_file_size
+from .utils.remote_exec import REMOTE_BATCH_SIZE, run_remote_command
+from .utils.report_io import write_json_report
+from .utils.ssh_pool import get_pooled_client, register_client
+from .utils.tcp import create_tuned_socket
+
+# 从类似 "Submitted batch job 11122885" 的提交输出行中提取作业ID
+_SUBMITTED_JOB_RE = re.compile(r"^.*Submitted batch job\s+(\d+).*$", re.MULTILINE)
+
+# squeue作业查询的输出格式及对应的字段名（nodelist可能包含空格，
+# 放在最后一列）
+_SQUEUE_JOB_FORMAT = "%i|%P|%j|%u|%t|%M|%D|%R"
+_SQUEUE_JOB_FIELDS = ("job_id", "partition", "name", "user", "state", "time", "nodes", "nodelist")
+
+# 初始文件不超过该大小时只读取一次并缓存在内存中，供所有文件夹复用
+# （字节）
+_INITIAL_FILE_CACHE_LIMIT = 256 * 1024 * 1024
+
+# 压缩后不超过原大小的该比例时才压缩上传初始文件（至少节省10%）
+_INITIAL_FILE_MIN_COMPRESSION = 0.9
+
+# 清理资源时等待后台报告写入线程的最长时间 (秒)
+_REPORT_WRITER_JOIN_TIMEOUT = 5
+
+# 上传清单中按扩展名显示的文件类型
+_UPLOAD_FILE_TYPES = {".def": "CFX定义文件", ".slurm": "SLURM作业脚本"}
+
+
+def _format_file_size(size_bytes: int) -> str:
+    """将字节数格式化为KB（不足1MB时）或MB字符串"""
+    if size_bytes < 1 << 20:
+        return f"{size_bytes / 1024:.1f} KB"
+    return f"{size_bytes / (1 << 20):.2f} MB"
 
 
 class WorkflowError(Exception):
@@ -40,6 +81,40 @@ class WorkflowOrchestrator:
         # SSH连接
         self.ssh_client = None
         
+        # 展开后的SSH私钥路径（只解析一次，重连时复用）
+        self._ssh_key_file = os.path.expanduser(config.ssh_key) if config.ssh_key else ""
+        self._ssh_key_exists = bool(self._ssh_key_file) and os.path.exists(self._ssh_key_file)
+        
+        # 解析后的SSH私钥（首次建立连接时加载，之后的连接直接复用）
+        self._ssh_pkey: Optional[paramiko.PKey] = None
+        self._ssh_pkey_loaded = False
+        
+        # 单独执行步骤时按名称分派的处理函数
+        self._step_only_handlers = {
+            "connect_server": self._run_step_connect_server,
+            "verify_cfx": self._run_step_verify_cfx,
+            "generate_pre": self._run_step_generate_pre,
+            "generate_def": self._run_step_generate_def,
+            "generate_scripts": self._run_step_generate_scripts,
+            "upload_files": self._run_step_upload_files,
+            "submit_jobs": self._run_step_submit_jobs,
+            "monitor_jobs": self._run_step_monitor_jobs,
+            "query_cluster": self._run_step_query_cluster,
+        }
+        
+        # 工作流的步骤总数（计算执行进度用，与步骤分派表保持一致）
+        self._total_steps = len(self._step_only_handlers)
+        
+        # 工作流开始时的单调时钟读数（计算执行时长用，
+        # 不受系统时间调整影响）
+        self._start_monotonic: Optional[float] = None
+        
+        # 已通过CFX环境验证的 (服务器, CFX模式)，同一SSH会话内不重复验证
+        self._cfx_verified: Optional[Tuple[str, str]] = None
+        
+        # 后台保存执行报告的线程（清理资源时等待其结束）
+        self._report_writer: Optional[threading.Thread] = None
+        
         # 执行状态
         self.execution_state = {
             "current_step": "",
@@ -63,6 +138,10 @@ class WorkflowOrchestrator:
         """
         self.logger.info("开始执行CFX自动化工作流程...")
         
+        # 后台线程：集群节点查询与.pre/.def文件生成并行，
+        # .def文件上传与作业脚本生成并行
+        background_executor = ThreadPoolExecutor(max_workers=2)
+        
         try:
             # 初始化执行状态
             self._initialize_execution_state(job_configs)
@@ -73,39 +152,57 @@ class WorkflowOrchestrator:
             # 步骤2: 验证CFX环境
             self._execute_step("verify_cfx", self._verify_cfx_environment)
             
+            cluster_future = None
+            if self.config.enable_node_detection:
+                cluster_future = background_executor.submit(
+                    self.cluster_query.query_cluster_nodes, self.ssh_client
+                )
+            
             # 步骤3: 生成.pre文件
-            pre_files = self._execute_step("generate_pre", 
-                                         lambda: self.cfx_manager.generate_pre_files(job_configs))
+            pre_files = self._execute_step(
+                "generate_pre", self.cfx_manager.generate_pre_files, job_configs
+            )
             
             # 步骤4: 生成.def文件（根据模式）
-            def_files = self._execute_step("generate_def", 
-                                         lambda: self._generate_def_files(pre_files, job_configs))
+            def_files = self._execute_step(
+                "generate_def", self._generate_def_files, pre_files, job_configs
+            )
             
-            # 步骤5: 集群节点查询（如果启用）
+            # 步骤5: 集群节点查询（如果启用，等待后台查询结果）
             cluster_status = None
-            if self.config.enable_node_detection:
-                cluster_status = self._execute_step("query_cluster", 
-                                                  lambda: self.cluster_query.query_cluster_nodes(self.ssh_client))
+            if cluster_future is not None:
+                cluster_status = self._execute_step("query_cluster", cluster_future.result)
             
             # 步骤6: 生成作业脚本（包含智能节点分配）
             # 使用简化的作业配置，智能分配在脚本生成时进行
             simple_jobs = self._create_simple_job_configs(job_configs, def_files)
-            scripts = self._execute_step("generate_scripts", 
-                                       lambda: self.script_generator.generate_job_scripts(simple_jobs, cluster_status))
+            
+            # local模式下.def文件已就绪，先在后台上传，与作业脚本生成重叠
+            def_upload_future = None
+            if self.config.cfx_mode == "local" and def_files:
+                def_upload_future = background_executor.submit(self._upload_def_files, def_files)
+            
+            scripts = self._execute_step(
+                "generate_scripts", self.script_generator.generate_job_scripts,
+                simple_jobs, cluster_status
+            )
             
             # 步骤8: 上传文件
-            self._execute_step("upload_files", 
-                             lambda: self._upload_files(def_files, scripts))
+            self._execute_step(
+                "upload_files", self._upload_files, def_files, scripts, def_upload_future
+            )
             
             # 步骤9: 提交作业
-            submitted_jobs = self._execute_step("submit_jobs", 
-                                              lambda: self._submit_jobs(scripts["submit_script"]))
+            submitted_jobs = self._execute_step(
+                "submit_jobs", self._submit_jobs, scripts["submit_script"]
+            )
             
             # 步骤10: 监控作业（如果启用）
             monitoring_report = None
             if self.config.enable_monitoring:
-                monitoring_report = self._execute_step("monitor_jobs", 
-                                                     lambda: self._monitor_jobs(submitted_jobs))
+                monitoring_report = self._execute_step(
+                    "monitor_jobs", self._monitor_jobs, submitted_jobs
+                )
             
             # 生成最终报告
             report = self._generate_final_report(
@@ -123,11 +220,14 @@ class WorkflowOrchestrator:
             raise WorkflowError(f"工作流程执行失败: {e}")
         
         finally:
+            background_executor.shutdown(wait=True)
+            
             # 清理资源
             self._cleanup_resources()
     
     def _initialize_execution_state(self, job_configs: List[Dict]) -> None:
         """初始化执行状态"""
+        self._start_monotonic = time.monotonic()
         self.execution_state.update({
             "current_step": "",
             "completed_steps": [],
@@ -138,13 +238,13 @@ class WorkflowOrchestrator:
             "successful_jobs": 0
         })
     
-    def _execute_step(self, step_name: str, step_function) -> any:
-        """执行工作流步骤"""
+    def _execute_step(self, step_name: str, step_function, *args, **kwargs) -> any:
+        """执行工作流步骤（args/kwargs原样传给step_function）"""
         self.execution_state["current_step"] = step_name
         self.logger.info(f"执行步骤: {step_name}")
         
         try:
-            result = step_function()
+            result = step_function(*args, **kwargs)
             self.execution_state["completed_steps"].append(step_name)
             self.logger.info(f"步骤完成: {step_name}")
             return result
@@ -155,35 +255,130 @@ class WorkflowOrchestrator:
             raise WorkflowError(f"步骤失败 {step_name}: {e}")
     
     def _connect_to_server(self) -> None:
-        """连接到服务器"""
+        """连接到服务器（优先复用连接池中仍然活跃的连接）"""
+        pooled_client = get_pooled_client(
+            self.config.ssh_host, self.config.ssh_port, self.config.ssh_user
+        )
+        if pooled_client is not None:
+            self.ssh_client = pooled_client
+            self.logger.info(f"复用已有服务器连接: {self.config.ssh_host}")
+            return
+        
         try:
-            self.ssh_client = paramiko.SSHClient()
-            self.ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            # 连接参数
-            connect_kwargs = {
-                "hostname": self.config.ssh_host,
-                "port": self.config.ssh_port,
-                "username": self.config.ssh_user,
-                "timeout": 30
-            }
-            
-            # 认证方式
-            if self.config.ssh_key and os.path.exists(self.config.ssh_key):
-                connect_kwargs["key_filename"] = self.config.ssh_key
-            elif self.config.ssh_password:
-                connect_kwargs["password"] = self.config.ssh_password
-            else:
-                raise WorkflowError("未配置SSH认证信息")
-            
-            self.ssh_client.connect(**connect_kwargs)
+            self.ssh_client = self._create_ssh_client()
+            self.transfer_manager.clear_remote_directory_cache()
+            self._cfx_verified = None
+            register_client(
+                self.config.ssh_host, self.config.ssh_port, self.config.ssh_user, self.ssh_client
+            )
             self.logger.info(f"已连接到服务器: {self.config.ssh_host}")
             
         except Exception as e:
             raise WorkflowError(f"服务器连接失败: {e}")
     
+    def _create_ssh_client(self) -> paramiko.SSHClient:
+        """建立一个新的已认证SSH连接"""
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        
+        # 连接参数
+        connect_kwargs = {
+            "hostname": self.config.ssh_host,
+            "port": self.config.ssh_port,
+            "username": self.config.ssh_user,
+            "timeout": 30,
+            "compress": self.config.ssh_compression
+        }
+        
+        # 认证方式
+        if self._ssh_key_exists:
+            pkey = self._load_private_key()
+            if pkey is not None:
+                connect_kwargs["pkey"] = pkey
+            else:
+                connect_kwargs["key_filename"] = self._ssh_key_file
+        elif self.config.ssh_password:
+            connect_kwargs["password"] = self.config.ssh_password
+            # 密码认证时不再逐个尝试 ~/.ssh 下的默认私钥，
+            # 避免多次失败的公钥认证往返
+            connect_kwargs["look_for_keys"] = False
+        else:
+            raise WorkflowError("未配置SSH认证信息")
+        
+        connect_kwargs["sock"] = self._create_tuned_socket()
+        client.connect(**connect_kwargs)
+        client.get_transport().set_keepalive(self.config.ssh_keepalive_interval)
+        return client
+    
+    def _load_private_key(self) -> Optional[paramiko.PKey]:
+        """
+        解析配置的SSH私钥文件（每个编排器只解析一次）
+        
+        Returns:
+            Optional[paramiko.PKey]: 私钥对象；无法解析（如需要口令，
+                或paramiko<3.2没有PKey.from_path）时返回None，由paramiko按文件名加载
+        """
+        if not self._ssh_pkey_loaded:
+            self._ssh_pkey_loaded = True
+            try:
+                self._ssh_pkey = paramiko.PKey.from_path(self._ssh_key_file)
+            except Exception as e:
+                self.logger.debug(f"预加载SSH私钥失败，改为按文件名加载: {e}")
+        return self._ssh_pkey
+    
+    def _get_transfer_clients(self) -> List[paramiko.SSHClient]:
+        """
+        获取上传使用的附加SSH连接（按 transfer_connections 配置按需建立）
+        
+        多个独立TCP连接各自拥有拥塞窗口，
+        在高延迟链路上比单连接多会话的吞吐量更高。
+        附加连接与主连接一样保留在连接池中，后续步骤直接复用。
+        
+        Returns:
+            List[paramiko.SSHClient]: 附加连接列表（不含主连接）
+        """
+        host, port, user = self.config.ssh_host, self.config.ssh_port, self.config.ssh_user
+        
+        clients = []
+        for slot in range(1, self.config.transfer_connections):
+            client = get_pooled_client(host, port, user, slot)
+            if client is None:
+                try:
+                    client = self._create_ssh_client()
+                except Exception as e:
+                    self.logger.warning(
+                        f"建立附加传输连接失败，使用现有连接继续: {e}"
+                    )
+                    break
+                register_client(host, port, user, client, slot)
+            clients.append(client)
+        
+        return clients
+    
+    def _ensure_connected(self) -> None:
+        """确保存在可用的服务器连接"""
+        transport = self.ssh_client.get_transport() if self.ssh_client else None
+        if transport is None or not transport.is_active():
+            self._connect_to_server()
+    
+    def _create_tuned_socket(self) -> socket.socket:
+        """
+        创建关闭Nagle算法的TCP连接
+
+        配置了tcp_buffer_size时在连接前设置收发缓冲区，
+        否则由内核自动调整。
+        """
+        return create_tuned_socket(
+            self.config.ssh_host, self.config.ssh_port, self.config.tcp_buffer_size
+        )
+    
     def _verify_cfx_environment(self) -> None:
-        """验证CFX环境"""
+        """验证CFX环境（同一SSH会话内验证通过后直接复用结果）"""
+        verify_key = (self.config.ssh_host, self.config.cfx_mode)
+        if self._cfx_verified == verify_key:
+            self.logger.debug("CFX环境已验证，跳过重复验证")
+            return
+        
         # 检查是否配置了跳过CFX验证（老集群使用module system）
         skip_verification = getattr(self.config, 'skip_cfx_verification', False)
         self.logger.info(f"CFX验证设置: skip_cfx_verification = {skip_verification}")
@@ -197,6 +392,7 @@ class WorkflowOrchestrator:
                     raise WorkflowError("本地CFX环境未配置或不可用")
                 else:
                     self.logger.info(f"本地CFX环境已配置: {self.config.cfx_pre_executable}")
+            self._cfx_verified = verify_key
             return
             
         # 正常验证服务器CFX环境
@@ -208,6 +404,8 @@ class WorkflowOrchestrator:
         if self.config.cfx_mode == "local":
             if not self.config.cfx_pre_executable:
                 raise WorkflowError("本地CFX环境未配置或不可用")
+        
+        self._cfx_verified = verify_key
     
     def _generate_def_files(self, pre_files: List[str], job_configs: List[Dict]) -> List[str]:
         """生成.def文件"""
@@ -231,27 +429,48 @@ class WorkflowOrchestrator:
                 self.ssh_client, list(remote_pre_files.values()), self.config.remote_base_path
             )
     
-    def _create_simple_job_configs(self, job_configs: List[Dict], def_files: List[str]) -> List[Dict]:
+    def _create_simple_job_configs(self, job_configs: List[Dict],
+                                   def_files: List[str]) -> List[Dict]:
         """创建简化的作业配置（不进行节点分配）"""
         simple_jobs = []
+        allocated_cpus = getattr(self.config, 'min_cores', self.config.tasks_per_node)
+        creation_time = datetime.now().isoformat()
         
         for i, job_config in enumerate(job_configs):
             simple_job = job_config.copy()
             simple_job.update({
                 "def_file": def_files[i] if i < len(def_files) else "",
-                "allocated_cpus": getattr(self.config, 'min_cores', self.config.tasks_per_node),
-                "creation_time": datetime.now().isoformat()
+                "allocated_cpus": allocated_cpus,
+                "creation_time": creation_time
             })
             simple_jobs.append(simple_job)
         
         return simple_jobs
 
-    def _upload_files(self, def_files: List[str], scripts: Dict) -> None:
-        """上传文件到服务器"""
+    def _upload_def_files(self, def_files: List[str]) -> Dict[str, str]:
+        """上传本地生成的.def文件（保持目录结构）"""
+        return self.transfer_manager.upload_files(
+            self.ssh_client, def_files, self.config.remote_base_path, preserve_structure=True,
+            extra_clients=self._get_transfer_clients()
+        )
+    
+    def _upload_files(self, def_files: List[str], scripts: Dict, def_upload=None) -> None:
+        """
+        上传文件到服务器
+        
+        Args:
+            def_files: .def文件列表
+            scripts: 生成的作业脚本信息
+            def_upload: 已在后台提交的.def文件上传任务（Future），
+                为None时随脚本一起上传
+        """
         files_to_upload = []
+        uploaded_count = 0
         
         # 添加.def文件（如果是local模式）
-        if self.config.cfx_mode == "local":
+        if def_upload is not None:
+            uploaded_count += len(def_upload.result())
+        elif self.config.cfx_mode == "local":
             files_to_upload.extend(def_files)
         
         # 添加脚本文件
@@ -261,88 +480,377 @@ class WorkflowOrchestrator:
         if scripts["monitor_script"]:
             files_to_upload.append(scripts["monitor_script"])
         
-        # 执行基本文件上传，保持目录结构
-        uploaded_files = self.transfer_manager.upload_files(
-            self.ssh_client, files_to_upload, self.config.remote_base_path, preserve_structure=True
-        )
-        
-        # 单独处理初始文件上传到各个P_Out_文件夹
+        # 初始文件需要复制到各个P_Out_文件夹（一对多），
+        # 与基本文件上传同时进行
+        initial_file_path = None
         if hasattr(self.config, 'initial_file') and self.config.initial_file:
-            initial_file_path = self.config.initial_file
-            if os.path.exists(initial_file_path):
-                self.logger.info(f"开始上传初始文件到各个P_Out_文件夹: {initial_file_path}")
-                self._upload_initial_files_to_folders(initial_file_path, def_files)
+            if os.path.exists(self.config.initial_file):
+                initial_file_path = self.config.initial_file
             else:
-                self.logger.warning(f"初始文件不存在，跳过上传: {initial_file_path}")
+                self.logger.warning(
+                    f"初始文件不存在，跳过上传: {self.config.initial_file}"
+                )
+        
+        # 附加传输连接在启动并行上传前建立，两个上传共用
+        # （避免两个线程同时建立连接）
+        transfer_clients = self._get_transfer_clients()
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            initial_upload = None
+            if initial_file_path:
+                self.logger.info(
+                    f"开始上传初始文件到各个P_Out_文件夹: {initial_file_path}"
+                )
+                initial_upload = executor.submit(
+                    self._upload_initial_files_to_folders, initial_file_path, def_files,
+                    transfer_clients
+                )
+            
+            # 执行基本文件上传，保持目录结构
+            uploaded_files = self.transfer_manager.upload_files(
+                self.ssh_client, files_to_upload, self.config.remote_base_path,
+                preserve_structure=True, extra_clients=transfer_clients
+            )
+            uploaded_count += len(uploaded_files)
+            
+            if initial_upload is not None:
+                initial_upload.result()
         
-        self.logger.info(f"文件上传完成: {len(uploaded_files)}个文件")
+        self.logger.info(f"文件上传完成: {uploaded_count}个文件")
     
-    def _upload_initial_files_to_folders(self, initial_file_path: str, def_files: List[str]) -> None:
-        """直接上传初始文件到服务器的各个P_Out_文件夹"""
+    def _upload_initial_files_to_folders(
+            self, initial_file_path: str, def_files: List[str],
+            extra_clients: Optional[List[paramiko.SSHClient]] = None) -> None:
+        """
+        直接上传初始文件到服务器的各个P_Out_文件夹
+        
+        Args:
+            initial_file_path: 本地初始文件路径
+            def_files: .def文件列表（确定目标P_Out_文件夹）
+            extra_clients: 附加传输连接，为None时按 transfer_connections 配置获取
+        """
+        if extra_clients is None:
+            extra_clients = self._get_transfer_clients()
+        
         try:
             # 获取初始文件的文件名
             initial_filename = os.path.basename(initial_file_path)
             
-            # 为每个def文件所在的文件夹上传初始文件
-            processed_folders = set()
+            # 每个P_Out_文件夹对应的服务器端目标路径
+            base_path = self.config.base_path
+            remote_base = PurePosixPath(self.config.remote_base_path)
+            targets = [
+                (
+                    folder_name,
+                    str(remote_base / PurePath(os.path.relpath(def_folder, base_path)).as_posix())
+                )
+                for folder_name, def_folder in self._initial_file_folders(def_files)
+            ]
+            
+            if not targets:
+                return
             
-            for def_file in def_files:
-                # 获取def文件的相对路径
-                rel_def_file = os.path.relpath(def_file, self.config.base_path)
-                def_folder_rel = os.path.dirname(rel_def_file)
-                
-                # 避免重复处理同一个文件夹
-                if def_folder_rel in processed_folders:
-                    continue
-                processed_folders.add(def_folder_rel)
-                
-                # 检查文件夹是否是P_Out_开头
-                folder_name = os.path.basename(def_folder_rel)
-                if folder_name.startswith(self.config.folder_prefix):
-                    # 构建服务器端的目标路径
-                    remote_folder = os.path.join(self.config.remote_base_path, def_folder_rel).replace('\\', '/')
-                    remote_initial_file = f"{remote_folder}/{initial_filename}"
-                    
-                    self.logger.info(f"上传初始文件到: {remote_initial_file}")
-                    
-                    # 使用SFTP直接上传文件到目标路径
-                    try:
-                        sftp = self.ssh_client.open_sftp()
-                        
-                        # 确保远程目录存在
+            sftp = self.transfer_manager.open_sftp(self.ssh_client)
+            try:
+                # 一次 mkdir -p 创建所有目标文件夹
+                # （已确认的目录不再访问服务器）
+                try:
+                    self.transfer_manager.ensure_remote_directories(
+                        self.ssh_client, [remote_folder for _, remote_folder in targets]
+                    )
+                    upload_targets = [
+                        (folder_name, f"{remote_folder}/{initial_filename}")
+                        for folder_name, remote_folder in targets
+                    ]
+                except Exception as e:
+                    # 批量创建失败时退回逐个通过SFTP创建
+                    self.logger.warning(f"批量创建远程目录失败，逐个创建: {e}")
+                    upload_targets = []
+                    for folder_name, remote_folder in targets:
                         try:
-                            sftp.stat(remote_folder)
-                        except FileNotFoundError:
-                            # 目录不存在，创建目录
                             self._create_remote_directory(sftp, remote_folder)
-                        
-                        # 上传文件
-                        sftp.put(initial_file_path, remote_initial_file)
-                        self.logger.info(f"✓ 初始文件上传成功: {folder_name}/{initial_filename}")
-                        
-                        sftp.close()
-                        
-                    except Exception as e:
-                        self.logger.error(f"上传初始文件到 {folder_name} 失败: {e}")
+                            upload_targets.append(
+                                (folder_name, f"{remote_folder}/{initial_filename}")
+                            )
+                        except Exception as e:
+                            self.logger.error(f"上传初始文件到 {folder_name} 失败: {e}")
+                
+                # 跳过远程已是最新版本的初始文件
+                unchanged = self.transfer_manager.find_unchanged_uploads(
+                    self.ssh_client, [(initial_file_path, remote) for _, remote in upload_targets]
+                )
+                if unchanged:
+                    self.logger.info(
+                        f"跳过{len(unchanged)}个未变化的初始文件（远程已是最新）"
+                    )
+                    upload_targets = [t for t in upload_targets if t[1] not in unchanged]
+                if not upload_targets:
+                    return
+                
+                # 初始文件只读取一次，所有文件夹共用同一份内容
+                # （过大的文件仍逐次流式读取）
+                payload = None
+                if os.path.getsize(initial_file_path) <= _INITIAL_FILE_CACHE_LIMIT:
+                    with open(initial_file_path, 'rb') as f:
+                        payload = f.read()
+                
+                # 内容完全相同，只上传一份再在服务器上复制，
+                # 传输量从N份降为1份
+                uploaded = []
+                remaining = upload_targets
+                if self.config.initial_file_remote_copy and len(upload_targets) > 1:
+                    uploaded = self._put_initial_file_remote_copy(
+                        initial_file_path, upload_targets, sftp, payload
+                    )
+                    copied = set(uploaded)
+                    remaining = [t for t in upload_targets if t[1] not in copied]
+                
+                if remaining:
+                    direct = None
+                    if payload is not None and self.config.compress_initial_file:
+                        direct = self._put_initial_file_compressed(
+                            initial_file_path, remaining, sftp, payload, extra_clients
+                        )
+                    if direct is None:
+                        # 启用asyncssh时在一个事件循环中并发上传到所有文件夹，
+                        # 失败的部分再用paramiko上传
+                        async_uploaded = self.transfer_manager.upload_copies_asyncssh(
+                            initial_file_path, [remote for _, remote in remaining]
+                        )
+                        if async_uploaded:
+                            uploaded.extend(async_uploaded)
+                            done = set(async_uploaded)
+                            remaining = [t for t in remaining if t[1] not in done]
+                    if direct is None and remaining:
+                        direct = self._put_initial_file_parallel(
+                            initial_file_path, remaining, sftp, payload, extra_clients
+                        )
+                    uploaded.extend(direct or [])
+                
+                self.transfer_manager.record_uploads(
+                    self.ssh_client, [(initial_file_path, remote) for remote in uploaded]
+                )
+            finally:
+                sftp.close()
                         
         except Exception as e:
             self.logger.error(f"上传初始文件到文件夹失败: {e}")
     
+    def _put_initial_file_parallel(
+            self, initial_file_path: str, targets: List[Tuple[str, str]],
+            sftp, payload: Optional[bytes],
+            extra_clients: Optional[List[paramiko.SSHClient]] = None) -> List[str]:
+        """
+        各文件夹分组并行上传初始文件，每组使用独立的SFTP会话
+        （SFTPClient不是线程安全的）
+        
+        有附加传输连接时各组的SFTP会话轮流分配到主连接和各附加连接上。
+        
+        Args:
+            initial_file_path: 本地初始文件路径
+            targets: (文件夹名, 远程文件路径) 列表
+            sftp: 第一组复用的SFTP会话（属于主连接）
+            payload: 已读入内存的文件内容，为None时从本地文件流式读取
+            extra_clients: 附加传输连接列表
+            
+        Returns:
+            List[str]: 上传成功的远程文件路径
+        """
+        workers = max(1, min(self.config.max_parallel_transfers, len(targets)))
+        groups = [targets[i::workers] for i in range(workers)]
+        clients = [self.ssh_client] + list(extra_clients or [])
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    self._put_initial_file_group, initial_file_path, group,
+                    sftp if i == 0 else None, payload, clients[i % len(clients)]
+                )
+                for i, group in enumerate(groups) if group
+            ]
+            return [remote for future in futures for remote in future.result()]
+    
+    def _put_initial_file_remote_copy(self, initial_file_path: str, targets: List[Tuple[str, str]],
+                                      sftp, payload: Optional[bytes]) -> List[str]:
+        """
+        只把初始文件上传到第一个文件夹，再用远程cp复制到其余文件夹
+        （每条命令最多REMOTE_BATCH_SIZE个目标）
+        
+        Args:
+            initial_file_path: 本地初始文件路径
+            targets: (文件夹名, 远程文件路径) 列表
+            sftp: 上传使用的SFTP会话
+            payload: 已读入内存的文件内容，为None时从本地文件流式读取
+            
+        Returns:
+            List[str]: 已就绪的远程文件路径；
+                远程复制失败时不包含未复制成功的文件夹，由调用方直接上传
+        """
+        first = targets[:1]
+        uploaded = None
+        if payload is not None and self.config.compress_initial_file:
+            uploaded = self._put_initial_file_compressed(initial_file_path, first, sftp, payload)
+        if uploaded is None:
+            uploaded = self._put_initial_file_group(initial_file_path, first, sftp, payload)
+        if not uploaded:
+            return []
+        
+        source = shlex.quote(uploaded[0])
+        copies = [remote for _, remote in targets[1:]]
+        for start in range(0, len(copies), REMOTE_BATCH_SIZE):
+            chunk = copies[start:start + REMOTE_BATCH_SIZE]
+            cmd = " && ".join(f"cp -f -- {source} {shlex.quote(remote)}" for remote in chunk)
+            exit_status, _, error_msg = run_remote_command(
+                self.ssh_client, cmd, self.config.transfer_timeout
+            )
+            if exit_status != 0:
+                self.logger.warning(
+                    f"远程复制初始文件失败，改为直接上传: {error_msg.strip()}"
+                )
+                return uploaded + copies[:start]
+        
+        self.logger.info(
+            f"✓ 初始文件已在服务器上复制到其余{len(copies)}个文件夹"
+        )
+        return uploaded + copies
+    
+    def _put_initial_file_compressed(
+            self, initial_file_path: str, targets: List[Tuple[str, str]],
+            sftp, payload: bytes,
+            extra_clients: Optional[List[paramiko.SSHClient]] = None) -> Optional[List[str]]:
+        """
+        上传gzip压缩后的初始文件，再用远程gunzip在各文件夹中解压
+        
+        Args:
+            initial_file_path: 本地初始文件路径
+            targets: (文件夹名, 远程文件路径) 列表
+            sftp: 第一组复用的SFTP会话
+            payload: 初始文件内容
+            extra_clients: 附加传输连接列表
+            
+        Returns:
+            Optional[List[str]]: 解压成功的远程文件路径；
+                压缩收益不足或远程解压失败时返回None，
+            由调用方改为直接上传原文件
+        """
+        compressed = gzip.compress(payload, compresslevel=1)
+        if len(compressed) > len(payload) * _INITIAL_FILE_MIN_COMPRESSION:
+            self.logger.debug("初始文件压缩收益不足，直接上传原文件")
+            return None
+        
+        self.logger.info(
+            f"初始文件压缩后上传: {len(payload) / (1024 * 1024):.2f} MB -> "
+            f"{len(compressed) / (1024 * 1024):.2f} MB"
+        )
+        gz_targets = [(folder_name, f"{remote}.gz") for folder_name, remote in targets]
+        uploaded_gz = self._put_initial_file_parallel(
+            initial_file_path, gz_targets, sftp, compressed, extra_clients
+        )
+        if not uploaded_gz:
+            return None
+        
+        # 分块调用gunzip解压各文件夹中的压缩文件
+        # （-f覆盖已存在的旧初始文件）
+        for start in range(0, len(uploaded_gz), REMOTE_BATCH_SIZE):
+            chunk = uploaded_gz[start:start + REMOTE_BATCH_SIZE]
+            cmd = "gunzip -f -- " + " ".join(shlex.quote(f) for f in chunk)
+            exit_status, _, error_msg = run_remote_command(
+                self.ssh_client, cmd, self.config.transfer_timeout
+            )
+            if exit_status != 0:
+                self.logger.warning(
+                    f"远程解压初始文件失败，直接上传原文件: {error_msg.strip()}"
+                )
+                return None
+        
+        return [remote[:-len(".gz")] for remote in uploaded_gz]
+    
+    def _put_initial_file_group(self, initial_file_path: str, targets: List[Tuple[str, str]],
+                                sftp=None, payload: Optional[bytes] = None,
+                                ssh_client: Optional[paramiko.SSHClient] = None) -> List[str]:
+        """
+        在一个SFTP会话中把初始文件上传到一组文件夹
+        
+        Args:
+            initial_file_path: 本地初始文件路径
+            targets: (文件夹名, 远程初始文件路径) 列表
+            sftp: 复用的SFTP会话，为None时打开新的会话并在结束后关闭
+            payload: 已读入内存的初始文件内容，为None时从本地文件流式读取
+            ssh_client: 打开新SFTP会话使用的连接，为None时使用主连接
+            
+        Returns:
+            List[str]: 上传成功的远程文件路径
+        """
+        initial_filename = os.path.basename(initial_file_path)
+        own_session = sftp is None
+        uploaded = []
+        
+        try:
+            if own_session:
+                sftp = self.transfer_manager.open_sftp(ssh_client or self.ssh_client)
+            
+            for folder_name, remote_initial_file in targets:
+                self.logger.info(f"上传初始文件到: {remote_initial_file}")
+                try:
+                    # 流水线写入，不再额外stat确认
+                    # （写入错误在关闭文件时抛出）
+                    if payload is not None:
+                        self.transfer_manager.put_data(sftp, payload, remote_initial_file)
+                    else:
+                        self.transfer_manager.put_file(
+                            sftp, initial_file_path, remote_initial_file, confirm=False
+                        )
+                    uploaded.append(remote_initial_file)
+                    self.logger.info(
+                        f"✓ 初始文件上传成功: {folder_name}/{initial_filename}"
+                    )
+                except Exception as e:
+                    self.logger.error(f"上传初始文件到 {folder_name} 失败: {e}")
+        except Exception as e:
+            self.logger.error(f"打开SFTP会话失败: {e}")
+        finally:
+            if own_session and sftp is not None:
+                sftp.close()
+        
+        return uploaded
+    
     def _create_remote_directory(self, sftp, remote_path: str) -> None:
         """递归创建远程目录"""
-        try:
-            sftp.stat(remote_path)
-        except FileNotFoundError:
-            # 目录不存在，先创建父目录
-            parent_dir = os.path.dirname(remote_path)
-            if parent_dir and parent_dir != remote_path:
-                self._create_remote_directory(sftp, parent_dir)
-            
-            # 创建当前目录
-            sftp.mkdir(remote_path)
-            self.logger.debug(f"创建远程目录: {remote_path}")
-    
-    def _prepare_initial_files_for_folders(self, initial_file_path: str, def_files: List[str]) -> None:
+        if self.transfer_manager.remote_directory_exists(sftp, remote_path):
+            return
+        
+        # 目录不存在，先创建父目录
+        parent_dir = os.path.dirname(remote_path)
+        if parent_dir and parent_dir != remote_path:
+            self._create_remote_directory(sftp, parent_dir)
+        
+        # 创建当前目录
+        sftp.mkdir(remote_path)
+        self.transfer_manager.remember_remote_directory(remote_path)
+        self.logger.debug(f"创建远程目录: {remote_path}")
+    
+    def _initial_file_folders(self, def_files: List[str]) -> List[Tuple[str, str]]:
+        """
+        找出def文件所在的P_Out_文件夹（同一文件夹只返回一次，
+        保持def文件的顺序）
+        
+        Args:
+            def_files: .def文件列表
+            
+        Returns:
+            List[Tuple[str, str]]: (文件夹名, 本地文件夹路径) 列表
+        """
+        folder_prefix = self.config.folder_prefix
+        def_folders = dict.fromkeys(os.path.dirname(def_file) for def_file in def_files)
+        folders = []
+        for def_folder in def_folders:
+            folder_name = os.path.basename(def_folder)
+            if folder_name.startswith(folder_prefix):
+                folders.append((folder_name, def_folder))
+        return folders
+    
+    def _prepare_initial_files_for_folders(self, initial_file_path: str,
+                                           def_files: List[str]) -> None:
         """为每个P_Out_文件夹准备初始文件副本"""
         try:
             import shutil
@@ -351,28 +859,14 @@ class WorkflowOrchestrator:
             initial_filename = os.path.basename(initial_file_path)
             
             # 为每个def文件所在的文件夹创建初始文件副本
-            processed_folders = set()
-            
-            for def_file in def_files:
-                # 获取def文件所在的文件夹
-                def_folder = os.path.dirname(def_file)
+            for _, def_folder in self._initial_file_folders(def_files):
+                target_initial_file = os.path.join(def_folder, initial_filename)
                 
-                # 避免重复处理同一个文件夹
-                if def_folder in processed_folders:
-                    continue
-                processed_folders.add(def_folder)
-                
-                # 检查文件夹是否是P_Out_开头
-                folder_name = os.path.basename(def_folder)
-                if folder_name.startswith(self.config.folder_prefix):
-                    # 在该文件夹中创建初始文件副本
-                    target_initial_file = os.path.join(def_folder, initial_filename)
-                    
-                    if not os.path.exists(target_initial_file):
-                        self.logger.info(f"复制初始文件到: {target_initial_file}")
-                        shutil.copy2(initial_file_path, target_initial_file)
-                    else:
-                        self.logger.info(f"初始文件已存在: {target_initial_file}")
+                if not os.path.exists(target_initial_file):
+                    self.logger.info(f"复制初始文件到: {target_initial_file}")
+                    shutil.copy2(initial_file_path, target_initial_file)
+                else:
+                    self.logger.info(f"初始文件已存在: {target_initial_file}")
                         
         except Exception as e:
             self.logger.error(f"准备初始文件副本失败: {e}")
@@ -383,46 +877,29 @@ class WorkflowOrchestrator:
             raise WorkflowError("批量提交脚本未生成")
         
         try:
-            # 获取远程提交脚本路径
-            remote_script = os.path.join(
-                self.config.remote_base_path, 
-                os.path.basename(submit_script)
-            ).replace('\\', '/')
-            
-            # 设置执行权限
-            chmod_cmd = f"chmod +x {remote_script}"
-            stdin, stdout, stderr = self.ssh_client.exec_command(chmod_cmd)
-            stdout.channel.recv_exit_status()
-            
-            # 执行提交脚本
-            submit_cmd = f"cd {self.config.remote_base_path} && ./{os.path.basename(submit_script)}"
+            # 远程提交脚本文件名
+            script_name = os.path.basename(submit_script)
+            
+            # 执行提交脚本（上传阶段已统一设置执行权限）
+            submit_cmd = (
+                f"cd -- {shlex.quote(self.config.remote_base_path)} && ./{shlex.quote(script_name)}"
+            )
             self.logger.info(f"执行作业提交命令: {submit_cmd}")
             
-            stdin, stdout, stderr = self.ssh_client.exec_command(submit_cmd)
-            exit_status = stdout.channel.recv_exit_status()
+            # 边执行边读取输出，避免大量输出填满通道窗口后阻塞远程脚本
+            exit_status, output, error_msg = run_remote_command(self.ssh_client, submit_cmd)
             
             if exit_status != 0:
-                error_msg = stderr.read().decode()
                 raise WorkflowError(f"作业提交失败: {error_msg}")
             
-            output = stdout.read().decode()
             self.logger.info("作业提交输出:")
             self.logger.info(output)
             
-            # 解析提交的作业ID
-            submitted_jobs = []
-            for line in output.split('\n'):
-                if 'Submitted batch job' in line:
-                    # 从类似 "Submitted batch job 11122885" 的行中提取作业ID
-                    try:
-                        job_id = line.strip().split()[-1]
-                        job_info = {
-                            "job_id": job_id,
-                            "output_line": line.strip()
-                        }
-                        submitted_jobs.append(job_info)
-                    except Exception as e:
-                        self.logger.warning(f"解析作业ID失败: {line.strip()} - {e}")
+            # 解析提交的作业ID（一次正则扫描整个输出）
+            submitted_jobs = [
+                {"job_id": match.group(1), "output_line": match.group(0).strip()}
+                for match in _SUBMITTED_JOB_RE.finditer(output)
+            ]
             
             self.logger.info(f"成功提交{len(submitted_jobs)}个作业")
             return submitted_jobs
@@ -434,47 +911,52 @@ class WorkflowOrchestrator:
         """获取当前用户已提交的作业信息"""
         try:
             # 查询当前用户的作业
-            if self.config.scheduler_type == "SLURM":
-                query_cmd = f"squeue -u {self.config.ssh_user} -o '%.10i %.12P %.20j %.8u %.2t %.10M %.6D %R'"
+            is_slurm = self.config.scheduler_type == "SLURM"
+            if is_slurm:
+                # 无标题行、以|分隔的固定列，逐行一次split即可解析
+                query_cmd = (
+                    f"squeue -u {shlex.quote(self.config.ssh_user)} "
+                    f"-h -o '{_SQUEUE_JOB_FORMAT}'"
+                )
             else:
                 # PBS调度器
                 query_cmd = f"qstat -u {self.config.ssh_user}"
             
-            stdin, stdout, stderr = self.ssh_client.exec_command(query_cmd)
-            exit_status = stdout.channel.recv_exit_status()
+            exit_status, output, error_msg = run_remote_command(self.ssh_client, query_cmd)
             
             if exit_status != 0:
-                error_msg = stderr.read().decode()
                 self.logger.warning(f"查询作业状态失败: {error_msg}")
                 return []
             
-            output = stdout.read().decode()
             self.logger.info("当前作业状态查询结果:")
             self.logger.info(output)
             
             # 解析作业信息
             jobs = []
-            lines = output.strip().split('\n')
-            
-            if len(lines) <= 1:  # 只有标题行或空输出
-                return []
-            
-            # 跳过标题行
-            for line in lines[1:]:
-                if line.strip():
-                    fields = line.split()
-                    if len(fields) >= 5:
-                        job_info = {
-                            "job_id": fields[0],
-                            "partition": fields[1] if len(fields) > 1 else "",
-                            "name": fields[2] if len(fields) > 2 else "",
-                            "user": fields[3] if len(fields) > 3 else "",
-                            "state": fields[4] if len(fields) > 4 else "",
-                            "time": fields[5] if len(fields) > 5 else "",
-                            "nodes": fields[6] if len(fields) > 6 else "",
-                            "nodelist": ' '.join(fields[7:]) if len(fields) > 7 else ""
-                        }
-                        jobs.append(job_info)
+            if is_slurm:
+                for line in output.splitlines():
+                    fields = line.split("|", len(_SQUEUE_JOB_FIELDS) - 1)
+                    if len(fields) == len(_SQUEUE_JOB_FIELDS):
+                        jobs.append(dict(zip(_SQUEUE_JOB_FIELDS, fields)))
+            else:
+                lines = output.strip().split('\n')
+                
+                # 跳过标题行
+                for line in lines[1:]:
+                    if line.strip():
+                        fields = line.split()
+                        if len(fields) >= 5:
+                            job_info = {
+                                "job_id": fields[0],
+                                "partition": fields[1] if len(fields) > 1 else "",
+                                "name": fields[2] if len(fields) > 2 else "",
+                                "user": fields[3] if len(fields) > 3 else "",
+                                "state": fields[4] if len(fields) > 4 else "",
+                                "time": fields[5] if len(fields) > 5 else "",
+                                "nodes": fields[6] if len(fields) > 6 else "",
+                                "nodelist": ' '.join(fields[7:]) if len(fields) > 7 else ""
+                            }
+                            jobs.append(job_info)
             
             self.logger.info(f"找到 {len(jobs)} 个正在运行或排队的作业")
             return jobs
@@ -510,9 +992,10 @@ class WorkflowOrchestrator:
                              scripts: Dict, monitoring_report: Optional[Dict]) -> Dict:
         """生成最终执行报告"""
         # 计算执行时长
-        start_time = datetime.fromisoformat(self.execution_state["start_time"])
-        end_time = datetime.fromisoformat(self.execution_state["end_time"]) if self.execution_state["end_time"] else datetime.now()
-        execution_duration = int((end_time - start_time).total_seconds())
+        execution_duration = (
+            int(time.monotonic() - self._start_monotonic)
+            if self._start_monotonic is not None else 0
+        )
         
         report = {
             "execution_summary": {
@@ -541,28 +1024,30 @@ class WorkflowOrchestrator:
             "report_generation_time": datetime.now().isoformat()
         }
         
-        # 保存报告到文件
-        self._save_execution_report(report)
+        # 在后台线程保存报告快照，不阻塞工作流返回；
+        # 后续步骤修改执行状态不影响正在写入的报告
+        self._report_writer = threading.Thread(
+            target=self._save_execution_report, args=(copy.deepcopy(report),),
+            name="report-writer"
+        )
+        self._report_writer.start()
         
         return report
     
     def _save_execution_report(self, report: Dict) -> None:
         """保存执行报告"""
         try:
-            import json
-            
             # 创建report目录 - 使用当前工作目录而不是config.base_path
             current_dir = os.getcwd()
             report_dir = os.path.join(current_dir, "report")
-            os.makedirs(report_dir, exist_ok=True)
+            ensure_local_directory(report_dir)
             
             report_file = os.path.join(
                 report_dir,
                 f"cfx_execution_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             )
             
-            with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(report, f, ensure_ascii=False, indent=2)
+            write_json_report(report_file, report)
             
             self.logger.info(f"执行报告已保存: {report_file}")
             
@@ -572,12 +1057,10 @@ class WorkflowOrchestrator:
     def _generate_step_report(self, step_name: str, result) -> None:
         """为单独步骤生成简单报告"""
         try:
-            import json
-            
             # 创建report目录 - 使用当前工作目录而不是config.base_path
             current_dir = os.getcwd()
             report_dir = os.path.join(current_dir, "report")
-            os.makedirs(report_dir, exist_ok=True)
+            ensure_local_directory(report_dir)
             
             # 生成步骤报告
             step_report = {
@@ -601,8 +1084,7 @@ class WorkflowOrchestrator:
                 f"step_{step_name}_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             )
             
-            with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(step_report, f, ensure_ascii=False, indent=2)
+            write_json_report(report_file, step_report)
             
             self.logger.info(f"步骤报告已保存: {report_file}")
             
@@ -610,13 +1092,25 @@ class WorkflowOrchestrator:
             self.logger.error(f"保存步骤报告失败: {e}")
     
     def _cleanup_resources(self) -> None:
-        """清理资源"""
-        try:
-            if self.ssh_client:
-                self.ssh_client.close()
-                self.logger.debug("SSH连接已关闭")
-        except Exception as e:
-            self.logger.warning(f"清理资源时出错: {e}")
+        """
+        清理资源
+
+        SSH连接保留在连接池中供后续步骤复用，进程退出时统一关闭。
+        """
+        if self._report_writer is not None:
+            self._report_writer.join(timeout=_REPORT_WRITER_JOIN_TIMEOUT)
+            if self._report_writer.is_alive():
+                self.logger.warning("执行报告仍在后台写入")
+            else:
+                self._report_writer = None
+        
+        if self.ssh_client:
+            self.logger.debug("SSH连接保留在连接池中")
+    
+    @property
+    def available_steps(self) -> Tuple[str, ...]:
+        """可单独执行的步骤名称（按工作流顺序）"""
+        return tuple(self._step_only_handlers)
     
     def execute_step_only(self, step_name: str, **kwargs) -> any:
         """
@@ -633,292 +1127,10 @@ class WorkflowOrchestrator:
         
         result = None
         try:
-            if step_name == "connect_server":
-                result = self._connect_to_server()
-            elif step_name == "verify_cfx":
-                result = self._verify_cfx_environment()
-            elif step_name == "generate_pre":
-                job_configs = kwargs.get("job_configs", [])
-                result = self.cfx_manager.generate_pre_files(job_configs)
-            elif step_name == "generate_def":
-                # 对于单独执行，需要重新生成pre文件和job配置
-                job_configs = [
-                    {
-                        "pressure": pressure,
-                        "job_name": f"{self.config.def_file_prefix}{pressure}",
-                        "output_dir": f"{self.config.folder_prefix}{pressure}"
-                    }
-                    for pressure in self.config.pressure_list
-                ]
-                
-                # 获取预生成的.pre文件路径
-                pre_file_path = os.path.join(
-                    self.config.base_path, 
-                    "create_def_batch.pre"
-                )
-                pre_files = [pre_file_path] if os.path.exists(pre_file_path) else []
-                
-                if not pre_files:
-                    # 如果没有.pre文件，先生成
-                    pre_files = self.cfx_manager.generate_pre_files(job_configs)
-                
-                result = self._generate_def_files(pre_files, job_configs)
-            elif step_name == "generate_scripts":
-                # 生成作业脚本需要先有.def文件和job配置
-                job_configs = []
-                
-                for pressure in self.config.pressure_list:
-                    job_config = {
-                        "pressure": pressure,
-                        "job_name": f"CFX_Job_{pressure}",
-                        "output_dir": f"{self.config.folder_prefix}{pressure}",
-                        "def_file": f"{self.config.folder_prefix}{pressure}/{pressure}.def"
-                    }
-                    
-                    # 如果def_file_prefix不为空，调整def文件名
-                    if self.config.def_file_prefix:
-                        job_config["def_file"] = f"{self.config.folder_prefix}{pressure}/{self.config.def_file_prefix}{pressure}.def"
-                    
-                    # 添加初始文件信息（如果配置了）
-                    if hasattr(self.config, 'initial_file') and self.config.initial_file:
-                        # 使用相对路径，初始文件将在对应的P_Out_文件夹中
-                        initial_filename = os.path.basename(self.config.initial_file)
-                        job_config["initial_file"] = initial_filename
-                        self.logger.info(f"添加initial_file到作业配置: {initial_filename} (来源: {self.config.initial_file})")
-                    else:
-                        self.logger.warning(f"未找到initial_file配置: hasattr={hasattr(self.config, 'initial_file')}, value={getattr(self.config, 'initial_file', 'NOT_FOUND')}")
-                    
-                    self.logger.info(f"压力{pressure}的作业配置: {job_config}")
-                    job_configs.append(job_config)
-                
-                # 如果没有SSH连接但需要集群状态，先获取集群状态
-                cluster_status = None
-                if self.config.enable_node_detection and self.ssh_client:
-                    try:
-                        cluster_status = self.cluster_query.query_cluster_nodes(self.ssh_client)
-                        self.logger.info(f"获取到集群状态，节点数量: {len(cluster_status)}")
-                    except Exception as e:
-                        self.logger.warning(f"获取集群状态失败: {e}")
-                
-                result = self.script_generator.generate_job_scripts(job_configs, cluster_status)
-            elif step_name == "upload_files":
-                # 上传文件到集群
-                if not self.ssh_client:
-                    self._connect_to_server()
-                
-                # 准备要上传的文件夹和文件列表
-                upload_items = []
-                uploaded_folders = []
-                uploaded_sh_files = []
-                
-                # 添加每个压力参数对应的完整文件夹
-                for pressure in self.config.pressure_list:
-                    folder_name = f"{self.config.folder_prefix}{pressure}"
-                    local_folder_path = os.path.join(self.config.base_path, folder_name)
-                    
-                    # 检查文件夹是否存在且包含文件
-                    if os.path.exists(local_folder_path) and os.path.isdir(local_folder_path):
-                        folder_files = []
-                        # 添加文件夹中的所有文件
-                        for root, dirs, files in os.walk(local_folder_path):
-                            for file in files:
-                                local_file_path = os.path.join(root, file)
-                                # 计算相对路径以保持文件夹结构
-                                rel_path = os.path.relpath(local_file_path, self.config.base_path)
-                                upload_items.append(local_file_path)
-                                folder_files.append(file)
-                                self.logger.debug(f"添加文件到上传列表: {local_file_path} -> {rel_path}")
-                        
-                        if folder_files:
-                            uploaded_folders.append({
-                                "folder": folder_name,
-                                "files": folder_files,
-                                "file_count": len(folder_files)
-                            })
-                
-                # 添加生成的.sh脚本文件
-                generated_sh_files = [
-                    "Submit_All.sh",
-                    "Monitor_Jobs.sh"
-                ]
-                
-                for sh_file in generated_sh_files:
-                    script_file = os.path.join(self.config.base_path, sh_file)
-                    if os.path.exists(script_file):
-                        upload_items.append(script_file)
-                        uploaded_sh_files.append(sh_file)
-                        self.logger.debug(f"添加生成的脚本到上传列表: {script_file}")
-                
-                # 添加按作业命名的.sh文件（如果存在）
-                for pressure in self.config.pressure_list:
-                    job_name = f"CFX_Job_{pressure}"
-                    job_sh_file = os.path.join(self.config.base_path, f"{job_name}.sh")
-                    if os.path.exists(job_sh_file):
-                        upload_items.append(job_sh_file)
-                        uploaded_sh_files.append(f"{job_name}.sh")
-                        self.logger.debug(f"添加作业脚本到上传列表: {job_sh_file}")
-                
-                # 详细输出要上传的内容
-                self.logger.info(f"=== 文件上传清单 ===")
-                
-                # 计算基本文件数量和大小
-                total_size = 0
-                total_file_count = len(upload_items)
-                
-                for item in upload_items:
-                    if os.path.exists(item):
-                        total_size += os.path.getsize(item)
-                        
-                # 检查是否有初始文件需要额外上传
-                initial_file_info = None
-                if hasattr(self.config, 'initial_file') and self.config.initial_file:
-                    if os.path.exists(self.config.initial_file):
-                        initial_file_size = os.path.getsize(self.config.initial_file)
-                        initial_file_size_mb = round(initial_file_size / (1024 * 1024), 2)
-                        # 为每个P_Out_文件夹都会额外上传一份初始文件
-                        additional_initial_files = len(self.config.pressure_list)
-                        total_size += initial_file_size * additional_initial_files
-                        total_file_count += additional_initial_files
-                        initial_file_info = {
-                            "name": os.path.basename(self.config.initial_file),
-                            "size_mb": initial_file_size_mb,
-                            "folders": additional_initial_files
-                        }
-                
-                total_size_mb = round(total_size / (1024 * 1024), 2)
-                self.logger.info(f"总计文件数量: {total_file_count}")
-                self.logger.info(f"总计文件大小: {total_size_mb} MB")
-                
-                # 如果有初始文件，单独说明
-                if initial_file_info:
-                    self.logger.info(f"  (包含初始文件 {initial_file_info['name']} × {initial_file_info['folders']} = {initial_file_info['folders']}个额外文件)")
-                
-                # 输出文件夹信息
-                if uploaded_folders:
-                    self.logger.info(f"要上传的文件夹 ({len(uploaded_folders)}个):")
-                    for folder_info in uploaded_folders:
-                        self.logger.info(f"  📁 {folder_info['folder']} ({folder_info['file_count']}个文件)")
-                        
-                        # 显示现有文件
-                        for file in folder_info['files']:
-                            # 计算文件大小
-                            file_path = os.path.join(self.config.base_path, folder_info['folder'], file)
-                            if os.path.exists(file_path):
-                                file_size = os.path.getsize(file_path)
-                                size_str = f"{round(file_size / 1024, 1)} KB" if file_size < 1024*1024 else f"{round(file_size / (1024*1024), 2)} MB"
-                                file_type = "CFX定义文件" if file.endswith('.def') else "SLURM作业脚本" if file.endswith('.slurm') else "其他"
-                                self.logger.info(f"     └── {file} ({size_str}, {file_type})")
-                            else:
-                                self.logger.info(f"     └── {file} (文件不存在)")
-                                
-                    # 单独显示初始文件信息（如果有）
-                    if initial_file_info:
-                        self.logger.info(f"")
-                        self.logger.info(f"额外上传初始文件到各文件夹:")
-                        self.logger.info(f"  📄 {initial_file_info['name']} ({initial_file_info['size_mb']} MB, CFX初始文件)")
-                        self.logger.info(f"     将复制到 {initial_file_info['folders']} 个P_Out_文件夹中")
-                else:
-                    self.logger.warning("  ⚠️  没有找到要上传的文件夹")
-                
-                # 输出.sh文件信息
-                if uploaded_sh_files:
-                    self.logger.info(f"要上传的.sh脚本文件 ({len(uploaded_sh_files)}个):")
-                    for sh_file in uploaded_sh_files:
-                        script_path = os.path.join(self.config.base_path, sh_file)
-                        if os.path.exists(script_path):
-                            file_size = os.path.getsize(script_path)
-                            size_str = f"{round(file_size / 1024, 1)} KB"
-                            script_type = "批量提交脚本" if "Submit" in sh_file else "监控脚本" if "Monitor" in sh_file else "Shell脚本"
-                            self.logger.info(f"  📜 {sh_file} ({size_str}, {script_type})")
-                        else:
-                            self.logger.info(f"  📜 {sh_file} (文件不存在)")
-                else:
-                    self.logger.warning("  ⚠️  没有找到要上传的.sh脚本文件")
-                
-                self.logger.info(f"=== 上传目标 ===")
-                self.logger.info(f"远程目录: {self.config.remote_base_path}")
-                self.logger.info(f"保持目录结构: 是")
-                
-                # 如果没有找到文件，记录警告
-                if not upload_items:
-                    self.logger.warning("没有找到要上传的文件或文件夹")
-                    result = {"uploaded_files": [], "failed_files": []}
-                else:
-                    # 先创建远程目录结构
-                    try:
-                        # 确保远程基础目录存在
-                        stdin, stdout, stderr = self.ssh_client.exec_command(f"mkdir -p {self.config.remote_base_path}")
-                        stdout.read()  # 等待命令完成
-                        self.logger.info(f"创建远程基础目录: {self.config.remote_base_path}")
-                        
-                        # 为每个压力参数创建远程目录
-                        for pressure in self.config.pressure_list:
-                            folder_name = f"{self.config.folder_prefix}{pressure}"
-                            remote_folder = f"{self.config.remote_base_path}/{folder_name}"
-                            stdin, stdout, stderr = self.ssh_client.exec_command(f"mkdir -p {remote_folder}")
-                            stdout.read()  # 等待命令完成
-                            self.logger.debug(f"创建远程目录: {remote_folder}")
-                            
-                    except Exception as e:
-                        self.logger.warning(f"创建远程目录时出错: {e}")
-                    
-                    # 执行上传，保持目录结构
-                    self.logger.info(f"准备上传{len(upload_items)}个文件到集群 (保持目录结构)")
-                    result = self.transfer_manager.upload_files(
-                        ssh_client=self.ssh_client,
-                        file_list=upload_items,
-                        remote_dir=self.config.remote_base_path,
-                        preserve_structure=True
-                    )
-                    
-                    # 单独处理初始文件上传到各个P_Out_文件夹
-                    if hasattr(self.config, 'initial_file') and self.config.initial_file:
-                        initial_file_path = self.config.initial_file
-                        if os.path.exists(initial_file_path):
-                            self.logger.info(f"开始上传初始文件到各个P_Out_文件夹: {initial_file_path}")
-                            
-                            # 构建模拟的def文件列表用于初始文件上传
-                            def_files_for_initial = []
-                            for pressure in self.config.pressure_list:
-                                folder_name = f"{self.config.folder_prefix}{pressure}"
-                                local_folder_path = os.path.join(self.config.base_path, folder_name)
-                                def_file = os.path.join(local_folder_path, f"{pressure}.def")
-                                def_files_for_initial.append(def_file)
-                            
-                            self._upload_initial_files_to_folders(initial_file_path, def_files_for_initial)
-                        else:
-                            self.logger.warning(f"初始文件不存在，跳过上传: {initial_file_path}")
-            elif step_name == "submit_jobs":
-                # 提交作业到队列
-                if not self.ssh_client:
-                    self._connect_to_server()
-                
-                # 找到Submit_All.sh脚本
-                submit_script = os.path.join(self.config.base_path, "Submit_All.sh")
-                if not os.path.exists(submit_script):
-                    raise WorkflowError("Submit_All.sh脚本未找到，请先执行generate_scripts步骤")
-                
-                result = self._submit_jobs(submit_script)
-            elif step_name == "monitor_jobs":
-                # 监控作业状态
-                if not self.ssh_client:
-                    self._connect_to_server()
-                
-                # 获取已提交的作业信息（从用户作业队列查询）
-                submitted_jobs = self._get_submitted_jobs()
-                
-                if not submitted_jobs:
-                    self.logger.warning("未找到正在运行的作业")
-                    result = {"status": "no_jobs", "jobs": []}
-                else:
-                    # 执行监控
-                    result = self._monitor_jobs(submitted_jobs)
-            elif step_name == "query_cluster":
-                if not self.ssh_client:
-                    self._connect_to_server()
-                result = self.cluster_query.query_cluster_nodes(self.ssh_client)
-            else:
+            handler = self._step_only_handlers.get(step_name)
+            if handler is None:
                 raise WorkflowError(f"未知步骤: {step_name}")
+            result = handler(**kwargs)
             
             # 为单独步骤生成简单报告
             self.logger.info(f"正在为步骤 {step_name} 生成报告...")
@@ -931,20 +1143,358 @@ class WorkflowOrchestrator:
             raise
         
         finally:
-            # 只在特定步骤后清理资源
-            if step_name in ["connect_server", "query_cluster"]:
-                # 这些步骤需要保持连接给后续步骤使用
-                pass
+            # 连接保留在连接池中，下一个步骤经 _ensure_connected 直接复用
+            # （连接断开时才重连）
+            self._cleanup_resources()
+    
+    def _run_step_connect_server(self, **kwargs) -> any:
+        """单独执行: 连接服务器"""
+        return self._connect_to_server()
+    
+    def _run_step_verify_cfx(self, **kwargs) -> any:
+        """单独执行: 验证CFX环境"""
+        return self._verify_cfx_environment()
+    
+    def _run_step_generate_pre(self, **kwargs) -> any:
+        """单独执行: 生成.pre文件（job_configs通过步骤参数传入）"""
+        job_configs = kwargs.get("job_configs", [])
+        return self.cfx_manager.generate_pre_files(job_configs)
+    
+    def _run_step_generate_def(self, **kwargs) -> any:
+        """单独执行: 重新构建作业配置并生成.def文件"""
+        # 对于单独执行，需要重新生成pre文件和job配置
+        job_configs = [
+            {
+                "pressure": pressure,
+                "job_name": f"{self.config.def_file_prefix}{pressure}",
+                "output_dir": f"{self.config.folder_prefix}{pressure}"
+            }
+            for pressure in self.config.pressure_list
+        ]
+        
+        # 获取预生成的.pre文件路径
+        pre_file_path = os.path.join(
+            self.config.base_path, 
+            "create_def_batch.pre"
+        )
+        pre_files = [pre_file_path] if os.path.exists(pre_file_path) else []
+        
+        if not pre_files:
+            # 如果没有.pre文件，先生成
+            pre_files = self.cfx_manager.generate_pre_files(job_configs)
+        
+        return self._generate_def_files(pre_files, job_configs)
+    
+    def _run_step_generate_scripts(self, **kwargs) -> any:
+        """单独执行: 根据压力列表构建作业配置并生成作业脚本"""
+        # 生成作业脚本需要先有.def文件和job配置
+        job_configs = []
+        
+        for pressure in self.config.pressure_list:
+            job_config = {
+                "pressure": pressure,
+                "job_name": f"CFX_Job_{pressure}",
+                "output_dir": f"{self.config.folder_prefix}{pressure}",
+                "def_file": f"{self.config.folder_prefix}{pressure}/{pressure}.def"
+            }
+            
+            # 如果def_file_prefix不为空，调整def文件名
+            if self.config.def_file_prefix:
+                job_config["def_file"] = (
+                    f"{self.config.folder_prefix}{pressure}/"
+                    f"{self.config.def_file_prefix}{pressure}.def"
+                )
+            
+            # 添加初始文件信息（如果配置了）
+            if hasattr(self.config, 'initial_file') and self.config.initial_file:
+                # 使用相对路径，初始文件将在对应的P_Out_文件夹中
+                initial_filename = os.path.basename(self.config.initial_file)
+                job_config["initial_file"] = initial_filename
+                self.logger.info(
+                    f"添加initial_file到作业配置: {initial_filename} "
+                    f"(来源: {self.config.initial_file})"
+                )
+            else:
+                self.logger.warning(
+                    f"未找到initial_file配置: hasattr={hasattr(self.config, 'initial_file')}, "
+                    f"value={getattr(self.config, 'initial_file', 'NOT_FOUND')}"
+                )
+            
+            self.logger.info(f"压力{pressure}的作业配置: {job_config}")
+            job_configs.append(job_config)
+        
+        # 如果没有SSH连接但需要集群状态，先获取集群状态
+        cluster_status = None
+        if self.config.enable_node_detection and self.ssh_client:
+            try:
+                cluster_status = self.cluster_query.query_cluster_nodes(self.ssh_client)
+                self.logger.info(f"获取到集群状态，节点数量: {len(cluster_status)}")
+            except Exception as e:
+                self.logger.warning(f"获取集群状态失败: {e}")
+        
+        return self.script_generator.generate_job_scripts(job_configs, cluster_status)
+    
+    def _run_step_upload_files(self, **kwargs) -> any:
+        """单独执行: 上传各P_Out_文件夹、生成的脚本和初始文件到集群"""
+        # 上传文件到集群
+        self._ensure_connected()
+        
+        # 准备要上传的文件夹和文件列表（发现文件时同时记录大小，
+        # 无需二次遍历）
+        upload_items = []
+        upload_sizes = {}
+        uploaded_folders = []
+        uploaded_sh_files = []
+        log_each_file = self.logger.isEnabledFor(logging.DEBUG)
+        base_path = self.config.base_path
+        folder_prefix = self.config.folder_prefix
+        
+        remote_base_path = self.config.remote_base_path
+        
+        # 每个压力参数派生的路径在一次遍历中全部算好，
+        # 后续各循环直接复用：
+        # (压力值, 文件夹名, 本地文件夹路径)、远程文件夹路径、
+        # 按作业命名的.sh脚本路径
+        # 本地/远程基础路径的前缀只拼接一次，循环中直接做字符串连接
+        local_prefix = os.path.join(base_path, "")
+        remote_prefix = f"{remote_base_path}/"
+        pressure_folders = []
+        remote_folders = []
+        job_sh_files = []
+        for pressure in self.config.pressure_list:
+            folder_name = f"{folder_prefix}{pressure}"
+            pressure_folders.append((pressure, folder_name, local_prefix + folder_name))
+            remote_folders.append(remote_prefix + folder_name)
+            job_sh_files.append(self.config.get_job_script_path(pressure))
+        
+        # 添加每个压力参数对应的完整文件夹
+        for pressure, folder_name, local_folder_path in pressure_folders:
+            # 不存在的文件夹不产生任何结果，
+            # 无需先单独检查文件夹是否存在
+            folder_files = []
+            # 添加文件夹中的所有文件（scandir遍历时同时得到文件大小）
+            for local_file_path, file_size in iter_files_with_size(local_folder_path):
+                upload_items.append(local_file_path)
+                upload_sizes[local_file_path] = file_size
+                folder_files.append(local_file_path)
+                if log_each_file:
+                    # 相对路径只用于调试输出
+                    rel_path = os.path.relpath(local_file_path, base_path)
+                    self.logger.debug(
+                        "添加文件到上传列表: %s -> %s", local_file_path, rel_path
+                    )
+            
+            if folder_files:
+                uploaded_folders.append({
+                    "folder": folder_name,
+                    "files": folder_files,
+                    "file_count": len(folder_files)
+                })
+        
+        # 添加生成的.sh脚本文件
+        generated_sh_files = [
+            self.config.get_submit_script_path(),
+            self.config.get_monitor_script_path()
+        ]
+        
+        for script_file in generated_sh_files:
+            script_size = local_file_size(script_file)
+            if script_size is not None:
+                upload_items.append(script_file)
+                upload_sizes[script_file] = script_size
+                uploaded_sh_files.append(script_file)
+                self.logger.debug("添加生成的脚本到上传列表: %s", script_file)
+        
+        # 添加按作业命名的.sh文件（如果存在）
+        for job_sh_file in job_sh_files:
+            job_sh_size = local_file_size(job_sh_file)
+            if job_sh_size is not None:
+                upload_items.append(job_sh_file)
+                upload_sizes[job_sh_file] = job_sh_size
+                uploaded_sh_files.append(job_sh_file)
+                self.logger.debug("添加作业脚本到上传列表: %s", job_sh_file)
+        
+        # 计算基本文件数量和大小
+        total_size = sum(upload_sizes.values())
+        total_file_count = len(upload_items)
+        
+        # 检查是否有初始文件需要额外上传
+        # （一次stat同时得到是否存在和大小）
+        initial_file_info = None
+        initial_file_size = None
+        if hasattr(self.config, 'initial_file') and self.config.initial_file:
+            initial_file_size = local_file_size(self.config.initial_file)
+            if initial_file_size is not None:
+                # 每个P_Out_文件夹都会得到一份初始文件
+                # （启用远程复制时只传输一份）
+                additional_initial_files = len(self.config.pressure_list)
+                transferred_copies = (
+                    min(1, additional_initial_files) if self.config.initial_file_remote_copy
+                    else additional_initial_files
+                )
+                total_size += initial_file_size * transferred_copies
+                total_file_count += additional_initial_files
+                initial_file_info = {
+                    "name": os.path.basename(self.config.initial_file),
+                    "size": _format_file_size(initial_file_size),
+                    "folders": additional_initial_files
+                }
+        
+        # 详细输出要上传的内容：整个清单拼接为一条日志（一次格式化、
+        # 一次handler写入），INFO未启用时不构建
+        if self.logger.isEnabledFor(logging.INFO):
+            listing = [
+                "=== 文件上传清单 ===",
+                f"总计文件数量: {total_file_count}",
+                f"总计文件大小: {_format_file_size(total_size)}",
+            ]
+            
+            # 如果有初始文件，单独说明
+            if initial_file_info:
+                listing.append(
+                    f"  (包含初始文件 {initial_file_info['name']} × "
+                    f"{initial_file_info['folders']} = "
+                    f"{initial_file_info['folders']}个额外文件)"
+                )
+            
+            # 输出文件夹信息（大小已在发现文件时记录）
+            if uploaded_folders:
+                listing.append(f"要上传的文件夹 ({len(uploaded_folders)}个):")
+                for folder_info in uploaded_folders:
+                    listing.append(
+                        f"  📁 {folder_info['folder']} ({folder_info['file_count']}个文件)"
+                    )
+                    for file_path in folder_info['files']:
+                        file = os.path.basename(file_path)
+                        file_type = _UPLOAD_FILE_TYPES.get(os.path.splitext(file)[1], "其他")
+                        size_str = _format_file_size(upload_sizes[file_path])
+                        listing.append(f"     └── {file} ({size_str}, {file_type})")
+                
+                # 单独显示初始文件信息（如果有）
+                if initial_file_info:
+                    listing.extend([
+                        "",
+                        "额外上传初始文件到各文件夹:",
+                        f"  📄 {initial_file_info['name']} "
+                        f"({initial_file_info['size']}, CFX初始文件)",
+                        f"     将复制到 {initial_file_info['folders']} 个P_Out_文件夹中",
+                    ])
+            
+            # 输出.sh文件信息
+            if uploaded_sh_files:
+                listing.append(f"要上传的.sh脚本文件 ({len(uploaded_sh_files)}个):")
+                for script_path in uploaded_sh_files:
+                    sh_file = os.path.basename(script_path)
+                    size_str = _format_file_size(upload_sizes[script_path])
+                    if "Submit" in sh_file:
+                        script_type = "批量提交脚本"
+                    elif "Monitor" in sh_file:
+                        script_type = "监控脚本"
+                    else:
+                        script_type = "Shell脚本"
+                    listing.append(f"  📜 {sh_file} ({size_str}, {script_type})")
+            
+            listing.extend([
+                "=== 上传目标 ===",
+                f"远程目录: {self.config.remote_base_path}",
+                "保持目录结构: 是",
+            ])
+            self.logger.info("\n".join(listing))
+        
+        if not uploaded_folders:
+            self.logger.warning("  ⚠️  没有找到要上传的文件夹")
+        if not uploaded_sh_files:
+            self.logger.warning("  ⚠️  没有找到要上传的.sh脚本文件")
+        
+        # 如果没有找到文件，记录警告
+        if not upload_items:
+            self.logger.warning("没有找到要上传的文件或文件夹")
+            return {"uploaded_files": [], "failed_files": []}
+        
+        # 先用一条mkdir -p创建远程基础目录和各压力参数目录
+        # （经过传输管理器的目录缓存，已创建的目录不再mkdir）
+        try:
+            self.transfer_manager.ensure_remote_directories(
+                self.ssh_client, [remote_base_path] + remote_folders
+            )
+            self.logger.info(
+                f"创建远程基础目录: {remote_base_path} "
+                f"(含{len(remote_folders)}个压力参数目录)"
+            )
+                
+        except Exception as e:
+            self.logger.warning(f"创建远程目录时出错: {e}")
+        
+        # 执行上传，保持目录结构
+        self.logger.info(f"准备上传{len(upload_items)}个文件到集群 (保持目录结构)")
+        result = self.transfer_manager.upload_files(
+            ssh_client=self.ssh_client,
+            file_list=upload_items,
+            remote_dir=self.config.remote_base_path,
+            preserve_structure=True,
+            extra_clients=self._get_transfer_clients()
+        )
+        
+        # 单独处理初始文件上传到各个P_Out_文件夹
+        if hasattr(self.config, 'initial_file') and self.config.initial_file:
+            initial_file_path = self.config.initial_file
+            if initial_file_size is not None:
+                self.logger.info(
+                    f"开始上传初始文件到各个P_Out_文件夹: {initial_file_path}"
+                )
+                
+                # 构建模拟的def文件列表用于初始文件上传
+                def_files_for_initial = [
+                    os.path.join(local_folder_path, f"{pressure}.def")
+                    for pressure, _, local_folder_path in pressure_folders
+                ]
+                
+                self._upload_initial_files_to_folders(initial_file_path, def_files_for_initial)
             else:
-                self._cleanup_resources()
+                self.logger.warning(f"初始文件不存在，跳过上传: {initial_file_path}")
+        
+        return result
+    
+    def _run_step_submit_jobs(self, **kwargs) -> any:
+        """单独执行: 执行Submit_All.sh提交作业"""
+        # 提交作业到队列
+        self._ensure_connected()
+        
+        # 找到Submit_All.sh脚本
+        submit_script = self.config.get_submit_script_path()
+        if not os.path.exists(submit_script):
+            raise WorkflowError("Submit_All.sh脚本未找到，请先执行generate_scripts步骤")
+        
+        return self._submit_jobs(submit_script)
+    
+    def _run_step_monitor_jobs(self, **kwargs) -> any:
+        """单独执行: 查询用户作业队列并监控作业"""
+        # 监控作业状态
+        self._ensure_connected()
+        
+        # 获取已提交的作业信息（从用户作业队列查询）
+        submitted_jobs = self._get_submitted_jobs()
+        
+        if not submitted_jobs:
+            self.logger.warning("未找到正在运行的作业")
+            return {"status": "no_jobs", "jobs": []}
+        
+        # 执行监控
+        return self._monitor_jobs(submitted_jobs)
+    
+    def _run_step_query_cluster(self, **kwargs) -> any:
+        """单独执行: 查询集群节点状态"""
+        self._ensure_connected()
+        return self.cluster_query.query_cluster_nodes(self.ssh_client)
     
     def get_execution_status(self) -> Dict:
         """获取当前执行状态"""
         return {
             "current_step": self.execution_state["current_step"],
-            "completed_steps": self.execution_state["completed_steps"],
-            "failed_steps": self.execution_state["failed_steps"],
-            "progress": len(self.execution_state["completed_steps"]) / 10,  # 假设总共10个步骤
+            # 返回快照元组，调用方无法修改内部执行状态
+            "completed_steps": tuple(self.execution_state["completed_steps"]),
+            "failed_steps": tuple(self.execution_state["failed_steps"]),
+            "progress": len(self.execution_state["completed_steps"]) / self._total_steps,
             "start_time": self.execution_state["start_time"],
             "total_jobs": self.execution_state["total_jobs"]
         }
@@ -7,6 +7,11 @@ import pytest
 import tempfile
 import yaml
 from pathlib import Path
+
+try:
+    from yaml import CSafeDumper as YamlDumper, CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeDumper as YamlDumper, SafeLoader as YamlLoader
 from unittest.mock import patch
 
 from config import CFXAutomationConfig, ConfigManager
@@ -88,7 +93,7 @@ class TestConfigManager:
                 "pressure_list": [2187, 2189],
                 "job_settings": {"partition": "cpu", "tasks_per_node": 32}
             }
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=YamlDumper)
             temp_file = f.name
         
         try:
@@ -120,7 +125,7 @@ class TestConfigManager:
             
             # 验证保存的文件
             with open(temp_file, 'r', encoding='utf-8') as f:
-                loaded_data = yaml.safe_load(f)
+                loaded_data = yaml.load(f, Loader=YamlLoader)
             
             assert loaded_data["project_name"] == "test_save"
             assert loaded_data["cfx_mode"] == "local"
@@ -0,0 +1,115 @@
+"""
+作业监控模块测试
+使用模拟的远程命令测试SLURM批量状态查询
+"""
+
+import shlex
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.config import CFXAutomationConfig
+from src.job_monitor import JobMonitor, JobState
+
+
+class FakeSlurm:
+    """按命令模拟sacct/squeue输出，记录执行过的命令"""
+
+    def __init__(self, sacct_rows=None, queued=None, sacct_status=0):
+        self.sacct_rows = sacct_rows or {}
+        self.queued = queued or {}
+        self.sacct_status = sacct_status
+        self.commands = []
+
+    def __call__(self, ssh_client, cmd, timeout=None):
+        self.commands.append(cmd)
+        args = shlex.split(cmd)
+        if args[0] == "sacct":
+            if self.sacct_status != 0:
+                return self.sacct_status, "", "sacct: error: Slurm accounting storage is disabled"
+            job_ids = args[args.index("-j") + 1].split(",")
+            rows = [row for job_id in job_ids for row in self.sacct_rows.get(job_id, [])]
+            return 0, "".join(row + "\n" for row in rows), ""
+        if args[0] == "squeue":
+            job_ids = args[args.index("-j") + 1].split(",")
+            rows = [f"{job_id}|{self.queued[job_id]}" for job_id in job_ids
+                    if job_id in self.queued]
+            return 0, "".join(row + "\n" for row in rows), ""
+        raise AssertionError(f"unexpected command: {cmd}")
+
+
+@pytest.fixture
+def monitor():
+    return JobMonitor(CFXAutomationConfig(scheduler_type="SLURM"))
+
+
+class TestSlurmBatchQuery:
+    """SLURM批量状态查询测试"""
+
+    def test_sacct_batched(self, monitor):
+        """测试作业ID按批次合并为逗号分隔的sacct查询"""
+        slurm = FakeSlurm(sacct_rows={
+            job_id: [f"{job_id}|COMPLETED|2024-01-01T00:00:00|2024-01-01T01:00:00|0:0"]
+            for job_id in ("101", "102", "103", "104", "105")
+        })
+
+        with patch("src.job_monitor._SLURM_QUERY_BATCH_SIZE", 2), \
+                patch("src.job_monitor.run_remote_command", side_effect=slurm):
+            results = monitor._check_slurm_jobs(MagicMock(), ["101", "102", "103", "104", "105"])
+
+        assert [shlex.split(cmd)[2] for cmd in slurm.commands] == ["101,102", "103,104", "105"]
+        assert set(results) == {"101", "102", "103", "104", "105"}
+        state, info = results["103"]
+        assert state == JobState.COMPLETED
+        assert info["exit_code"] == "0:0"
+        assert info["end_time"] == "2024-01-01T01:00:00"
+
+    def test_job_steps_ignored(self, monitor):
+        """测试只取作业本身的记录，跳过作业步骤"""
+        slurm = FakeSlurm(sacct_rows={
+            "201": ["201|FAILED|start|end|1:0", "201.batch|COMPLETED|start|end|0:0"],
+            "202": ["202.batch|RUNNING|start||0:0", "202|RUNNING|start||0:0"],
+        })
+
+        with patch("src.job_monitor.run_remote_command", side_effect=slurm):
+            results = monitor._check_slurm_jobs(MagicMock(), ["201", "202", "203"])
+
+        assert results["201"][0] == JobState.FAILED
+        assert results["202"][0] == JobState.RUNNING
+        assert results["203"] == (JobState.UNKNOWN, {})
+
+    def test_squeue_fallback(self, monitor):
+        """测试sacct不可用时改用squeue，不在队列中的作业视为已完成"""
+        slurm = FakeSlurm(queued={"302": "RUNNING", "303": "PENDING"}, sacct_status=1)
+
+        with patch("src.job_monitor.run_remote_command", side_effect=slurm):
+            results = monitor._check_slurm_jobs(MagicMock(), ["301", "302", "303"])
+
+        assert [shlex.split(cmd)[0] for cmd in slurm.commands] == ["sacct", "squeue"]
+        assert results["301"] == (JobState.COMPLETED, {})
+        assert results["302"] == (JobState.RUNNING, {"slurm_state": "RUNNING"})
+        assert results["303"] == (JobState.PENDING, {"slurm_state": "PENDING"})
+
+    def test_query_error_returns_empty(self, monitor):
+        """测试查询出错时返回空结果，由调用方逐个查询"""
+        with patch("src.job_monitor.run_remote_command", side_effect=TimeoutError("timeout")):
+            assert monitor._check_slurm_jobs(MagicMock(), ["401"]) == {}
+
+    def test_persistent_shell_fallback(self, monitor):
+        """测试长期shell通道出错后改为单独执行命令"""
+        shell = MagicMock()
+        shell.run.side_effect = ConnectionError("远程shell通道已关闭")
+        monitor._shell = shell
+        slurm = FakeSlurm(sacct_rows={"501": ["501|RUNNING|start||0:0"]})
+
+        with patch("src.job_monitor.run_remote_command", side_effect=slurm):
+            results = monitor._check_slurm_jobs(MagicMock(), ["501"])
+
+        shell.run.assert_called_once()
+        assert monitor._shell is None
+        assert len(slurm.commands) == 1
+        assert results["501"][0] == JobState.RUNNING
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
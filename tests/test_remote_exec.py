@@ -0,0 +1,163 @@
+"""
+远程命令执行模块测试
+使用模拟的SSH通道测试增量读取输出和长期shell的结束标记解析
+"""
+
+import io
+import re
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.utils.remote_exec import RemoteShell, run_remote_command
+
+# 模拟通道每次recv最多返回的字节数（让结束标记跨越多次读取）
+_FAKE_RECV_SIZE = 7
+
+
+class FakeChannel:
+    """按固定小块返回预置stdout/stderr数据的SSH通道"""
+
+    def __init__(self):
+        self.stdout = bytearray()
+        self.stderr = bytearray()
+        self.closed = False
+        self.exited = False
+        self.sent = []
+
+    def recv_ready(self):
+        return bool(self.stdout)
+
+    def recv_stderr_ready(self):
+        return bool(self.stderr)
+
+    def recv(self, size):
+        return self._take(self.stdout, size)
+
+    def recv_stderr(self, size):
+        return self._take(self.stderr, size)
+
+    def exit_status_ready(self):
+        return self.exited
+
+    def close(self):
+        self.closed = True
+
+    @staticmethod
+    def _take(buf, size):
+        data = bytes(buf[:min(size, _FAKE_RECV_SIZE)])
+        del buf[:len(data)]
+        return data
+
+
+class FakeShellChannel(FakeChannel):
+    """模拟远程 ``sh``：收到命令后按handler的结果写入输出和结束标记"""
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+
+    def sendall(self, data):
+        script = data.decode()
+        self.sent.append(script)
+        command = re.match(r"\{ (.*)\n\} </dev/null\n", script, re.S).group(1)
+        marker = re.search(r"__CFX_CMD_END_\w+__", script).group(0)
+        exit_status, out, err = self.handler(command)
+        self.stdout += f"{out}\n{marker} {exit_status}\n".encode()
+        self.stderr += f"{err}\n{marker}\n".encode()
+
+
+def make_shell_client(handler):
+    """返回exec_command("sh")时打开FakeShellChannel的SSH客户端"""
+    client = MagicMock()
+    client.channels = []
+
+    def exec_command(cmd, *args, **kwargs):
+        assert cmd == "sh"
+        channel = FakeShellChannel(handler)
+        client.channels.append(channel)
+        stdout = MagicMock()
+        stdout.channel = channel
+        return MagicMock(), stdout, MagicMock()
+
+    client.exec_command.side_effect = exec_command
+    return client
+
+
+class TestRemoteShell:
+    """长期shell通道测试"""
+
+    def test_output_and_exit_status(self):
+        """测试结束标记之前的输出和退出状态"""
+        client = make_shell_client(lambda cmd: (3, "line1\nline2\n", "warning\n"))
+        shell = RemoteShell(client)
+
+        assert shell.run("squeue -h") == (3, "line1\nline2\n", "warning\n")
+
+    def test_output_without_trailing_newline(self):
+        """测试没有结尾换行的输出和空输出"""
+        outputs = iter([(0, "no newline", ""), (0, "", "")])
+        shell = RemoteShell(make_shell_client(lambda cmd: next(outputs)))
+
+        assert shell.run("printf 'no newline'") == (0, "no newline", "")
+        assert shell.run("true") == (0, "", "")
+
+    def test_marker_like_output_not_treated_as_end(self):
+        """测试输出中形似结束标记的文本不会提前结束读取"""
+        fake = "\n__CFX_CMD_END_0123456789abcdef__ 0\n"
+        shell = RemoteShell(make_shell_client(lambda cmd: (1, f"before{fake}after\n", "")))
+
+        assert shell.run("cat log") == (1, f"before{fake}after\n", "")
+
+    def test_channel_reused(self):
+        """测试多条命令复用同一个通道，命令的标准输入重定向到/dev/null"""
+        client = make_shell_client(lambda cmd: (0, cmd.upper(), ""))
+        shell = RemoteShell(client)
+
+        assert shell.run("first")[1] == "FIRST"
+        assert shell.run("second")[1] == "SECOND"
+        assert len(client.channels) == 1
+        assert all("} </dev/null\n" in script for script in client.channels[0].sent)
+
+    def test_closed_channel_reopened(self):
+        """测试通道关闭时抛出ConnectionError，下一条命令重新打开通道"""
+        client = make_shell_client(lambda cmd: (0, "ok", ""))
+        shell = RemoteShell(client)
+        shell.run("first")
+
+        broken = client.channels[0]
+        # 远程sh已退出：写入的命令没有任何输出
+        broken.sendall = lambda data: None
+        broken.exited = True
+
+        with pytest.raises(ConnectionError):
+            shell.run("second")
+        assert broken.closed
+
+        assert shell.run("third") == (0, "ok", "")
+        assert len(client.channels) == 2
+
+
+class TestRunRemoteCommand:
+    """增量读取远程命令输出测试"""
+
+    def test_streamed_output_collected(self):
+        """测试边执行边读取的stdout/stderr与退出后剩余的缓冲数据合并"""
+        channel = FakeChannel()
+        channel.stdout += b"streamed output "
+        channel.stderr += b"streamed error "
+        channel.exited = True
+        channel.recv_exit_status = MagicMock(return_value=2)
+
+        stdout = io.BytesIO(b"tail\n")
+        stdout.channel = channel
+        client = MagicMock()
+        client.exec_command.return_value = (MagicMock(), stdout, io.BytesIO(b"tail\n"))
+
+        assert run_remote_command(client, "make") == (
+            2, "streamed output tail\n", "streamed error tail\n"
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,77 @@
+"""
+SSH连接池模块测试
+测试已认证连接的复用、失效连接的移除和关闭
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.utils import ssh_pool
+
+
+def make_client(active=True):
+    """创建传输层状态可控的模拟SSH客户端"""
+    client = MagicMock()
+    client.get_transport.return_value.is_active.return_value = active
+    return client
+
+
+@pytest.fixture(autouse=True)
+def empty_pool():
+    ssh_pool.close_all_clients()
+    yield
+    ssh_pool.close_all_clients()
+
+
+class TestSSHPool:
+    """SSH连接池测试"""
+
+    def test_active_client_reused(self):
+        """测试活跃连接按 (主机, 端口, 用户, 槽位) 复用"""
+        client = make_client()
+        ssh_pool.register_client("host", 22, "user", client)
+
+        assert ssh_pool.get_pooled_client("host", 22, "user") is client
+        assert ssh_pool.get_pooled_client("host", 22, "other") is None
+        assert ssh_pool.get_pooled_client("host", 22, "user", slot=1) is None
+
+    def test_dead_client_removed(self):
+        """测试断开的连接被关闭并移出连接池"""
+        client = make_client()
+        ssh_pool.register_client("host", 22, "user", client)
+        client.get_transport.return_value.is_active.return_value = False
+
+        assert ssh_pool.get_pooled_client("host", 22, "user") is None
+        client.close.assert_called_once()
+
+        client.get_transport.return_value.is_active.return_value = True
+        assert ssh_pool.get_pooled_client("host", 22, "user") is None
+
+    def test_register_replaces_previous(self):
+        """测试同一槽位注册新连接时关闭旧连接"""
+        old, new = make_client(), make_client()
+        ssh_pool.register_client("host", 22, "user", old)
+        ssh_pool.register_client("host", 22, "user", new)
+        ssh_pool.register_client("host", 22, "user", new)
+
+        old.close.assert_called_once()
+        new.close.assert_not_called()
+        assert ssh_pool.get_pooled_client("host", 22, "user") is new
+
+    def test_close_all_clients(self):
+        """测试关闭所有连接，关闭出错不影响其余连接"""
+        first, second = make_client(), make_client()
+        first.close.side_effect = OSError("socket closed")
+        ssh_pool.register_client("host", 22, "user", first)
+        ssh_pool.register_client("host", 22, "user", second, slot=1)
+
+        ssh_pool.close_all_clients()
+
+        first.close.assert_called_once()
+        second.close.assert_called_once()
+        assert ssh_pool.get_pooled_client("host", 22, "user", slot=1) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
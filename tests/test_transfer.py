@@ -0,0 +1,418 @@
+"""
+文件传输模块测试
+使用模拟的SSH客户端测试上传跳过判断、tar流和asyncssh上传回退
+以及批量校验后的重新上传
+"""
+
+import hashlib
+import io
+import os
+import shlex
+import tarfile
+from pathlib import PurePosixPath
+from unittest.mock import MagicMock, patch
+
+import paramiko
+import pytest
+
+from src.config import CFXAutomationConfig
+from src.transfer import FileTransferManager, TransferError
+from src.utils.upload_backends import UploadBackends
+
+
+def make_config(base_path, **overrides) -> CFXAutomationConfig:
+    """创建指向临时目录的测试配置"""
+    settings = {
+        "base_path": str(base_path),
+        "ssh_host": "test.cluster.edu",
+        "ssh_user": "user",
+        "transfer_retry_times": 1,
+    }
+    settings.update(overrides)
+    return CFXAutomationConfig(**settings)
+
+
+def make_stat_runner(remote_stats):
+    """
+    模拟远程批量 ``stat -c '%s %Y %n'``，按remote_stats返回存在的文件
+
+    Args:
+        remote_stats: 远程文件路径到 (大小, 修改时间) 的映射（测试中可修改）
+    """
+    def run(ssh_client, cmd, timeout=None):
+        args = shlex.split(cmd)
+        assert args[:4] == ["stat", "-c", "%s %Y %n", "--"]
+        lines = [
+            f"{remote_stats[path][0]} {remote_stats[path][1]} {path}"
+            for path in args[4:] if path in remote_stats
+        ]
+        return 0, "".join(line + "\n" for line in lines), ""
+    return run
+
+
+class TestUploadSkip:
+    """上传清单跳过判断测试"""
+
+    @pytest.fixture
+    def local_file(self, tmp_path):
+        path = tmp_path / "P_Out_100" / "case.def"
+        path.parent.mkdir()
+        path.write_bytes(b"def content")
+        return str(path)
+
+    @pytest.fixture
+    def remote_stats(self):
+        return {"/remote/P_Out_100/case.def": (11, 1700000000)}
+
+    @pytest.fixture(autouse=True)
+    def fake_stat(self, remote_stats):
+        with patch("src.transfer.run_remote_command", side_effect=make_stat_runner(remote_stats)):
+            yield
+
+    def test_first_upload_not_skipped(self, tmp_path, local_file):
+        """测试没有上传记录时不跳过"""
+        manager = FileTransferManager(make_config(tmp_path))
+        targets = [(local_file, "/remote/P_Out_100/case.def")]
+
+        assert manager.find_unchanged_uploads(MagicMock(), targets) == set()
+
+    def test_recorded_upload_skipped(self, tmp_path, local_file):
+        """测试记录后本地和远程都未变化时跳过"""
+        manager = FileTransferManager(make_config(tmp_path))
+        targets = [(local_file, "/remote/P_Out_100/case.def")]
+        manager.record_uploads(MagicMock(), targets)
+
+        assert (tmp_path / ".cache" / "upload_manifest.json").exists()
+        assert manager.find_unchanged_uploads(MagicMock(), targets) == {
+            "/remote/P_Out_100/case.def"
+        }
+
+        # 新的管理器从清单文件读取记录
+        reloaded = FileTransferManager(make_config(tmp_path))
+        assert reloaded.find_unchanged_uploads(MagicMock(), targets) == {
+            "/remote/P_Out_100/case.def"
+        }
+
+    def test_remote_changed_not_skipped(self, tmp_path, local_file, remote_stats):
+        """测试远程文件大小或修改时间变化时重新上传"""
+        manager = FileTransferManager(make_config(tmp_path))
+        targets = [(local_file, "/remote/P_Out_100/case.def")]
+        manager.record_uploads(MagicMock(), targets)
+
+        remote_stats["/remote/P_Out_100/case.def"] = (11, 1700000100)
+        assert manager.find_unchanged_uploads(MagicMock(), targets) == set()
+
+        del remote_stats["/remote/P_Out_100/case.def"]
+        assert manager.find_unchanged_uploads(MagicMock(), targets) == set()
+
+    def test_local_changed_not_skipped(self, tmp_path, local_file):
+        """测试本地内容变化时重新上传"""
+        manager = FileTransferManager(make_config(tmp_path))
+        targets = [(local_file, "/remote/P_Out_100/case.def")]
+        manager.record_uploads(MagicMock(), targets)
+
+        with open(local_file, "wb") as f:
+            f.write(b"new content")
+
+        assert manager.find_unchanged_uploads(MagicMock(), targets) == set()
+
+    def test_touched_file_with_same_content_skipped(self, tmp_path, local_file):
+        """测试只有修改时间变化、内容相同的本地文件仍然跳过"""
+        manager = FileTransferManager(make_config(tmp_path))
+        targets = [(local_file, "/remote/P_Out_100/case.def")]
+        manager.record_uploads(MagicMock(), targets)
+
+        st = os.stat(local_file)
+        os.utime(local_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        assert manager.find_unchanged_uploads(MagicMock(), targets) == {
+            "/remote/P_Out_100/case.def"
+        }
+
+    def test_other_server_not_skipped(self, tmp_path, local_file):
+        """测试上传记录按服务器区分"""
+        targets = [(local_file, "/remote/P_Out_100/case.def")]
+        FileTransferManager(make_config(tmp_path)).record_uploads(MagicMock(), targets)
+
+        other = FileTransferManager(make_config(tmp_path, ssh_host="other.cluster.edu"))
+        assert other.find_unchanged_uploads(MagicMock(), targets) == set()
+
+    def test_disabled(self, tmp_path, local_file):
+        """测试关闭skip_unchanged_uploads时不记录也不跳过"""
+        manager = FileTransferManager(make_config(tmp_path, skip_unchanged_uploads=False))
+        targets = [(local_file, "/remote/P_Out_100/case.def")]
+        manager.record_uploads(MagicMock(), targets)
+
+        assert not (tmp_path / ".cache" / "upload_manifest.json").exists()
+        assert manager.find_unchanged_uploads(MagicMock(), targets) == set()
+
+    def test_upload_files_skips_unchanged(self, tmp_path, local_file):
+        """测试upload_files只上传变化的文件，返回结果包含跳过的文件"""
+        other_file = tmp_path / "P_Out_100" / "other.def"
+        other_file.write_bytes(b"other")
+        manager = FileTransferManager(make_config(tmp_path))
+        manager.record_uploads(MagicMock(), [(local_file, "/remote/P_Out_100/case.def")])
+
+        with patch.object(manager, "_upload_files",
+                          return_value={str(other_file): "/remote/P_Out_100/other.def"}) as upload:
+            result = manager.upload_files(
+                MagicMock(), [local_file, str(other_file)], "/remote", preserve_structure=True
+            )
+
+        assert upload.call_args.args[1] == [str(other_file)]
+        assert result == {
+            local_file: "/remote/P_Out_100/case.def",
+            str(other_file): "/remote/P_Out_100/other.def",
+        }
+
+
+class FakeTarStdin(io.BytesIO):
+    """记录写入内容的远程tar标准输入"""
+
+    def __init__(self):
+        super().__init__()
+        self.channel = MagicMock()
+
+    def close(self):
+        # tarfile结束时不关闭外部文件对象，这里保留内容供检查
+        pass
+
+
+def make_tar_client(exit_status=0, stderr=b""):
+    """模拟执行 ``tar -xf -`` 的SSH客户端"""
+    client = MagicMock()
+    client.stdin = FakeTarStdin()
+    stdout = MagicMock()
+    stdout.channel.recv_exit_status.return_value = exit_status
+    client.exec_command.return_value = (client.stdin, stdout, io.BytesIO(stderr))
+    return client
+
+
+class TestTarStreamUpload:
+    """tar流上传及回退测试"""
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        paths = []
+        for name in ("P_Out_100/a.def", "P_Out_200/b.def", "CFX_Job_100.sh"):
+            path = tmp_path / name
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(name.encode())
+            paths.append(str(path))
+        return paths
+
+    def make_backends(self, tmp_path, **overrides):
+        return UploadBackends(make_config(tmp_path, **overrides), "", False)
+
+    def remote_path(self, tmp_path):
+        manager = FileTransferManager(make_config(tmp_path))
+        return lambda f: manager._get_remote_path(f, "/remote", True)
+
+    def test_tar_stream_uploads_regular_files(self, tmp_path, files):
+        """测试普通文件打包为一个tar流，脚本文件留给SFTP"""
+        client = make_tar_client()
+        backends = self.make_backends(tmp_path)
+
+        result = backends.upload_tar_stream(client, files, "/remote", self.remote_path(tmp_path))
+
+        assert result == {
+            files[0]: "/remote/P_Out_100/a.def",
+            files[1]: "/remote/P_Out_200/b.def",
+        }
+        assert client.exec_command.call_args.args[0] == "tar -xf - -C /remote"
+        client.stdin.channel.shutdown_write.assert_called_once()
+        with tarfile.open(fileobj=io.BytesIO(client.stdin.getvalue())) as tar:
+            assert tar.getnames() == ["P_Out_100/a.def", "P_Out_200/b.def"]
+            assert tar.extractfile("P_Out_200/b.def").read() == b"P_Out_200/b.def"
+
+    def test_remote_tar_failure_returns_empty(self, tmp_path, files):
+        """测试远程解包失败（如没有tar）时返回空结果"""
+        client = make_tar_client(exit_status=127, stderr=b"sh: tar: not found")
+        backends = self.make_backends(tmp_path)
+
+        assert backends.upload_tar_stream(
+            client, files, "/remote", self.remote_path(tmp_path)
+        ) == {}
+
+    def test_exec_failure_returns_empty(self, tmp_path, files):
+        """测试无法打开远程命令通道时返回空结果"""
+        client = MagicMock()
+        client.exec_command.side_effect = paramiko.SSHException("channel closed")
+        backends = self.make_backends(tmp_path)
+
+        assert backends.upload_tar_stream(
+            client, files, "/remote", self.remote_path(tmp_path)
+        ) == {}
+
+    def test_auto_thresholds(self, tmp_path, files):
+        """测试默认关闭，按文件数和总大小自动启用tar流"""
+        assert not self.make_backends(tmp_path).can_use_tar_stream(files)
+        assert self.make_backends(tmp_path, use_tar_stream=True).can_use_tar_stream(files)
+        assert not self.make_backends(
+            tmp_path, use_tar_stream=True
+        ).can_use_tar_stream(files[:1])
+        assert self.make_backends(
+            tmp_path, tar_stream_small_total_mb=64
+        ).can_use_tar_stream(files)
+        assert self.make_backends(
+            tmp_path, tar_stream_min_files=3, tar_stream_small_total_mb=0
+        ).can_use_tar_stream(files)
+        assert not self.make_backends(
+            tmp_path, tar_stream_min_files=4, tar_stream_small_total_mb=0
+        ).can_use_tar_stream(files)
+        assert not self.make_backends(
+            tmp_path, tar_stream_min_files=0, tar_stream_small_total_mb=0
+        ).can_use_tar_stream(files)
+
+    def test_failed_tar_stream_falls_back_to_sftp(self, tmp_path, files):
+        """测试tar流失败后所有文件改为逐个SFTP上传"""
+        manager = FileTransferManager(make_config(
+            tmp_path, enable_checksum_verification=False, use_tar_stream=True
+        ))
+        client = make_tar_client(exit_status=2, stderr=b"tar: write error")
+        uploaded = []
+
+        def upload_single(ssh_client, sftp, local_file, remote_dir, preserve_structure,
+                          verify=True):
+            uploaded.append(local_file)
+            return str(manager._get_remote_path(local_file, remote_dir, preserve_structure))
+
+        with patch.object(manager, "_optimize_transport"), \
+                patch.object(manager, "ensure_remote_directories"), \
+                patch.object(manager, "open_sftp", return_value=MagicMock()), \
+                patch.object(manager, "_make_remote_executable"), \
+                patch.object(manager, "_upload_single_file", side_effect=upload_single):
+            result = manager._upload_files(client, files, "/remote", True, None)
+
+        client.exec_command.assert_called_once()
+        assert sorted(uploaded) == sorted(files)
+        assert list(result) == files
+        assert manager.transfer_stats["uploaded_files"] == 3
+
+
+class TestBatchVerify:
+    """批量校验与重新上传测试"""
+
+    @pytest.fixture
+    def completed(self, tmp_path):
+        mapping = {}
+        for name in ("a.def", "b.def", "Submit_All.sh"):
+            path = tmp_path / name
+            path.write_bytes(name.encode() * 10)
+            mapping[str(path)] = f"/remote/{name}"
+        return mapping
+
+    @pytest.fixture
+    def manager(self, tmp_path, completed):
+        manager = FileTransferManager(make_config(tmp_path))
+        manager.transfer_stats["uploaded_files"] = len(completed)
+        manager.transfer_stats["upload_bytes"] = sum(os.path.getsize(f) for f in completed)
+        return manager
+
+    def remote_hashes(self, completed, corrupted):
+        """远程md5：corrupted中的文件返回错误的哈希"""
+        hashes = {}
+        for local_file, remote_file in completed.items():
+            with open(local_file, "rb") as f:
+                digest = hashlib.md5(f.read()).hexdigest()
+            hashes[remote_file] = "0" * 32 if remote_file in corrupted else digest
+        return hashes
+
+    def test_mismatched_file_reuploaded(self, tmp_path, manager, completed):
+        """测试校验不一致的文件重新上传，脚本文件不参与校验"""
+        a_file, b_file = str(tmp_path / "a.def"), str(tmp_path / "b.def")
+        hashes = self.remote_hashes(completed, {"/remote/b.def"})
+
+        with patch("src.transfer.remote_md5sums", return_value=hashes) as md5sums, \
+                patch.object(manager, "_upload_single_file",
+                             return_value="/remote/b.def") as upload:
+            manager._verify_uploads_batch(MagicMock(), MagicMock(), completed, "/remote", False)
+
+        assert sorted(md5sums.call_args.args[1]) == ["/remote/a.def", "/remote/b.def"]
+        upload.assert_called_once()
+        assert upload.call_args.args[2] == b_file
+        assert upload.call_args.kwargs["verify"] is True
+        assert a_file in completed and b_file in completed
+        assert manager.transfer_stats["failed_transfers"] == 0
+
+    def test_failed_reupload_removed(self, tmp_path, manager, completed):
+        """测试重新上传仍失败的文件从结果和统计中移除"""
+        b_file = str(tmp_path / "b.def")
+        hashes = self.remote_hashes(completed, {"/remote/b.def"})
+
+        with patch("src.transfer.remote_md5sums", return_value=hashes), \
+                patch.object(manager, "_upload_single_file",
+                             side_effect=TransferError("文件完整性验证失败")):
+            manager._verify_uploads_batch(MagicMock(), MagicMock(), completed, "/remote", False)
+
+        assert b_file not in completed
+        assert len(completed) == 2
+        assert manager.transfer_stats["uploaded_files"] == 2
+        assert manager.transfer_stats["failed_transfers"] == 1
+
+    def test_all_matching_not_reuploaded(self, manager, completed):
+        """测试校验一致时不重新上传"""
+        hashes = self.remote_hashes(completed, set())
+
+        with patch("src.transfer.remote_md5sums", return_value=hashes), \
+                patch.object(manager, "_upload_single_file") as upload:
+            manager._verify_uploads_batch(MagicMock(), MagicMock(), completed, "/remote", False)
+
+        upload.assert_not_called()
+        assert len(completed) == 3
+
+
+class TestAsyncsshUpload:
+    """asyncssh上传及回退测试"""
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        paths = []
+        for name in ("a.def", "b.def", "Submit_All.sh"):
+            path = tmp_path / name
+            path.write_bytes(name.encode())
+            paths.append(str(path))
+        return paths
+
+    def make_backends(self, tmp_path):
+        return UploadBackends(make_config(tmp_path, use_asyncssh=True), "", False)
+
+    def remote_path(self, f):
+        return PurePosixPath("/remote", os.path.basename(f))
+
+    def test_not_installed(self, tmp_path, files):
+        """测试未安装asyncssh时不使用该后端"""
+        backends = self.make_backends(tmp_path)
+
+        with patch("src.utils.upload_backends.asyncssh_available", return_value=False):
+            assert not backends.can_use_asyncssh()
+            assert backends.upload_copies_asyncssh(files[0], ["/remote/a.def"]) is None
+
+    def test_partial_failure(self, tmp_path, files):
+        """测试只返回上传成功的普通文件，其余文件留给paramiko"""
+        backends = self.make_backends(tmp_path)
+        errors = {"/remote/a.def": None, "/remote/b.def": OSError("write failed")}
+
+        with patch("src.utils.upload_backends.asyncssh_available", return_value=True), \
+                patch("src.utils.upload_backends.upload_files_async",
+                      return_value=errors) as upload:
+            result = backends.upload(MagicMock(), files, "/remote", False, self.remote_path)
+
+        assert upload.call_args.args[3] == [
+            (files[0], "/remote/a.def"), (files[1], "/remote/b.def")
+        ]
+        assert result == {files[0]: "/remote/a.def"}
+
+    def test_connection_failure(self, tmp_path, files):
+        """测试asyncssh连接失败时返回空结果，由paramiko上传全部文件"""
+        backends = self.make_backends(tmp_path)
+
+        with patch("src.utils.upload_backends.asyncssh_available", return_value=True), \
+                patch("src.utils.upload_backends.upload_files_async",
+                      side_effect=OSError("connection refused")):
+            assert backends.upload(MagicMock(), files, "/remote", False, self.remote_path) == {}
+            assert backends.upload_copies_asyncssh(files[0], ["/remote/a.def"]) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])